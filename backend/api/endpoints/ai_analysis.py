@@ -1,12 +1,38 @@
-from fastapi import APIRouter, Depends
-from api.schemas.ai_analysis import AIAnalysisData
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from api.schemas.ai_analysis import AIAnalysisData, AIAnalysisJob
+from db import get_db
 from services import ai_service
 
 router = APIRouter()
 
 @router.get("/ai-analysis", response_model=AIAnalysisData)
-async def get_ai_analysis():
+def get_ai_analysis(db: Session = Depends(get_db)):
     """
     Retrieve AI-driven analysis of the system.
     """
-    return ai_service.get_ai_analysis_data()
+    return ai_service.get_ai_analysis_data(db)
+
+@router.get("/ai-analysis/jobs", response_model=List[AIAnalysisJob])
+async def get_analysis_jobs():
+    """List the scheduled analysis jobs and their progress."""
+    return ai_service.get_analysis_jobs()
+
+@router.post("/ai-analysis/jobs/{name}/run", response_model=AIAnalysisJob, status_code=202)
+async def run_analysis_job(name: str):
+    """Start an analysis job now (no-op if it is already running)."""
+    job = ai_service.run_analysis_job(name)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return job
+
+@router.delete("/ai-analysis/jobs/{name}")
+async def cancel_analysis_job(name: str):
+    """Cancel a running analysis job."""
+    cancelled = ai_service.cancel_analysis_job(name)
+    if cancelled is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    if not cancelled:
+        raise HTTPException(status_code=409, detail="Job is not running")
+    return {"message": f"Analysis job {name} cancelled"}
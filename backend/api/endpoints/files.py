@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from api.schemas.files import DirectoryPage
+from services import FileBrowserService
+from core.config import settings
+
+router = APIRouter()
+
+@router.get("/files/tree", response_model=DirectoryPage)
+def get_directory_level(
+    path: Optional[str] = Query(None, description="Directory to list (defaults to the first browsable root)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(settings.file_browser_page_size, ge=1, le=settings.file_browser_max_page_size),
+    hidden: bool = Query(False, description="Include dotfiles"),
+    sizes: bool = Query(True, description="Include cached subtree sizes of directories")
+):
+    """List one level of a directory, one page at a time.
+
+    Subdirectories are not walked: expand them with another request on their
+    path. Directory sizes come from a background cache; entries still being
+    computed have size_pending set and can be fetched again later.
+    """
+    try:
+        return FileBrowserService.list_directory(path, cursor, limit, hidden, sizes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotADirectoryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Cannot read directory: {e.strerror or e}")
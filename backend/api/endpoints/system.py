@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 import asyncio
 import os
+import time
 
 from api.schemas.system import (
-    SystemInfo, SystemMetrics, SystemOverview, 
+    SystemInfo, SystemMetrics, DiskMetrics, MetricsAnalytics, SystemOverview, 
     Process, ProcessList, Service, ServiceList,
+    ServiceJob, ServiceBulkRequest, ServiceBulkResponse,
     NetworkInterface, NetworkInterfaceList,
-    SecurityEvent, SecurityEventList
+    SecurityEvent, SecurityEventList, SecurityEventBulkCreate, SecurityEventBulkResponse,
+    SecurityRuleStats, NetworkBaselineStats, ProcessIntegrityStats, RetentionStatus
 )
 from services import (
     SystemService, ProcessService, ServiceService,
     NetworkService, SecurityService
 )
+from services.analysis_scheduler import analysis_scheduler
+from services.retention_service import retention_manager
+from services.service_jobs import service_jobs
 from db import get_db
 from core.config import settings
 
@@ -23,9 +30,11 @@ router = APIRouter()
 async def websocket_system_metrics(websocket: WebSocket):
     """WebSocket endpoint for real-time system metrics."""
     await websocket.accept()
+    loop = asyncio.get_running_loop()
     try:
         while True:
-            metrics = SystemService.get_realtime_metrics()
+            # Collection blocks (CPU sampling, disk probe deadline): keep it off the event loop
+            metrics = await loop.run_in_executor(None, SystemService.get_realtime_metrics)
             await websocket.send_json(metrics)
             await asyncio.sleep(1)  # Send updates every second
     except WebSocketDisconnect:
@@ -60,6 +69,25 @@ def get_latest_metrics(db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="No metrics found")
     return metrics
 
+@router.get("/system/metrics/disks", response_model=List[DiskMetrics])
+def get_disk_metrics(
+    mountpoint: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Get per-mountpoint disk usage and I/O history."""
+    return SystemService.get_disk_metrics_history(db, mountpoint, limit)
+
+@router.get("/system/metrics/analytics", response_model=MetricsAnalytics)
+def get_metrics_analytics(
+    hours: float = Query(24, gt=0, le=24 * 366),
+    points: int = Query(200, ge=10, le=2000),
+    window: int = Query(5, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Percentiles, trends, moving averages and disk-full forecast over the metrics history."""
+    return SystemService.get_metrics_analytics(db, hours, points, window)
+
 @router.post("/system/metrics/collect")
 def collect_system_metrics(db: Session = Depends(get_db)):
     """Collect and store current system metrics."""
@@ -83,6 +111,19 @@ def get_system_logs(limit: int = 200, skip: int = 0):
     logs.reverse()  # Pour afficher du plus récent au plus ancien
     return {"logs": logs, "total": total}
 
+def _retention_status(job: dict) -> dict:
+    return {**job, "last_report": retention_manager.last_report}
+
+@router.get("/system/retention", response_model=RetentionStatus)
+def get_retention_status():
+    """Retention job state and the report of its last run (rows deleted, space reclaimed)."""
+    return _retention_status(analysis_scheduler.get("retention"))
+
+@router.post("/system/retention/run", response_model=RetentionStatus, status_code=202)
+def run_retention():
+    """Apply the retention policies now in the background; poll /system/retention."""
+    return _retention_status(analysis_scheduler.run("retention"))
+
 # Process endpoints
 @router.get("/processes", response_model=ProcessList)
 def get_processes(
@@ -147,6 +188,47 @@ def sync_services(db: Session = Depends(get_db)):
     count = ServiceService.sync_services(db)
     return {"message": f"Synced {count} services"}
 
+@router.post("/services/bulk", response_model=ServiceBulkResponse)
+async def bulk_service_actions(request: ServiceBulkRequest):
+    """Start, stop or restart many services concurrently."""
+    start = time.monotonic()
+    try:
+        results = await ServiceService.run_bulk_actions(
+            [action.dict() for action in request.actions], request.max_parallel
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ServiceBulkResponse(
+        results=results,
+        succeeded=sum(1 for r in results if r["status"] == "succeeded"),
+        failed=sum(1 for r in results if r["status"] in ("failed", "timeout")),
+        skipped=sum(1 for r in results if r["status"] == "skipped"),
+        duration=time.monotonic() - start
+    )
+
+@router.get("/services/jobs", response_model=List[ServiceJob])
+async def get_service_jobs(limit: int = Query(100, ge=1, le=1000)):
+    """List recent service control jobs."""
+    return service_jobs.list(limit)
+
+@router.get("/services/jobs/{job_id}", response_model=ServiceJob)
+async def get_service_job(job_id: str):
+    """Get the status of a service control job."""
+    job = service_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.delete("/services/jobs/{job_id}")
+async def cancel_service_job(job_id: str):
+    """Cancel a running service control job."""
+    if not service_jobs.get(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not service_jobs.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job already finished")
+    return {"message": f"Job {job_id} cancelled"}
+
 @router.get("/services/{name}", response_model=Service)
 def get_service(name: str, db: Session = Depends(get_db)):
     """Get service by name."""
@@ -155,29 +237,50 @@ def get_service(name: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Service not found")
     return service
 
-@router.post("/services/{name}/start")
-def start_service(name: str):
-    """Start a system service."""
-    success = ServiceService.start_service(name)
-    if not success:
-        raise HTTPException(status_code=400, detail="Failed to start service")
-    return {"message": f"Service {name} started successfully"}
+async def _submit_service_job(action: str, name: str, timeout: Optional[float],
+                              wait: bool, response: Response) -> dict:
+    try:
+        ServiceService.validate_service_name(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = service_jobs.submit(action, name, timeout)
+    if not wait:
+        return {**job, "message": f"Service {name} {action} started (job {job['job_id']})"}
+    
+    # Synchronous mode for clients that expect the final outcome in the response
+    job = await service_jobs.wait(job["job_id"]) or job
+    response.status_code = 200
+    return {**job, "message": f"Service {name} {action} {job['status']}"}
 
-@router.post("/services/{name}/stop")
-def stop_service(name: str):
-    """Stop a system service."""
-    success = ServiceService.stop_service(name)
-    if not success:
-        raise HTTPException(status_code=400, detail="Failed to stop service")
-    return {"message": f"Service {name} stopped successfully"}
+@router.post("/services/{name}/start", response_model=ServiceJob, status_code=202)
+async def start_service(
+    name: str,
+    response: Response,
+    timeout: Optional[float] = Query(None, gt=0, le=3600),
+    wait: bool = Query(False)
+):
+    """Start a system service in the background; poll /services/jobs/{job_id} (or pass ?wait=true)."""
+    return await _submit_service_job("start", name, timeout, wait, response)
 
-@router.post("/services/{name}/restart")
-def restart_service(name: str):
-    """Restart a system service."""
-    success = ServiceService.restart_service(name)
-    if not success:
-        raise HTTPException(status_code=400, detail="Failed to restart service")
-    return {"message": f"Service {name} restarted successfully"}
+@router.post("/services/{name}/stop", response_model=ServiceJob, status_code=202)
+async def stop_service(
+    name: str,
+    response: Response,
+    timeout: Optional[float] = Query(None, gt=0, le=3600),
+    wait: bool = Query(False)
+):
+    """Stop a system service in the background; poll /services/jobs/{job_id} (or pass ?wait=true)."""
+    return await _submit_service_job("stop", name, timeout, wait, response)
+
+@router.post("/services/{name}/restart", response_model=ServiceJob, status_code=202)
+async def restart_service(
+    name: str,
+    response: Response,
+    timeout: Optional[float] = Query(None, gt=0, le=3600),
+    wait: bool = Query(False)
+):
+    """Restart a system service in the background; poll /services/jobs/{job_id} (or pass ?wait=true)."""
+    return await _submit_service_job("restart", name, timeout, wait, response)
 
 # Network endpoints
 @router.get("/network/interfaces", response_model=NetworkInterfaceList)
@@ -229,23 +332,44 @@ def get_all_network_info():
 # Security endpoints
 @router.get("/security/events", response_model=SecurityEventList)
 def get_security_events(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Offset, only used without a cursor"),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     severity: Optional[str] = Query(None),
     resolved: Optional[bool] = Query(None),
+    event_type: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    ip_address: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None, description="Events at or after this time"),
+    until: Optional[datetime] = Query(None, description="Events before this time"),
     db: Session = Depends(get_db)
 ):
-    """Get all security events with pagination and filtering."""
-    events = SecurityService.get_security_events(db, skip, limit, severity, resolved)
-    total = SecurityService.get_security_event_count(db)
+    """Get security events, newest first, with filtering and cursor pagination."""
+    filters = dict(severity=severity or None, resolved=resolved, event_type=event_type,
+                   source=source, ip_address=ip_address, since=since, until=until)
+    if skip and not cursor:
+        events = SecurityService.get_security_events(db, skip, limit, **filters)
+        next_cursor = SecurityService.encode_cursor(events[-1]) if len(events) == limit else None
+        page = {"events": events, "next_cursor": next_cursor}
+    else:
+        try:
+            page = SecurityService.get_security_events_page(db, cursor, limit, **filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     
     return SecurityEventList(
-        events=events,
-        total=total,
+        events=page["events"],
+        total=SecurityService.count_security_events(db, **filters),
         page=skip // limit + 1,
-        size=limit
+        size=limit,
+        next_cursor=page["next_cursor"]
     )
 
+@router.post("/security/events/bulk", response_model=SecurityEventBulkResponse, status_code=201)
+def create_security_events(request: SecurityEventBulkCreate, db: Session = Depends(get_db)):
+    """Store many security events in one transaction."""
+    return SecurityEventBulkResponse(ids=SecurityService.create_security_events(db, request.events))
+
 @router.get("/security/events/{event_id}", response_model=SecurityEvent)
 def get_security_event(event_id: int, db: Session = Depends(get_db)):
     """Get security event by ID."""
@@ -275,26 +399,29 @@ def get_security_stats(db: Session = Depends(get_db)):
     """Get security statistics."""
     return SecurityService.get_security_stats(db)
 
+@router.get("/security/rules", response_model=List[SecurityRuleStats])
+def get_security_rules():
+    """List the security rules with their evaluation statistics."""
+    return SecurityService.get_rule_stats()
+
+@router.get("/security/network-baseline", response_model=NetworkBaselineStats)
+def get_network_baseline():
+    """Learned listening sockets and the state of the connection baseline."""
+    return SecurityService.get_network_baseline()
+
+@router.get("/security/integrity", response_model=ProcessIntegrityStats)
+def get_process_integrity():
+    """Executable hash cache and the issues found by the last process integrity scan."""
+    return SecurityService.get_process_integrity()
+
 @router.post("/security/scan")
 def scan_security(db: Session = Depends(get_db)):
     """Perform security scan for suspicious activity."""
+    # The rules engine stores the events it raises
     events = SecurityService.scan_for_suspicious_activity(db)
     
-    # Save events to database
-    saved_events = []
-    for event_data in events:
-        event = SecurityService.create_security_event(
-            db=db,
-            event_type=event_data.event_type,
-            severity=event_data.severity,
-            description=event_data.description,
-            source=event_data.source,
-            ip_address=event_data.ip_address
-        )
-        saved_events.append(event)
-    
     return {
         "message": f"Security scan completed. Found {len(events)} events.",
         "events_found": len(events),
-        "events_saved": len(saved_events)
+        "events_saved": len(events)
     }
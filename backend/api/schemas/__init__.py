@@ -1,26 +1,31 @@
 from .system import (
     SystemInfo, 
     SystemMetrics, 
+    DiskMetrics,
     Process, 
     Service, 
     NetworkInterface, 
     SecurityEvent,
     SystemMetricsCreate,
+    DiskMetricsCreate,
     ProcessCreate,
     ServiceCreate,
     NetworkInterfaceCreate,
     SecurityEventCreate
 )
 from .user import User, UserCreate, UserUpdate, UserLogin
+from .files import FileEntry, DirectoryPage
 
 __all__ = [
     "SystemInfo",
     "SystemMetrics",
+    "DiskMetrics",
     "Process", 
     "Service",
     "NetworkInterface",
     "SecurityEvent",
     "SystemMetricsCreate",
+    "DiskMetricsCreate",
     "ProcessCreate",
     "ServiceCreate",
     "NetworkInterfaceCreate",
@@ -28,5 +33,7 @@ __all__ = [
     "User",
     "UserCreate",
     "UserUpdate",
-    "UserLogin"
+    "UserLogin",
+    "FileEntry",
+    "DirectoryPage"
 ]
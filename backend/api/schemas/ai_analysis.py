@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 class AIInsight(BaseModel):
     id: int
@@ -10,9 +11,10 @@ class AIInsight(BaseModel):
 
 class AIAnalysisStats(BaseModel):
     insights_generated: int
-    optimizations_applied: int
-    security_issues_fixed: int
-    performance_gain_percentage: float
+    # None: not measured (nothing applies optimizations or measures their effect)
+    optimizations_applied: Optional[int] = None
+    security_issues_fixed: Optional[int] = None  # security events marked as resolved
+    performance_gain_percentage: Optional[float] = None
 
 class AIAnalysisStatus(BaseModel):
     system_scan_progress: float
@@ -26,3 +28,14 @@ class AIAnalysisData(BaseModel):
     status: AIAnalysisStatus
     insights: List[AIInsight]
 
+
+class AIAnalysisJob(BaseModel):
+    name: str
+    status: str  # idle, running, succeeded, failed, cancelled
+    progress: float
+    interval: float
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration: Optional[float] = None
+    findings: int = 0
+    error: Optional[str] = None
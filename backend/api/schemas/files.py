@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class FileEntry(BaseModel):
+    name: str
+    path: str
+    type: str  # directory, file
+    size: Optional[int] = None  # file size, or subtree size for a directory
+    file_count: Optional[int] = None
+    dir_count: Optional[int] = None
+    size_pending: bool = False  # directory totals still being computed
+
+class DirectoryPage(BaseModel):
+    path: str
+    parent: Optional[str] = None
+    entries: List[FileEntry]
+    total_entries: int
+    next_cursor: Optional[str] = None
+    size: Optional[int] = None
+    file_count: Optional[int] = None
+    dir_count: Optional[int] = None
+    size_pending: bool = False
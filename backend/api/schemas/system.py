@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal, Dict
 from datetime import datetime
 
 # Base schemas
@@ -39,6 +39,32 @@ class SystemInfo(BaseModel):
     # Disks
     disks: List[DiskInfo]
 
+class DiskMetricsBase(BaseModel):
+    device: str
+    mountpoint: str
+    fstype: Optional[str] = None
+    total: Optional[float] = None
+    used: Optional[float] = None
+    free: Optional[float] = None
+    usage: Optional[float] = None
+    read_iops: Optional[float] = None
+    write_iops: Optional[float] = None
+    read_throughput: Optional[float] = None
+    write_throughput: Optional[float] = None
+    read_await: Optional[float] = None
+    write_await: Optional[float] = None
+
+class DiskMetricsCreate(DiskMetricsBase):
+    pass
+
+class DiskMetrics(DiskMetricsBase):
+    id: int
+    system_metrics_id: int
+    timestamp: datetime
+    
+    class Config:
+        from_attributes = True
+
 class SystemMetricsBase(BaseModel):
     cpu_usage: Optional[float] = None
     cpu_temperature: Optional[float] = None
@@ -55,7 +81,7 @@ class SystemMetricsBase(BaseModel):
     uptime: Optional[float] = None
 
 class SystemMetricsCreate(SystemMetricsBase):
-    pass
+    disks: List[DiskMetricsCreate] = []
 
 class SystemMetrics(SystemMetricsBase):
     id: int
@@ -64,6 +90,38 @@ class SystemMetrics(SystemMetricsBase):
     class Config:
         from_attributes = True
 
+class MetricSummary(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p95: Optional[float] = None
+    p99: Optional[float] = None
+    slope_per_hour: Optional[float] = None
+
+class MetricSeries(BaseModel):
+    values: List[Optional[float]]
+    moving_average: List[Optional[float]]
+
+class DiskForecast(BaseModel):
+    current_usage: float
+    growth_per_hour: float  # percentage points
+    hours_until_full: Optional[float] = None
+    full_at: Optional[datetime] = None
+
+class MetricsAnalytics(BaseModel):
+    start: datetime
+    end: datetime
+    samples: int
+    summaries: Dict[str, MetricSummary]
+    timestamps: List[datetime]  # bucket centers of the series
+    series: Dict[str, MetricSeries]
+    cpu_memory_correlation: Optional[float] = None
+    disk_forecast: Optional[DiskForecast] = None
+    duration: float
+
 class ProcessBase(BaseModel):
     pid: int
     name: str
@@ -73,7 +131,8 @@ class ProcessBase(BaseModel):
     status: Optional[str] = None
 
 class ProcessCreate(ProcessBase):
-    pass
+    memory_rss: Optional[float] = None  # MB, fed to the analysis engine only
+    exe: Optional[str] = None  # fed to the integrity scanner only
 
 class Process(ProcessBase):
     id: int
@@ -94,6 +153,47 @@ class ServiceBase(BaseModel):
 class ServiceCreate(ServiceBase):
     pass
 
+class ServiceAction(BaseModel):
+    name: str
+    action: Literal["start", "stop", "restart"]
+    depends_on: List[str] = []
+
+class ServiceActionResult(BaseModel):
+    name: str
+    action: str
+    status: str  # succeeded, failed, timeout, skipped
+    returncode: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+    started_at: Optional[datetime] = None
+    duration: float = 0.0
+
+class ServiceJob(BaseModel):
+    job_id: str
+    name: str
+    action: str
+    status: str  # running, succeeded, failed, timeout, cancelled
+    timeout: float
+    returncode: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration: Optional[float] = None
+    message: Optional[str] = None
+
+class ServiceBulkRequest(BaseModel):
+    actions: List[ServiceAction] = Field(..., min_length=1)
+    max_parallel: Optional[int] = Field(None, ge=1, le=64)
+
+class ServiceBulkResponse(BaseModel):
+    results: List[ServiceActionResult]
+    succeeded: int
+    failed: int
+    skipped: int
+    duration: float
+
 class Service(ServiceBase):
     id: int
     created_at: datetime
@@ -143,6 +243,87 @@ class SecurityEvent(SecurityEventBase):
     class Config:
         from_attributes = True
 
+class SecurityEventBulkCreate(BaseModel):
+    events: List[SecurityEventCreate] = Field(..., min_length=1, max_length=10000)
+
+class SecurityEventBulkResponse(BaseModel):
+    ids: List[int]
+
+class SecurityRuleStats(BaseModel):
+    name: str
+    stream: str
+    field: str
+    condition: str
+    threshold: float
+    sustain: float  # seconds the condition must hold
+    suppress: float  # seconds
+    severity: str
+    evaluations: int
+    matches: int
+    events: int
+    suppressed: int
+    total_time_ms: float
+    avg_time_us: float
+    last_evaluated_at: Optional[float] = None
+
+class NetworkListener(BaseModel):
+    process_name: str
+    type: str  # SOCK_STREAM, SOCK_DGRAM
+    port: Optional[int] = None  # None: any port of the ephemeral range
+    scope: str  # loopback, network
+    last_seen: float
+
+class NetworkBaselineStats(BaseModel):
+    learning: bool
+    started_at: Optional[float] = None
+    snapshots: int
+    events: int
+    listeners: List[NetworkListener]
+    processes: int
+    endpoint_observations: int
+    sketch_fill_ratio: float
+
+class ProcessIntegrityIssue(BaseModel):
+    kind: str  # executable_deleted, executable_replaced, executable_tampered
+    severity: str
+    pid: int
+    name: str
+    path: str
+    description: str
+
+class ProcessIntegrityStats(BaseModel):
+    cached: int  # executables in the hash cache
+    hashed: int
+    hashed_bytes: int
+    cache_hits: int
+    last_scan: Optional[Dict] = None
+    issues: List[ProcessIntegrityIssue]
+
+class RetentionTableReport(BaseModel):
+    deleted: int
+    cutoff: datetime
+    archived: bool
+
+class RetentionLogReport(BaseModel):
+    size: int  # bytes before rotation
+    rotated: bool
+
+class RetentionReport(BaseModel):
+    started_at: datetime
+    tables: Dict[str, RetentionTableReport]
+    log: Optional[RetentionLogReport] = None
+    vacuumed_pages: int
+    database_size: Optional[int] = None  # bytes
+    reclaimed_bytes: Optional[int] = None
+    duration: float
+
+class RetentionStatus(BaseModel):
+    status: str  # idle, running, succeeded, failed, cancelled
+    progress: float
+    interval: float
+    error: Optional[str] = None
+    last_report: Optional[RetentionReport] = None
+
 # Response schemas
 class SystemOverview(BaseModel):
     system_info: SystemInfo
@@ -172,6 +353,7 @@ class NetworkInterfaceList(BaseModel):
 
 class SecurityEventList(BaseModel):
     events: List[SecurityEvent]
-    total: int
+    total: int  # cached for a few seconds, may lag recent changes
     page: int
     size: int
+    next_cursor: Optional[str] = None
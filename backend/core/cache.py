@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+class BackgroundRefreshCache:
+    """Cache a single value and refresh it in a background thread once it expires.
+
+    The first read loads synchronously. Afterwards, readers always get the last
+    stored value immediately; a stale read starts (at most) one refresh thread.
+    """
+
+    def __init__(self, loader: Callable[[], Any], ttl: float, name: str = "cache"):
+        self._loader = loader
+        self._ttl = ttl
+        self._name = name
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self) -> Any:
+        """Return the cached value, loading or scheduling a refresh if needed"""
+        if self._loaded_at is None:
+            with self._lock:
+                if self._loaded_at is None:
+                    self._store(self._loader())
+            return self._value
+
+        if time.monotonic() - self._loaded_at > self._ttl:
+            self._refresh_in_background()
+        return self._value
+
+    def invalidate(self):
+        """Mark the value as stale so the next read triggers a refresh"""
+        if self._loaded_at is not None:
+            self._loaded_at = float("-inf")
+
+    @property
+    def value(self) -> Any:
+        """Last loaded value (None if never loaded), without side effects"""
+        return self._value
+
+    def _store(self, value: Any):
+        self._value = value
+        self._loaded_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        thread = threading.Thread(target=self._refresh, name=f"{self._name}-refresh", daemon=True)
+        thread.start()
+
+    def _refresh(self):
+        try:
+            self._store(self._loader())
+        except Exception as e:
+            print(f"Error refreshing {self._name}: {e}")
+        finally:
+            self._refreshing = False
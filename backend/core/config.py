@@ -27,6 +27,100 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     log_file: str = "indraos.log"
     
+    # System info cache (seconds)
+    system_info_memory_ttl: float = 2.0
+    system_info_disk_ttl: float = 30.0
+    
+    # Disk probes
+    disk_probe_timeout: float = 2.0
+    disk_probe_workers: int = 8
+    
+    # systemd (Linux services)
+    systemd_bus_address: str = "SYSTEM"
+    systemd_query_timeout: float = 5.0
+    
+    # Service control
+    service_action_timeout: float = 60.0
+    service_bulk_parallelism: int = 8
+    service_job_history: int = 200
+    
+    # File browser (/api/files)
+    file_browser_roots: list = []  # empty: browsing disabled (the endpoint is unauthenticated)
+    file_browser_page_size: int = 200
+    file_browser_max_page_size: int = 1000
+    file_browser_listing_cache: int = 64
+    file_browser_size_ttl: float = 300.0
+    file_browser_size_cache_entries: int = 100000
+    file_browser_size_workers: int = 2
+    
+    # Analysis engine (/api/ai-analysis)
+    analysis_zscore_threshold: float = 3.0
+    analysis_min_sample_interval: float = 10.0  # seconds between metrics samples
+    analysis_warmup_samples: int = 30
+    analysis_short_half_life: float = 30.0
+    analysis_baseline_window: float = 3600.0
+    analysis_seasonal_half_life: float = 604800.0
+    analysis_seasonal_min_samples: int = 60
+    analysis_process_cpu_threshold: float = 50.0
+    analysis_process_warmup_samples: int = 5
+    analysis_forecast_half_life: float = 21600.0
+    analysis_forecast_min_samples: int = 10
+    analysis_forecast_min_span: float = 1800.0
+    analysis_disk_full_horizon: float = 72.0  # hours
+    analysis_leak_min_rate: float = 10.0  # MB/h
+    analysis_leak_min_r2: float = 0.8
+    
+    # Scheduled analysis jobs (seconds between runs)
+    analysis_job_workers: int = 2
+    analysis_system_scan_interval: float = 60.0
+    analysis_security_interval: float = 300.0
+    analysis_performance_interval: float = 120.0
+    analysis_optimization_interval: float = 3600.0
+    analysis_process_memory_threshold: float = 25.0  # % of RAM
+    analysis_volume_usage_threshold: float = 90.0  # %
+    analysis_temp_size_threshold: float = 5.0  # GB
+    
+    # Security rules engine
+    security_rules_file: Optional[str] = None  # JSON list replacing the default rules
+    security_rule_suppress_window: float = 3600.0
+    security_event_queue_size: int = 10000
+    security_event_batch_size: int = 500
+    security_event_count_ttl: float = 10.0
+    
+    # Network baseline (new listeners, connection fan-out spikes)
+    network_baseline_file: Optional[str] = "network_baseline.json"
+    network_baseline_learning: float = 86400.0  # seconds before anything is flagged
+    network_baseline_save_interval: float = 300.0
+    network_baseline_sketch_width: int = 4096
+    network_baseline_sketch_depth: int = 4
+    network_baseline_max_listeners: int = 1024
+    network_baseline_listener_ttl: float = 2592000.0  # forget listeners unseen for 30 days
+    network_fanout_half_life: float = 86400.0
+    network_fanout_warmup_samples: int = 10
+    network_fanout_zscore: float = 4.0
+    network_fanout_min_std: float = 2.0
+    network_fanout_min_hosts: int = 20
+    
+    # Process integrity (executable hashes)
+    process_integrity_interval: float = 900.0
+    process_integrity_workers: int = 2
+    process_integrity_cache_file: Optional[str] = "process_hashes.json"
+    process_integrity_verify_interval: float = 604800.0  # rehash unchanged executables weekly
+    process_integrity_cache_ttl: float = 2592000.0  # forget executables not seen for 30 days
+    
+    # Retention (0 days keeps rows forever)
+    retention_interval: float = 3600.0
+    retention_system_metrics_days: int = 30
+    retention_security_events_days: int = 90
+    retention_security_events_resolved_only: bool = False
+    retention_archive_dir: Optional[str] = None  # gzipped JSON lines of the deleted rows
+    retention_batch_size: int = 1000
+    retention_batch_pause: float = 0.05
+    retention_vacuum_pages: int = 512
+    retention_convert_auto_vacuum: bool = False  # one full VACUUM to enable incremental vacuum
+    retention_log_max_mb: float = 50.0
+    retention_log_backups: int = 3
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
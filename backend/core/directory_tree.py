@@ -0,0 +1,2517 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import abc
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import json
+from pathlib import Path
+from datetime import datetime
+from typing import List, Dict, Generator, Iterator, Optional, Union, Set
+import fnmatch
+import hashlib
+import heapq
+import logging
+import mmap
+import re
+import select
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import timeit
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TreeNode:
+    """Entrée de l'arborescence (fichier ou dossier) lue via os.scandir."""
+    
+    __slots__ = ('name', 'path', 'is_dir', 'size')
+    
+    def __init__(self, name: str, path: str, is_dir: bool, size: Optional[int] = None):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.size = size
+
+
+# Résultat brut de la lecture d'un dossier (calculé éventuellement dans un thread)
+DirListing = namedtuple('DirListing', ['nodes', 'error', 'excluded', 'stat_errors'])
+
+
+class ScanCache:
+    """
+    Cache disque des listings de dossiers, validé par le mtime du dossier.
+    
+    Un dossier dont le mtime n'a pas changé depuis la dernière exploration
+    n'est pas relu : ses entrées (nom, type, taille) viennent du cache, et
+    le parcours se réduit à un stat() par dossier. Le mtime d'un dossier ne
+    change qu'à l'ajout, la suppression ou le renommage d'une entrée : la
+    taille d'un fichier modifié sur place reste celle du cache jusqu'à ce
+    que son dossier change (compromis de type locate/ncdu).
+    
+    Stockage : une base SQLite par racine et configuration, une ligne par
+    dossier indexée par son chemin. Chaque dossier est cherché à la demande
+    (rien n'est chargé en entier en mémoire) et ses entrées sont stockées en
+    JSON : le fichier ne contient que des données, jamais de code exécuté
+    au chargement. Les écritures sont groupées par lots de BATCH_SIZE.
+    
+    Le cache n'est valable que pour un jeu d'exclusions donné (signature) ;
+    un dossier modifié dans les MTIME_MARGIN_NS précédant la lecture n'est
+    pas mis en cache, la résolution du mtime pouvant masquer un changement.
+    """
+    
+    VERSION = 2
+    MTIME_MARGIN_NS = 2 * 10**9
+    BATCH_SIZE = 500
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.signature = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._opened_as = None
+        # Numéro de l'exploration en cours : les lignes non revues sont purgées
+        self._scan = 0
+        self._pending_rows: List[tuple] = []
+        self._pending_seen: List[bytes] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def default_path(root: Union[str, Path], signature: tuple) -> str:
+        """Fichier de cache par dossier racine et configuration, sous ~/.cache."""
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        key = repr((str(root), signature)).encode('utf-8', 'surrogateescape')
+        digest = hashlib.sha1(key).hexdigest()[:16]
+        return os.path.join(base, 'directory-tree-explorer', f'{digest}.sqlite3')
+    
+    def open(self, root: Union[str, Path], signature: tuple):
+        """Ouvre le cache de `root` (recréé s'il est absent, illisible ou d'une autre configuration)."""
+        path = self.path or self.default_path(root, signature)
+        with self._lock:
+            self.hits = self.misses = 0
+            self._pending_rows = []
+            self._pending_seen = []
+            if (path, signature) != self._opened_as:
+                self._close_db()
+                self.signature = signature
+                self._opened_as = (path, signature)
+                self._db = self._connect(path, signature)
+            if self._db is not None:
+                try:
+                    self._scan = self._next_scan()
+                except sqlite3.Error as e:
+                    self._disable(e)
+    
+    def _connect(self, path: str, signature: tuple) -> Optional[sqlite3.Connection]:
+        for attempt in range(2):
+            db = None
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+                self._init_schema(db, signature)
+                return db
+            except sqlite3.OperationalError as e:
+                error = e
+            except sqlite3.DatabaseError as e:
+                # Fichier corrompu ou d'un autre format : on repart d'une base vide
+                error = e
+                if attempt == 0 and db is not None:
+                    db.close()
+                    db = None
+                    try:
+                        os.remove(path)
+                        continue
+                    except OSError:
+                        pass
+            except OSError as e:
+                error = e
+            if db is not None:
+                db.close()
+            break
+        logging.getLogger(__name__).warning(f"Cache ignoré ({path}): {error}")
+        return None
+    
+    def _init_schema(self, db: sqlite3.Connection, signature: tuple):
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        with db:
+            db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            fmt = json.dumps([self.VERSION, signature])
+            row = db.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+            if row is not None and row[0] == fmt:
+                return
+            # Autre version ou autre configuration : les listings ne sont plus valables
+            db.execute('DROP TABLE IF EXISTS dirs')
+            db.execute('CREATE TABLE dirs (path BLOB PRIMARY KEY, mtime_ns INTEGER NOT NULL, '
+                       'excluded INTEGER NOT NULL, stat_errors INTEGER NOT NULL, '
+                       'entries TEXT NOT NULL, scan INTEGER NOT NULL) WITHOUT ROWID')
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('format', ?)", (fmt,))
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('scan', '0')")
+    
+    def _next_scan(self) -> int:
+        with self._db:
+            (scan,) = self._db.execute("SELECT value FROM meta WHERE key = 'scan'").fetchone()
+            scan = int(scan) + 1
+            self._db.execute("UPDATE meta SET value = ? WHERE key = 'scan'", (str(scan),))
+        return scan
+    
+    def get(self, directory: str, mtime_ns: int) -> Optional[DirListing]:
+        """Listing en cache si le dossier n'a pas changé, sinon None."""
+        key = os.fsencode(directory)
+        row = None
+        with self._lock:
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        'SELECT mtime_ns, excluded, stat_errors, entries FROM dirs WHERE path = ?',
+                        (key,)).fetchone()
+                except sqlite3.Error as e:
+                    self._disable(e)
+            if row is None or row[0] != mtime_ns:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._pending_seen.append(key)
+            if len(self._pending_seen) >= self.BATCH_SIZE:
+                self._flush()
+        
+        _mtime, excluded, stat_errors, entries = row
+        nodes = [TreeNode(name, os.path.join(directory, name), is_dir, size)
+                 for name, is_dir, size in json.loads(entries)]
+        return DirListing(nodes, None, excluded, stat_errors)
+    
+    def put(self, directory: str, mtime_ns: int, listing: DirListing, read_at_ns: int):
+        """Enregistre un listing lu sur le disque."""
+        if listing.error is not None or read_at_ns - mtime_ns < self.MTIME_MARGIN_NS:
+            return
+        entries = json.dumps([(node.name, node.is_dir, node.size) for node in listing.nodes],
+                             separators=(',', ':'))
+        with self._lock:
+            if self._db is None:
+                return
+            self._pending_rows.append((os.fsencode(directory), mtime_ns, listing.excluded,
+                                       listing.stat_errors, entries, self._scan))
+            if len(self._pending_rows) >= self.BATCH_SIZE:
+                self._flush()
+    
+    def save(self, complete: bool):
+        """
+        Écrit les listings en attente.
+        
+        Après un parcours complet, les dossiers non revus (supprimés depuis)
+        sont purgés ; après un parcours limité par la profondeur ou
+        interrompu, les entrées non revues sont gardées.
+        """
+        with self._lock:
+            self._flush()
+            if not complete or self._db is None:
+                return
+            try:
+                with self._db:
+                    self._db.execute('DELETE FROM dirs WHERE scan < ?', (self._scan,))
+            except sqlite3.Error as e:
+                self._disable(e)
+    
+    def close(self):
+        """Écrit les listings en attente et ferme la base."""
+        with self._lock:
+            self._flush()
+            self._close_db()
+            self._opened_as = None
+    
+    def _flush(self):
+        """Écrit le lot en attente en une transaction (verrou tenu par l'appelant)."""
+        rows, seen = self._pending_rows, self._pending_seen
+        self._pending_rows, self._pending_seen = [], []
+        if self._db is None or not (rows or seen):
+            return
+        try:
+            with self._db:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO dirs (path, mtime_ns, excluded, stat_errors, entries, scan) '
+                    'VALUES (?, ?, ?, ?, ?, ?)', rows)
+                self._db.executemany('UPDATE dirs SET scan = ? WHERE path = ?',
+                                     [(self._scan, key) for key in seen])
+        except sqlite3.Error as e:
+            self._disable(e)
+    
+    def _disable(self, error: Exception):
+        """Erreur SQLite en cours de route : le parcours continue sans cache."""
+        logging.getLogger(__name__).warning(f"Cache désactivé ({self._opened_as[0]}): {error}")
+        self._close_db()
+    
+    def _close_db(self):
+        db, self._db = self._db, None
+        if db is not None:
+            try:
+                db.close()
+            except sqlite3.Error:
+                pass
+
+
+# Événement du parcours : kind parmi 'enter', 'leave', 'file', 'cut', 'error'
+# 'leave' et 'cut' portent les totaux (DirTotals) du sous-dossier
+TreeEvent = namedtuple('TreeEvent', ['kind', 'node', 'is_last', 'error', 'totals'],
+                       defaults=[None])
+
+
+class DirTotals:
+    """Totaux d'un sous-arbre, agrégés de bas en haut pendant le parcours."""
+    
+    __slots__ = ('size', 'files', 'dirs', 'largest_size', 'largest_path')
+    
+    def __init__(self):
+        self.size = 0
+        self.files = 0
+        self.dirs = 0
+        self.largest_size = -1
+        self.largest_path = None
+    
+    def add_file(self, node: TreeNode):
+        self.files += 1
+        if node.size is not None:
+            self.size += node.size
+            if node.size > self.largest_size:
+                self.largest_size = node.size
+                self.largest_path = node.path
+    
+    def add_subtree(self, child: 'DirTotals'):
+        self.size += child.size
+        self.files += child.files
+        self.dirs += child.dirs + 1
+        if child.largest_size > self.largest_size:
+            self.largest_size = child.largest_size
+            self.largest_path = child.largest_path
+
+
+class TreeLineRenderer:
+    """
+    Transforme les événements de parcours en lignes d'arborescence texte.
+    
+    Avec --dir-sizes, la ligne d'un dossier n'est complète qu'à sa sortie
+    ('leave') : les lignes sont alors retenues jusqu'à la fermeture de leur
+    dossier de premier niveau, puis rendues dans l'ordre.
+    """
+    
+    def __init__(self, explorer: 'DirectoryTreeExplorer', prefix: str = ""):
+        self.explorer = explorer
+        self.root_prefix = prefix
+        # Préfixe d'indentation de chaque dossier ouvert
+        self.prefixes: List[str] = []
+        # Mode --dir-sizes : lignes en attente et index de la ligne de chaque dossier ouvert
+        self.pending: List[str] = []
+        self.open_lines: List[int] = []
+    
+    def _dir_annotation(self, totals: DirTotals) -> str:
+        return f" ({self.explorer._format_size(totals.size)}, {totals.files} fichiers)"
+    
+    def feed(self, event: TreeEvent) -> List[str]:
+        """Retourne les lignes prêtes à être écrites après cet événement."""
+        dir_sizes = self.explorer.dir_sizes
+        kind = event.kind
+        if kind == 'leave':
+            self.prefixes.pop()
+            if not dir_sizes or not self.open_lines:
+                return []
+            self.pending[self.open_lines.pop()] += self._dir_annotation(event.totals)
+            return self._flush()
+        if kind == 'enter' and not self.prefixes:
+            # Racine : pas de ligne, seulement le préfixe de ses enfants
+            self.prefixes.append(self.root_prefix)
+            return []
+        if kind == 'error':
+            return self._emit(f"❌ Erreur lecture: {event.error}")
+        
+        prefix = self.prefixes[-1]
+        node = event.node
+        
+        # Symboles pour l'arborescence
+        if event.is_last:
+            current_prefix = "└── "
+            next_prefix = prefix + "    "
+        else:
+            current_prefix = "├── "
+            next_prefix = prefix + "│   "
+        
+        # Construction de la ligne
+        line = f"{prefix}{current_prefix}{self.explorer._icon_for(node.name, node.is_dir)} {node.name}"
+        if not node.is_dir and self.explorer.show_size:
+            size = self.explorer._format_size(node.size) if node.size is not None else "? B"
+            line += f" ({size})"
+        elif kind == 'cut' and dir_sizes and event.totals is not None:
+            line += self._dir_annotation(event.totals)
+        
+        if kind == 'enter':
+            self.prefixes.append(next_prefix)
+            if dir_sizes:
+                # Taille connue à la sortie du dossier
+                self.open_lines.append(len(self.pending))
+                self.pending.append(line)
+                return []
+        return self._emit(line)
+    
+    def _emit(self, line: str) -> List[str]:
+        if not self.open_lines:
+            return [line]
+        self.pending.append(line)
+        return []
+    
+    def _flush(self) -> List[str]:
+        if self.open_lines:
+            return []
+        lines, self.pending = self.pending, []
+        return lines
+
+
+class JsonTreeEncoder:
+    """
+    Encodeur JSON en flux de l'arborescence.
+    
+    Chaque nœud est écrit dès son événement, avec la même mise en forme que
+    json.dump(indent=2) ; seule la pile des dossiers ouverts reste en mémoire.
+    Un dossier non exploré (au-delà de max_depth) est écrit '{}', ou sans
+    "children" avec dir_sizes.
+    """
+    
+    def __init__(self, out, indent: int = 2, level: int = 0, dir_sizes: bool = False):
+        self.write = out.write
+        # Ajoute "size" et "file_count" à chaque dossier (après "children")
+        self.dir_sizes = dir_sizes
+        self.indent = indent
+        # Niveau d'indentation de l'objet racine dans le document englobant
+        self.level = level
+        # Pour chaque dossier ouvert : sa liste "children" a-t-elle déjà un élément ?
+        self.open_dirs: List[bool] = []
+        self.started = False
+    
+    def _newline(self, level: int) -> str:
+        return "\n" + " " * (self.indent * level)
+    
+    def _begin_item(self) -> int:
+        """Écrit le séparateur avant un nouvel objet et retourne son niveau."""
+        if not self.open_dirs:
+            self.started = True
+            return self.level
+        level = self.level + 2 * len(self.open_dirs)
+        self.write(("," if self.open_dirs[-1] else "") + self._newline(level))
+        self.open_dirs[-1] = True
+        return level
+    
+    def _write_fields(self, level: int, fields: list, last_open: Optional[str] = None):
+        """Écrit '{' puis les paires clé/valeur, une par ligne."""
+        newline = self._newline(level + 1)
+        parts = [f"{newline}{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}"
+                 for key, value in fields]
+        if last_open is not None:
+            parts.append(f"{newline}{json.dumps(last_open)}: [")
+        self.write("{" + ",".join(parts))
+    
+    def feed(self, event: TreeEvent):
+        kind = event.kind
+        node = event.node
+        if kind == 'enter':
+            level = self._begin_item()
+            self._write_fields(level, [("name", node.name), ("path", node.path),
+                                       ("type", "directory")], last_open="children")
+            self.open_dirs.append(False)
+        elif kind == 'leave':
+            has_children = self.open_dirs.pop()
+            level = self.level + 2 * len(self.open_dirs)
+            self.write((self._newline(level + 1) if has_children else "") + "]")
+            if self.dir_sizes:
+                self.write("".join(f",{self._newline(level + 1)}{json.dumps(key)}: "
+                                   f"{json.dumps(value, ensure_ascii=False)}"
+                                   for key, value in self._size_fields(event.totals)))
+            self.write(self._newline(level) + "}")
+        elif kind == 'file':
+            level = self._begin_item()
+            self._write_fields(level, [
+                ("name", node.name),
+                ("path", node.path),
+                ("type", "file"),
+                ("size", node.size or 0),
+                ("extension", os.path.splitext(node.name)[1].lower())
+            ])
+            self.write(self._newline(level) + "}")
+        elif kind == 'cut':
+            level = self._begin_item()
+            if not self.dir_sizes:
+                self.write("{}")
+                return
+            self._write_fields(level, [("name", node.name), ("path", node.path),
+                                       ("type", "directory")] + self._size_fields(event.totals))
+            self.write(self._newline(level) + "}")
+    
+    @staticmethod
+    def _size_fields(totals: 'DirTotals') -> list:
+        return [("size", totals.size), ("file_count", totals.files),
+                ("largest_file", totals.largest_path)]
+    
+    def finish(self):
+        """Termine le document (arbre vide si rien n'a été exploré)."""
+        if not self.started:
+            self.write("{}")
+
+
+class ExcludeMatcher:
+    """
+    Patterns d'exclusion compilés une seule fois.
+    
+    Les noms exacts ('node_modules') et les suffixes simples ('*.pyc') vont
+    dans des ensembles (test par hachage), les autres patterns dans une
+    expression régulière unique. Le test se fait sur le nom de l'entrée ;
+    seuls les patterns contenant un '/' ('docs/_build') sont comparés au
+    chemin. Les résultats par nom sont mis en cache dans une table bornée.
+    """
+    
+    CACHE_SIZE = 65536
+    
+    def __init__(self, patterns: List[str], show_hidden: bool = False):
+        self.show_hidden = show_hidden
+        # Même règle de casse que fnmatch.fnmatch (insensible sous Windows)
+        self._fold = str.lower if os.path.normcase('A') == 'a' else str
+        
+        self.names: Set[str] = set()
+        self.suffixes: Set[str] = set()
+        name_regexes = []
+        path_regexes = []
+        for pattern in patterns:
+            pattern = self._fold(pattern.replace(os.sep, '/'))
+            if '/' in pattern:
+                path_regexes.append(fnmatch.translate(pattern))
+            elif not self._has_magic(pattern):
+                self.names.add(pattern)
+            elif pattern.startswith('*') and not self._has_magic(pattern[1:]):
+                self.suffixes.add(pattern[1:])
+            else:
+                name_regexes.append(fnmatch.translate(pattern))
+        
+        self._suffix_lengths = sorted({len(suffix) for suffix in self.suffixes})
+        self._name_regex = re.compile('|'.join(name_regexes)).match if name_regexes else None
+        # Un pattern avec '/' s'applique à la fin du chemin : 'docs/_build' => '.../docs/_build'
+        self._path_regex = (
+            re.compile('(?s:.*/)?(?:' + '|'.join(path_regexes) + ')').match if path_regexes else None
+        )
+        self._cache: Dict[str, bool] = {}
+    
+    @staticmethod
+    def _has_magic(pattern: str) -> bool:
+        return any(char in pattern for char in '*?[')
+    
+    def matches_name(self, name: str) -> bool:
+        """Vérifie si un nom d'entrée est exclu (hors patterns de chemin)."""
+        cached = self._cache.get(name)
+        if cached is not None:
+            return cached
+        
+        folded = self._fold(name)
+        excluded = (
+            (not self.show_hidden and name.startswith('.'))
+            or folded in self.names
+            or any(folded[-length:] in self.suffixes for length in self._suffix_lengths
+                   if len(folded) >= length)
+            or (self._name_regex is not None and self._name_regex(folded) is not None)
+        )
+        
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[name] = excluded
+        return excluded
+    
+    def matches(self, name: str, path: str) -> bool:
+        """Vérifie si une entrée (nom + chemin complet) est exclue."""
+        if self.matches_name(name):
+            return True
+        if self._path_regex is None:
+            return False
+        return self._path_regex(self._fold(path.replace(os.sep, '/'))) is not None
+
+
+class DirectoryTreeExplorer:
+    """Explorateur d'arborescence de dossiers avec options avancées."""
+    
+    # Patterns d'exclusion par défaut plus complets
+    DEFAULT_EXCLUDE_PATTERNS = [
+        # Fichiers Python
+        '*.pyc', '*.pyo', '*.pyd', '__pycache__', '*.egg-info',
+        # Environnements virtuels Python
+        'venv', 'env', '.venv', '.env', 'virtualenv', '.virtualenv',
+        'pipenv', '.pipenv', 'conda-meta',
+        # Node.js
+        'node_modules', 'npm-debug.log', 'yarn-error.log', '.npm', '.yarn',
+        # Git et autres VCS
+        '.git', '.svn', '.hg', '.bzr', 'CVS',
+        # IDE et éditeurs
+        '.vscode', '.idea', '*.swp', '*.swo', '*~', '.DS_Store', 'Thumbs.db',
+        # Build et cache
+        'build', 'dist', '.cache', '.pytest_cache', '.mypy_cache', '.tox',
+        'target', 'bin', 'obj', '.gradle',
+        # Logs et temporaires
+        '*.log', '*.tmp', '*.temp', '*.bak', '*.old', '*.orig',
+        # Archives et binaires
+        '*.zip', '*.rar', '*.7z', '*.tar', '*.gz', '*.exe', '*.dll', '*.so',
+        # Documentation générée
+        'docs/_build', 'site', '_site',
+        # Autres
+        '.coverage', '.nyc_output', 'coverage', '.sass-cache'
+    ]
+    
+    # Tampon d'écriture des exports (écriture au fil du parcours)
+    WRITE_BUFFER_SIZE = 1 << 16
+    
+    # Formats d'export (classes associées : EXPORTERS, après la classe)
+    EXPORT_FORMATS = ('txt', 'json', 'html')
+    
+    def __init__(self, show_hidden: bool = False, show_size: bool = True, 
+                 max_depth: int = None, exclude_patterns: List[str] = None,
+                 use_default_excludes: bool = True, custom_excludes: List[str] = None,
+                 jobs: int = 1, scan_cache: Optional[ScanCache] = None,
+                 dir_sizes: bool = False, top_dirs: int = 0):
+        """
+        Initialise l'explorateur.
+        
+        Args:
+            show_hidden: Afficher les fichiers/dossiers cachés
+            show_size: Afficher les tailles des fichiers
+            max_depth: Profondeur maximale d'exploration
+            exclude_patterns: Patterns à exclure (remplace les défauts si fourni)
+            use_default_excludes: Utiliser les exclusions par défaut
+            custom_excludes: Patterns d'exclusion supplémentaires
+            jobs: Nombre de threads de lecture (1 = parcours séquentiel)
+            scan_cache: Cache disque des listings (None = toujours relire)
+            dir_sizes: Annoter chaque dossier avec la taille et le nombre de fichiers de son sous-arbre
+            top_dirs: Nombre de plus gros dossiers à lister dans les statistiques (0 = aucun)
+        """
+        self.show_hidden = show_hidden
+        self.show_size = show_size
+        self.max_depth = max_depth
+        self.jobs = max(1, jobs or 1)
+        self.scan_cache = scan_cache
+        self.dir_sizes = dir_sizes
+        self.top_dirs = max(0, top_dirs or 0)
+        # Tas (taille, chemin, DirTotals) des top_dirs plus gros dossiers
+        self.largest_dirs: List[tuple] = []
+        
+        # Lecture parallèle : listings anticipés par chemin (voir _schedule)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._prefetch: Dict[str, object] = {}
+        self._prefetch_lock = threading.Lock()
+        
+        # Gestion des patterns d'exclusion
+        if exclude_patterns is not None:
+            # Utilisation des patterns fournis uniquement
+            self.exclude_patterns = exclude_patterns
+        else:
+            # Combinaison des patterns par défaut et personnalisés
+            self.exclude_patterns = []
+            if use_default_excludes:
+                self.exclude_patterns.extend(self.DEFAULT_EXCLUDE_PATTERNS)
+            if custom_excludes:
+                self.exclude_patterns.extend(custom_excludes)
+        
+        # Patterns compilés (recréés à chaque exploration, voir _reset_stats)
+        self._matcher = ExcludeMatcher(self.exclude_patterns, self.show_hidden)
+        
+        # Statistiques
+        self.stats = {
+            'total_dirs': 0,
+            'total_files': 0,
+            'total_size': 0,
+            'largest_file': {'name': '', 'size': 0},
+            'file_types': {},
+            'empty_dirs': 0,
+            'excluded_items': 0,
+            'permission_errors': 0
+        }
+        
+        # Configuration du logging
+        logging.basicConfig(level=logging.WARNING)
+        self.logger = logging.getLogger(__name__)
+    
+    def _should_exclude(self, path: Union[str, Path]) -> bool:
+        """Vérifie si un chemin doit être exclu."""
+        path_str = str(path)
+        return self._matcher.matches(os.path.basename(path_str), path_str)
+    
+    def _format_size(self, size_bytes: int) -> str:
+        """Formate la taille en unités lisibles."""
+        if size_bytes == 0:
+            return "0 B"
+        
+        for unit in ['B', 'KB', 'MB', 'GB', 'TB', 'PB']:
+            if size_bytes < 1024.0:
+                return f"{size_bytes:.1f} {unit}"
+            size_bytes /= 1024.0
+        return f"{size_bytes:.1f} EB"
+    
+    def _get_file_icon(self, path: Path, is_dir: Optional[bool] = None) -> str:
+        """Retourne une icône basée sur le type de fichier."""
+        if is_dir is None:
+            is_dir = path.is_dir()
+        return self._icon_for(path.name, is_dir)
+    
+    def _icon_for(self, name: str, is_dir: bool) -> str:
+        """Icône à partir du nom et du type déjà connus (aucun appel système)."""
+        if is_dir:
+            # Icônes spéciales pour certains dossiers
+            special_dirs = {
+                '.git': '🔧', '.vscode': '💙', '.idea': '🧠',
+                'node_modules': '📦', 'venv': '🐍', 'env': '🐍',
+                'build': '🔨', 'dist': '📦', 'src': '📝',
+                'test': '🧪', 'tests': '🧪', 'docs': '📚'
+            }
+            return special_dirs.get(name.lower(), "📁")
+        
+        suffix = os.path.splitext(name)[1].lower()
+        icons = {
+            '.txt': '📄', '.md': '📝', '.pdf': '📕', '.doc': '📘', '.docx': '📘',
+            '.xls': '📊', '.xlsx': '📊', '.csv': '📋', '.json': '🔧', '.xml': '🔧',
+            '.yml': '⚙️', '.yaml': '⚙️', '.toml': '⚙️', '.ini': '⚙️', '.cfg': '⚙️',
+            '.py': '🐍', '.js': '⚡', '.ts': '💎', '.html': '🌐', '.css': '🎨', '.scss': '🎨',
+            '.php': '🐘', '.java': '☕', '.cpp': '⚙️', '.c': '⚙️', '.cs': '💙', '.go': '🐹',
+            '.rs': '🦀', '.rb': '💎', '.swift': '🍎', '.kt': '🟧', '.dart': '🎯',
+            '.jpg': '🖼️', '.jpeg': '🖼️', '.png': '🖼️', '.gif': '🎬', '.svg': '🎭', '.ico': '🖼️',
+            '.mp4': '🎥', '.avi': '🎥', '.mkv': '🎥', '.mov': '🎥', '.webm': '🎥',
+            '.mp3': '🎵', '.wav': '🎵', '.flac': '🎵', '.ogg': '🎵', '.m4a': '🎵',
+            '.zip': '📦', '.rar': '📦', '.7z': '📦', '.tar': '📦', '.gz': '📦',
+            '.exe': '⚙️', '.msi': '📦', '.deb': '📦', '.rpm': '📦', '.dmg': '💽',
+            '.iso': '💽', '.img': '💽', '.vdi': '💽', '.vmdk': '💽',
+            '.sql': '🗃️', '.db': '🗃️', '.sqlite': '🗃️', '.sqlite3': '🗃️',
+            '.log': '📋', '.env': '🔐', '.gitignore': '🚫', '.dockerignore': '🚫',
+            '.dockerfile': '🐳', '.docker-compose.yml': '🐳', '.docker-compose.yaml': '🐳',
+            '.makefile': '🔨', '.cmake': '🔨', '.gradle': '🐘', '.maven': '☕',
+        }
+        return icons.get(suffix, '📄')
+    
+    def copy_to_clipboard(self, text: str) -> bool:
+        """Copie le texte dans le presse-papiers."""
+        try:
+            # Tentative avec pyperclip (nécessite installation)
+            try:
+                import pyperclip
+                pyperclip.copy(text)
+                return True
+            except ImportError:
+                pass
+            
+            # Alternatives système
+            if shutil.which('pbcopy'):  # macOS
+                import subprocess
+                subprocess.run(['pbcopy'], input=text.encode(), check=True)
+                return True
+            elif shutil.which('xclip'):  # Linux avec xclip
+                import subprocess
+                subprocess.run(['xclip', '-selection', 'clipboard'], 
+                             input=text.encode(), check=True)
+                return True
+            elif shutil.which('wl-copy'):  # Linux avec Wayland
+                import subprocess
+                subprocess.run(['wl-copy'], input=text.encode(), check=True)
+                return True
+            elif sys.platform == 'win32':  # Windows
+                import subprocess
+                subprocess.run(['clip'], input=text.encode(), shell=True, check=True)
+                return True
+                
+        except Exception as e:
+            self.logger.warning(f"Échec de la copie dans le presse-papiers: {e}")
+        
+        return False
+    
+    @property
+    def _needs_subtree_totals(self) -> bool:
+        """Les dossiers hors profondeur doivent-ils être parcourus pour leurs totaux ?"""
+        return self.dir_sizes or self.top_dirs > 0
+    
+    def _subtree_totals(self, directory: str, depth: Optional[int] = None):
+        """
+        Totaux d'un dossier non affiché (au-delà de max_depth), sans
+        toucher aux statistiques de l'arborescence.
+        
+        Returns:
+            (DirTotals, dossier vide ?)
+        """
+        totals = DirTotals()
+        empty = None
+        pending = [(directory, depth)]
+        while pending:
+            path, path_depth = pending.pop()
+            nodes, error = self._scan_dir(path, count_stats=False, depth=path_depth)
+            if empty is None:
+                empty = error is None and not nodes
+            child_depth = path_depth + 1 if path_depth is not None else None
+            for node in nodes:
+                if node.is_dir:
+                    totals.dirs += 1
+                    pending.append((node.path, child_depth))
+                else:
+                    totals.add_file(node)
+        return totals, empty
+    
+    def _note_dir(self, path: str, totals: DirTotals):
+        """Retient le dossier s'il fait partie des top_dirs plus gros."""
+        if not self.top_dirs:
+            return
+        item = (totals.size, path, totals)
+        if len(self.largest_dirs) < self.top_dirs:
+            heapq.heappush(self.largest_dirs, item)
+        elif item[:2] > self.largest_dirs[0][:2]:
+            heapq.heapreplace(self.largest_dirs, item)
+    
+    def _list_dir(self, directory: str) -> DirListing:
+        """
+        Lit un dossier, depuis le cache disque si son mtime n'a pas changé.
+        
+        Ne modifie pas les statistiques : peut s'exécuter dans un thread de lecture.
+        """
+        cache = self.scan_cache
+        if cache is None:
+            return self._read_dir(directory)
+        
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return self._read_dir(directory)
+        
+        listing = cache.get(directory, mtime_ns)
+        if listing is None:
+            read_at_ns = time.time_ns()
+            listing = self._read_dir(directory)
+            cache.put(directory, mtime_ns, listing, read_at_ns)
+        return listing
+    
+    def list_directory(self, directory: Union[str, Path]) -> DirListing:
+        """
+        Lit un seul niveau d'un dossier (entrées triées, exclusions appliquées).
+
+        Point d'entrée de la navigation paresseuse (API /api/files du backend) :
+        aucun sous-dossier n'est parcouru et les statistiques ne sont pas modifiées.
+        """
+        return self._list_dir(os.fspath(directory))
+
+    def _read_dir(self, directory: str) -> DirListing:
+        """
+        Lit un dossier en un seul passage os.scandir.
+        
+        Le type de chaque entrée vient du cache de DirEntry (pas de stat),
+        et seuls les fichiers sont stat()és, une seule fois. Ne modifie pas
+        les statistiques : peut s'exécuter dans un thread de lecture.
+        """
+        nodes = []
+        excluded = 0
+        stat_errors = 0
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if self._matcher.matches(entry.name, entry.path):
+                        excluded += 1
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    size = None
+                    if not is_dir:
+                        try:
+                            size = entry.stat().st_size
+                        except OSError:
+                            stat_errors += 1
+                    nodes.append(TreeNode(entry.name, entry.path, is_dir, size))
+        except OSError as e:
+            return DirListing([], e, excluded, stat_errors)
+        
+        # Tri : dossiers d'abord, puis fichiers, alphabétique
+        nodes.sort(key=lambda n: (not n.is_dir, n.name.lower()))
+        return DirListing(nodes, None, excluded, stat_errors)
+    
+    def _has_visible_entries(self, directory: str) -> bool:
+        """Vérifie qu'un dossier contient au moins une entrée non exclue."""
+        if self.scan_cache is not None:
+            try:
+                listing = self.scan_cache.get(directory, os.stat(directory).st_mtime_ns)
+            except OSError:
+                listing = None
+            if listing is not None:
+                return bool(listing.nodes)
+        try:
+            with os.scandir(directory) as entries:
+                return any(not self._matcher.matches(e.name, e.path) for e in entries)
+        except OSError:
+            return True
+    
+    def _schedule(self, directory: str, depth: Optional[int]):
+        """
+        Lance en arrière-plan la lecture d'un dossier (mode --jobs > 1).
+        
+        Les threads partagent une même file : chaque lecture terminée planifie
+        celles de ses sous-dossiers, et un thread libre prend la suivante.
+        Les dossiers au-delà de max_depth ne sont que sondés (vide ou non),
+        sauf si leurs totaux sont demandés (--dir-sizes, --top).
+        Le nombre de lectures en avance est borné pour limiter la mémoire ;
+        au-delà, le dossier sera lu au moment où le rendu l'atteint.
+        """
+        peek = (depth is not None and self.max_depth is not None and depth >= self.max_depth
+                and not self._needs_subtree_totals)
+        with self._prefetch_lock:
+            if self._executor is None:
+                return
+            if directory in self._prefetch or len(self._prefetch) >= self.jobs * 256:
+                return
+            if peek:
+                future = self._executor.submit(self._has_visible_entries, directory)
+            else:
+                future = self._executor.submit(self._list_job, directory, depth)
+            self._prefetch[directory] = future
+    
+    def _list_job(self, directory: str, depth: Optional[int]) -> DirListing:
+        listing = self._list_dir(directory)
+        child_depth = depth + 1 if depth is not None else None
+        for node in listing.nodes:
+            if node.is_dir:
+                self._schedule(node.path, child_depth)
+        return listing
+    
+    def _take_prefetched(self, directory: str):
+        with self._prefetch_lock:
+            future = self._prefetch.pop(directory, None)
+        return future.result() if future is not None else None
+    
+    def _start_walker(self):
+        """Démarre les threads de lecture si --jobs > 1."""
+        if self.jobs > 1 and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.jobs,
+                                                thread_name_prefix="tree-walker")
+    
+    def _shutdown_walker(self):
+        """Arrête les threads de lecture et abandonne les lectures anticipées."""
+        with self._prefetch_lock:
+            executor, self._executor = self._executor, None
+            for future in self._prefetch.values():
+                future.cancel()
+            self._prefetch.clear()
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def _scan_dir(self, directory: str, count_stats: bool = True, depth: Optional[int] = None):
+        """
+        Liste un dossier (lecture anticipée si disponible) et met à jour
+        les statistiques des entrées retenues, dans l'ordre du parcours.
+        
+        Args:
+            directory: Dossier à lire
+            count_stats: Mettre à jour les statistiques
+            depth: Profondeur du dossier (None = pas de limite pour ses enfants)
+            
+        Returns:
+            (entrées triées, erreur ou None)
+        """
+        listing = self._take_prefetched(directory)
+        if listing is None:
+            listing = self._list_dir(directory)
+        
+        # Planifie les sous-dossiers qui n'ont pas encore été lancés
+        child_depth = depth + 1 if depth is not None else None
+        for node in listing.nodes:
+            if node.is_dir:
+                self._schedule(node.path, child_depth)
+        
+        if count_stats:
+            self.stats['excluded_items'] += listing.excluded
+            self.stats['permission_errors'] += listing.stat_errors
+            for node in listing.nodes:
+                self._record_stats(node)
+        return listing.nodes, listing.error
+    
+    def _is_empty_dir(self, directory: str) -> bool:
+        """Vrai si un dossier non exploré ne contient aucune entrée visible."""
+        visible = self._take_prefetched(directory)
+        if visible is None:
+            visible = self._has_visible_entries(directory)
+        return not visible
+    
+    def _record_stats(self, node: TreeNode):
+        """Met à jour les statistiques pour une entrée déjà lue."""
+        if node.is_dir:
+            self.stats['total_dirs'] += 1
+            return
+        
+        self.stats['total_files'] += 1
+        if node.size is None:
+            return
+        
+        self.stats['total_size'] += node.size
+        
+        # Fichier le plus volumineux
+        if node.size > self.stats['largest_file']['size']:
+            self.stats['largest_file'] = {
+                'name': node.path,
+                'size': node.size
+            }
+        
+        # Types de fichiers
+        ext = os.path.splitext(node.name)[1].lower() or 'no_extension'
+        self.stats['file_types'][ext] = self.stats['file_types'].get(ext, 0) + 1
+    
+    def generate_tree(self, directory: Union[str, Path], prefix: str = "", 
+                     current_depth: int = 0) -> List[str]:
+        """
+        Génère l'arborescence d'un dossier.
+        
+        Args:
+            directory: Chemin du dossier à explorer
+            prefix: Préfixe pour l'indentation
+            current_depth: Profondeur actuelle
+            
+        Returns:
+            Liste des lignes de l'arborescence
+        """
+        return list(self.iter_tree(directory, prefix, current_depth))
+    
+    def iter_tree(self, directory: Union[str, Path], prefix: str = "",
+                  current_depth: int = 0) -> Iterator[str]:
+        """
+        Produit les lignes de l'arborescence au fil du parcours.
+        
+        Chaque ligne est disponible dès que son dossier est lu : la mémoire
+        utilisée dépend de la profondeur, pas de la taille de l'arbre. Les
+        statistiques sont complètes une fois le générateur épuisé.
+        """
+        directory = Path(directory)
+        
+        if not directory.exists():
+            yield f"❌ Dossier inexistant: {directory}"
+            return
+        
+        if not directory.is_dir():
+            yield f"❌ Pas un dossier: {directory}"
+            return
+        
+        renderer = TreeLineRenderer(self, prefix)
+        for event in self.walk_tree(directory, current_depth):
+            yield from renderer.feed(event)
+    
+    def walk_tree(self, directory: Union[str, Path], current_depth: int = 0) -> Iterator[TreeEvent]:
+        """
+        Parcourt l'arborescence une seule fois et produit ses événements.
+        
+        La racine est encadrée par 'enter'/'leave', comme chaque sous-dossier
+        exploré ; un dossier au-delà de max_depth donne 'cut', un fichier
+        'file' et un dossier illisible 'error'. Les statistiques sont mises
+        à jour pendant le parcours : tous les formats de sortie rendus depuis
+        ces événements partagent donc un seul passage sur le disque.
+        """
+        # Vérification de la profondeur maximale
+        if self.max_depth is not None and current_depth >= self.max_depth:
+            return
+        
+        directory = str(directory)
+        root = TreeNode(Path(directory).name, directory, True)
+        if self.scan_cache is not None:
+            self.scan_cache.open(directory, self._cache_signature())
+        self._start_walker()
+        completed = False
+        try:
+            yield TreeEvent('enter', root, True, None)
+            totals = yield from self._walk_dir(directory, current_depth, is_root=True)
+            self._note_dir(directory, totals)
+            yield TreeEvent('leave', root, True, None, totals)
+            completed = True
+        finally:
+            self._shutdown_walker()
+            # Parcours interrompu ou limité : pas de purge des dossiers non revus
+            if self.scan_cache is not None:
+                self.scan_cache.save(complete=completed and self.max_depth is None)
+    
+    def _cache_signature(self) -> tuple:
+        """Configuration dont dépend le contenu des listings en cache."""
+        return (tuple(self.exclude_patterns), self.show_hidden)
+    
+    def _walk_dir(self, directory: str, current_depth: int,
+                  is_root: bool = False) -> Generator[TreeEvent, None, DirTotals]:
+        """
+        Produit les événements d'un dossier et de ses sous-dossiers.
+        
+        Retourne les totaux du dossier, agrégés de bas en haut à partir de
+        ceux des sous-dossiers : aucune relecture pour calculer les tailles.
+        Sans --dir-sizes ni --top, les totaux restent vides (pas de surcoût).
+        """
+        totals = DirTotals()
+        aggregate = self._needs_subtree_totals
+        nodes, error = self._scan_dir(directory, depth=current_depth)
+        if error is not None:
+            self.logger.error(f"Erreur lecture dossier {directory}: {error}")
+            self.stats['permission_errors'] += 1
+            yield TreeEvent('error', None, True, error)
+            return totals
+        
+        if not nodes and not is_root:
+            self.stats['empty_dirs'] += 1
+        
+        last = len(nodes) - 1
+        for i, node in enumerate(nodes):
+            is_last = i == last
+            
+            if not node.is_dir:
+                if aggregate:
+                    totals.add_file(node)
+                yield TreeEvent('file', node, is_last, None)
+            elif self.max_depth is not None and current_depth + 1 >= self.max_depth:
+                if aggregate:
+                    # Non affiché mais parcouru pour ses totaux
+                    child, empty = self._subtree_totals(node.path, current_depth + 1)
+                    totals.add_subtree(child)
+                    self._note_dir(node.path, child)
+                else:
+                    # Non exploré : on vérifie seulement s'il est vide
+                    child, empty = None, self._is_empty_dir(node.path)
+                if empty:
+                    self.stats['empty_dirs'] += 1
+                yield TreeEvent('cut', node, is_last, None, child)
+            else:
+                # Récursion pour les sous-dossiers
+                yield TreeEvent('enter', node, is_last, None)
+                child = yield from self._walk_dir(node.path, current_depth + 1)
+                if aggregate:
+                    totals.add_subtree(child)
+                    self._note_dir(node.path, child)
+                yield TreeEvent('leave', node, is_last, None, child)
+        return totals
+    
+    def print_tree(self, directory: Union[str, Path], copy_to_clipboard: bool = False):
+        """Affiche l'arborescence d'un dossier au fur et à mesure du parcours."""
+        directory = Path(directory).resolve()
+        
+        header = f"📂 Arborescence de: {directory}"
+        separator = "=" * 80
+        
+        print(header)
+        print(separator)
+        
+        # Réinitialisation des statistiques
+        self._reset_stats()
+        
+        # Le contenu complet n'est conservé que pour le presse-papiers
+        content_lines = [header, separator, ""] if copy_to_clipboard else None
+        
+        # Affichage en continu : chaque ligne est écrite dès qu'elle est produite
+        write = sys.stdout.write
+        for line in self.iter_tree(directory):
+            write(line + "\n")
+            if content_lines is not None:
+                content_lines.append(line)
+        
+        # Affichage des statistiques
+        stats_lines = self._get_statistics_lines()
+        self._print_statistics()
+        
+        # Copie dans le presse-papiers si demandée
+        if copy_to_clipboard:
+            content_lines.extend([""] + stats_lines)
+            full_content = "\n".join(content_lines + [""] + stats_lines)
+            if self.copy_to_clipboard(full_content):
+                print(f"\n✅ Arborescence copiée dans le presse-papiers!")
+            else:
+                print(f"\n⚠️ Impossible de copier dans le presse-papiers")
+                print("💡 Installez 'pip install pyperclip' pour activer cette fonctionnalité")
+    
+    def _reset_stats(self):
+        """Réinitialise les statistiques."""
+        self._shutdown_walker()
+        self.stats = {
+            'total_dirs': 0,
+            'total_files': 0,
+            'total_size': 0,
+            'largest_file': {'name': '', 'size': 0},
+            'file_types': {},
+            'empty_dirs': 0,
+            'excluded_items': 0,
+            'permission_errors': 0
+        }
+        self.largest_dirs = []
+        self._matcher = ExcludeMatcher(self.exclude_patterns, self.show_hidden)
+    
+    def _get_statistics_lines(self) -> List[str]:
+        """Retourne les lignes de statistiques."""
+        lines = [
+            "=" * 80,
+            "📊 STATISTIQUES",
+            "=" * 80,
+            f"📁 Dossiers: {self.stats['total_dirs']}",
+            f"📄 Fichiers: {self.stats['total_files']}",
+            f"💾 Taille totale: {self._format_size(self.stats['total_size'])}"
+        ]
+        
+        if self.stats['empty_dirs'] > 0:
+            lines.append(f"📂 Dossiers vides: {self.stats['empty_dirs']}")
+        
+        if self.stats['excluded_items'] > 0:
+            lines.append(f"🚫 Éléments exclus: {self.stats['excluded_items']}")
+        
+        if self.stats['permission_errors'] > 0:
+            lines.append(f"⚠️ Erreurs d'accès: {self.stats['permission_errors']}")
+        
+        if self.scan_cache is not None:
+            lines.append(f"♻️ Cache: {self.scan_cache.hits} dossiers réutilisés, "
+                        f"{self.scan_cache.misses} relus")
+        
+        if self.stats['largest_file']['name']:
+            lines.append(f"🗃️ Plus gros fichier: {Path(self.stats['largest_file']['name']).name} "
+                        f"({self._format_size(self.stats['largest_file']['size'])})")
+        
+        # Plus gros sous-arbres, façon du
+        if self.largest_dirs:
+            lines.append(f"\n📦 Plus gros dossiers:")
+            for size, path, totals in sorted(self.largest_dirs, key=lambda x: (-x[0], x[1])):
+                line = f"   {self._format_size(size):>10}  {path} ({totals.files} fichiers"
+                if totals.largest_path:
+                    line += f", plus gros: {os.path.basename(totals.largest_path)}"
+                lines.append(line + ")")
+        
+        # Top 10 des types de fichiers
+        if self.stats['file_types']:
+            lines.append(f"\n📈 Types de fichiers les plus fréquents:")
+            sorted_types = sorted(
+                self.stats['file_types'].items(),
+                key=lambda x: (-x[1], x[0])
+            )
+            for ext, count in sorted_types[:10]:
+                ext_display = ext if ext != 'no_extension' else '(sans extension)'
+                lines.append(f"   {ext_display}: {count}")
+        
+        return lines
+    
+    def _print_statistics(self):
+        """Affiche les statistiques de l'exploration."""
+        for line in self._get_statistics_lines():
+            print(line)
+    
+    def show_excluded_patterns(self):
+        """Affiche les patterns d'exclusion actuels."""
+        print("🚫 Patterns d'exclusion actifs:")
+        print("=" * 40)
+        for i, pattern in enumerate(self.exclude_patterns, 1):
+            print(f"{i:2}. {pattern}")
+        print(f"\nTotal: {len(self.exclude_patterns)} patterns")
+    
+    def save_to_file(self, directory: Union[str, Path], output_file: str, 
+                    format_type: str = "txt"):
+        """
+        Sauvegarde l'arborescence dans un ou plusieurs fichiers.
+        
+        Args:
+            directory: Dossier à explorer
+            output_file: Fichier de sortie (avec plusieurs formats, son
+                extension est remplacée par celle de chaque format)
+            format_type: Format(s) séparés par des virgules (txt, json, html)
+        """
+        directory = Path(directory).resolve()
+        formats = self.parse_formats(format_type)
+        self._reset_stats()
+        self._export(directory, self._output_paths(output_file, formats))
+    
+    @classmethod
+    def parse_formats(cls, format_type: str) -> List[str]:
+        """Découpe 'txt,json,html' en liste de formats (sans doublons)."""
+        formats = []
+        for fmt in format_type.lower().split(','):
+            fmt = fmt.strip()
+            if not fmt or fmt in formats:
+                continue
+            if fmt not in cls.EXPORT_FORMATS:
+                raise ValueError(f"Format inconnu: {fmt} (choix: {', '.join(cls.EXPORT_FORMATS)})")
+            formats.append(fmt)
+        return formats or ['txt']
+    
+    def _output_paths(self, output_file: str, formats: List[str]) -> Dict[str, str]:
+        """Associe un fichier de sortie à chaque format."""
+        if len(formats) == 1:
+            return {formats[0]: output_file}
+        base, ext = os.path.splitext(output_file)
+        if ext.lower().lstrip('.') not in self.EXPORT_FORMATS:
+            base = output_file
+        return {fmt: f"{base}.{fmt}" for fmt in formats}
+    
+    def _export(self, directory: Path, outputs: Dict[str, str],
+                events: Optional[Iterator[TreeEvent]] = None):
+        """
+        Rend tous les formats demandés à partir d'un seul parcours
+        (ou d'événements déjà disponibles, cf. TreeWatcher).
+        """
+        exporters = []
+        try:
+            for fmt, output_file in outputs.items():
+                exporters.append(self.EXPORTERS[fmt](self, directory, output_file))
+            for event in events if events is not None else self.walk_tree(directory):
+                for exporter in exporters:
+                    exporter.feed(event)
+            for exporter in exporters:
+                exporter.finish()
+        finally:
+            for exporter in exporters:
+                exporter.close()
+        
+        for exporter in exporters:
+            print(f"✅ {exporter.LABEL} sauvegardée: {exporter.output_file}")
+    
+    def _html_head(self, directory: Path) -> str:
+        """Début de la page HTML, jusqu'à l'ouverture du bloc de l'arborescence."""
+        return f"""
+<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Arborescence - {directory.name}</title>
+    <style>
+        body {{ 
+            font-family: 'Courier New', monospace; 
+            margin: 20px; 
+            background: #1e1e1e; 
+            color: #d4d4d4;
+            line-height: 1.4;
+        }}
+        .header {{ 
+            color: #569cd6; 
+            border-bottom: 2px solid #569cd6; 
+            padding-bottom: 10px; 
+            margin-bottom: 20px;
+        }}
+        .tree {{ 
+            white-space: pre-wrap; 
+            background: #2d2d30;
+            padding: 15px;
+            border-radius: 5px;
+            overflow-x: auto;
+        }}
+        .stats {{ 
+            background: #2d2d30; 
+            padding: 15px; 
+            border-radius: 5px; 
+            margin-top: 20px; 
+        }}
+        .stats h3 {{ 
+            color: #569cd6; 
+            margin-top: 0;
+        }}
+        .copy-btn {{
+            background: #0e639c;
+            color: white;
+            border: none;
+            padding: 8px 16px;
+            border-radius: 4px;
+            cursor: pointer;
+            font-family: inherit;
+        }}
+        .copy-btn:hover {{
+            background: #1177bb;
+        }}
+    </style>
+    <script>
+        function copyToClipboard() {{
+            const treeContent = document.querySelector('.tree').textContent;
+            const statsContent = document.querySelector('.stats').textContent;
+            const fullContent = treeContent + '\\n\\n' + statsContent;
+            
+            navigator.clipboard.writeText(fullContent).then(() => {{
+                const btn = document.querySelector('.copy-btn');
+                const originalText = btn.textContent;
+                btn.textContent = '✅ Copié!';
+                setTimeout(() => {{
+                    btn.textContent = originalText;
+                }}, 2000);
+            }}).catch(err => {{
+                console.error('Erreur lors de la copie:', err);
+            }});
+        }}
+    </script>
+</head>
+<body>
+    <div class="header">
+        <h1>📂 Arborescence de {directory}</h1>
+        <p>Généré le: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}</p>
+        <button class="copy-btn" onclick="copyToClipboard()">📋 Copier l'arborescence</button>
+    </div>
+    
+    <div class="tree">"""
+    
+    def _html_tail(self) -> str:
+        """Fin de la page HTML : fermeture de l'arborescence et statistiques."""
+        # Préparées hors de la f-string : pas de "\\" dans ses expressions avant Python 3.12
+        stats_lines = self._get_statistics_lines()
+        stats_html = "".join(f"        <p>{line}</p>\n" for line in stats_lines[3:] if not line.startswith("="))
+        return f"""</div>
+    
+    <div class="stats">
+        <h3>📊 Statistiques</h3>
+{stats_html}
+    </div>
+</body>
+</html>
+"""
+
+
+class TreeExporter(abc.ABC):
+    """Écrit un format d'export à partir des événements de walk_tree."""
+    
+    LABEL = "Arborescence"
+    
+    def __init__(self, explorer: DirectoryTreeExplorer, directory: Path, output_file: str):
+        self.explorer = explorer
+        self.directory = directory
+        self.output_file = output_file
+        self.file = open(output_file, 'w', encoding='utf-8',
+                         buffering=explorer.WRITE_BUFFER_SIZE)
+    
+    @abc.abstractmethod
+    def feed(self, event: TreeEvent):
+        """Écrit la partie du fichier correspondant à un événement du parcours."""
+    
+    def finish(self):
+        """Écrit la fin du fichier (statistiques complètes à ce stade)."""
+    
+    def close(self):
+        self.file.close()
+
+
+class TextTreeExporter(TreeExporter):
+    """Export texte : en-tête, lignes de l'arborescence, statistiques."""
+    
+    def __init__(self, explorer: DirectoryTreeExplorer, directory: Path, output_file: str):
+        super().__init__(explorer, directory, output_file)
+        self.renderer = TreeLineRenderer(explorer)
+        self.file.write(self.head())
+    
+    def head(self) -> str:
+        return (f"Arborescence de: {self.directory}\n"
+                f"Généré le: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n"
+                + "=" * 80 + "\n\n")
+    
+    def feed(self, event: TreeEvent):
+        for line in self.renderer.feed(event):
+            self.file.write(line + "\n")
+    
+    def finish(self):
+        self.file.write("\n")
+        for line in self.explorer._get_statistics_lines():
+            self.file.write(line + "\n")
+
+
+class HtmlTreeExporter(TextTreeExporter):
+    """Export HTML : mêmes lignes que le texte, dans une page avec statistiques."""
+    
+    LABEL = "Arborescence HTML"
+    
+    def head(self) -> str:
+        return self.explorer._html_head(self.directory)
+    
+    def finish(self):
+        self.file.write(self.explorer._html_tail())
+
+
+class JsonTreeExporter(TreeExporter):
+    """
+    Export JSON en flux.
+    
+    L'arbre est encodé au fil du parcours dans un fichier temporaire
+    (en mémoire tant qu'il reste petit), puis recopié après l'en-tête et
+    les statistiques, qui ne sont connues qu'en fin de parcours. Le
+    résultat est identique à json.dump(indent=2) sans construire de dict.
+    """
+    
+    LABEL = "Arborescence JSON"
+    SPOOL_SIZE = 8 * 1024 * 1024
+    
+    def __init__(self, explorer: DirectoryTreeExplorer, directory: Path, output_file: str):
+        super().__init__(explorer, directory, output_file)
+        self.generated_at = datetime.now().isoformat()
+        self.spool = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_SIZE, mode='w+',
+                                                   encoding='utf-8')
+        self.encoder = JsonTreeEncoder(self.spool, level=1, dir_sizes=explorer.dir_sizes)
+    
+    def feed(self, event: TreeEvent):
+        self.encoder.feed(event)
+    
+    def finish(self):
+        self.encoder.finish()
+        explorer = self.explorer
+        header = json.dumps({
+            "root_directory": str(self.directory),
+            "generated_at": self.generated_at,
+            "configuration": {
+                "show_hidden": explorer.show_hidden,
+                "show_size": explorer.show_size,
+                "max_depth": explorer.max_depth,
+                "exclude_patterns": explorer.exclude_patterns
+            },
+            "statistics": explorer.stats
+        }, indent=2, ensure_ascii=False)
+        
+        # '{ ... \n}' : on rouvre l'objet pour y ajouter la clé "tree"
+        self.file.write(header[:-2] + ',\n  "tree": ')
+        self.spool.seek(0)
+        shutil.copyfileobj(self.spool, self.file)
+        self.file.write("\n}")
+    
+    def close(self):
+        self.spool.close()
+        super().close()
+
+
+DirectoryTreeExplorer.EXPORTERS = {
+    'txt': TextTreeExporter,
+    'json': JsonTreeExporter,
+    'html': HtmlTreeExporter,
+}
+
+
+class Inotify:
+    """Accès minimal à inotify(7) par ctypes (Linux uniquement, sans dépendance)."""
+    
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    
+    # Changements du contenu d'un dossier ou de la taille de ses fichiers
+    DIR_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    
+    _EVENT = struct.Struct('iIII')
+    
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify n'est disponible que sous Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+    
+    def add_watch(self, path: str, mask: int = DIR_MASK) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+    
+    def rm_watch(self, wd: int):
+        # Échec ignoré : le noyau a déjà retiré la surveillance d'un dossier supprimé
+        self._rm_watch(self.fd, wd)
+    
+    def read_events(self, timeout: Optional[float] = None) -> List[tuple]:
+        """Événements (wd, mask, nom) disponibles, en attendant au plus `timeout` secondes."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+    
+    def close(self):
+        os.close(self.fd)
+
+
+class WatchedDir:
+    """Listing d'un dossier de l'arborescence suivie par TreeWatcher."""
+    
+    __slots__ = ('path', 'depth', 'nodes', 'error', 'excluded', 'stat_errors', 'cut', 'wd')
+    
+    def __init__(self, path: str, depth: int, listing: DirListing):
+        self.path = path
+        self.depth = depth
+        self.nodes = listing.nodes
+        self.error = listing.error
+        self.excluded = listing.excluded
+        self.stat_errors = listing.stat_errors
+        # Sous-dossiers non explorés (hors profondeur) : nom -> (DirTotals ou None, vide ?)
+        self.cut: Dict[str, tuple] = {}
+        self.wd: Optional[int] = None
+
+
+class TreeWatcher:
+    """
+    Mode --watch : un parcours initial, puis mises à jour incrémentales.
+    
+    L'arborescence affichée est gardée en mémoire (un WatchedDir par dossier)
+    et chaque dossier est surveillé par inotify. Un événement ne fait relire
+    que le dossier concerné : ses contributions aux statistiques sont retirées
+    puis réappliquées, les sous-dossiers apparus sont parcourus et surveillés,
+    ceux qui ont disparu sont retirés, et seul le sous-arbre touché est
+    réaffiché. Les exports (--output) sont réécrits depuis le modèle, sans
+    relire le disque.
+    
+    Les événements sont regroupés : un lot est traité après DEBOUNCE secondes
+    sans nouvel événement, ou au plus tard après MAX_DELAY secondes.
+    """
+    
+    DEBOUNCE = 0.5
+    MAX_DELAY = 2.0
+    
+    def __init__(self, explorer: DirectoryTreeExplorer, directory: Union[str, Path],
+                 outputs: Optional[Dict[str, str]] = None):
+        self.explorer = explorer
+        self.root = str(Path(directory).resolve())
+        self.outputs = outputs
+        self.model: Dict[str, WatchedDir] = {}
+        self._wd_paths: Dict[int, str] = {}
+        self._largest_stale = False
+        self._watch_limit_reached = False
+        # Sous-dossiers apparus pendant le lot en cours (affichés en entier)
+        self._added: Set[str] = set()
+        self.inotify: Optional[Inotify] = None
+    
+    def run(self):
+        """Parcours initial puis boucle de surveillance (jusqu'à Ctrl+C)."""
+        self.inotify = Inotify()
+        try:
+            self._initial_scan()
+            self._loop()
+        finally:
+            self.inotify.close()
+    
+    # Modèle
+    
+    def _initial_scan(self):
+        explorer = self.explorer
+        explorer._reset_stats()
+        if explorer.max_depth is None or explorer.max_depth > 0:
+            self._scan(self.root, 0)
+        
+        print(f"📂 Arborescence de: {self.root}")
+        print("=" * 80)
+        for line in self._render(self.root, full=True):
+            print(line)
+        explorer._print_statistics()
+        self._write_outputs()
+        print(f"\n👀 Surveillance de {len(self._wd_paths)} dossiers (Ctrl+C pour arrêter)")
+    
+    def _children_cut(self, depth: int) -> bool:
+        max_depth = self.explorer.max_depth
+        return max_depth is not None and depth + 1 >= max_depth
+    
+    def _load(self, path: str, depth: int) -> WatchedDir:
+        """Lit un dossier (et le résumé de ses sous-dossiers hors profondeur)."""
+        explorer = self.explorer
+        entry = WatchedDir(path, depth, explorer._list_dir(path))
+        if self._children_cut(depth):
+            for node in entry.nodes:
+                if not node.is_dir:
+                    continue
+                if explorer._needs_subtree_totals:
+                    entry.cut[node.name] = explorer._subtree_totals(node.path)
+                else:
+                    entry.cut[node.name] = (None, not explorer._has_visible_entries(node.path))
+        return entry
+    
+    def _scan(self, path: str, depth: int):
+        """Ajoute au modèle un dossier et ses sous-dossiers, et les surveille."""
+        pending = [(path, depth)]
+        while pending:
+            path, depth = pending.pop()
+            entry = self._load(path, depth)
+            # Même dossier déjà suivi sous un autre chemin (lien symbolique) : pas de boucle
+            descend = self._watch(entry)
+            self.model[path] = entry
+            self._account(entry, 1)
+            if descend and not self._children_cut(depth):
+                pending.extend((node.path, depth + 1) for node in entry.nodes if node.is_dir)
+    
+    def _watch(self, entry: WatchedDir) -> bool:
+        if self._watch_limit_reached or entry.error is not None:
+            return True
+        try:
+            wd = self.inotify.add_watch(entry.path)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                self._watch_limit_reached = True
+                self.explorer.logger.warning(
+                    "Limite inotify atteinte (fs.inotify.max_user_watches) : "
+                    "les dossiers suivants ne seront pas surveillés")
+            return True
+        if self._wd_paths.get(wd, entry.path) != entry.path:
+            return False
+        entry.wd = wd
+        self._wd_paths[wd] = entry.path
+        return True
+    
+    def _drop(self, path: str):
+        """Retire un dossier et ses descendants du modèle et des statistiques."""
+        pending = [path]
+        while pending:
+            entry = self.model.pop(pending.pop(), None)
+            if entry is None:
+                continue
+            self._account(entry, -1)
+            if entry.wd is not None and self._wd_paths.get(entry.wd) == entry.path:
+                del self._wd_paths[entry.wd]
+                self.inotify.rm_watch(entry.wd)
+            pending.extend(node.path for node in entry.nodes if node.is_dir)
+    
+    def _account(self, entry: WatchedDir, sign: int):
+        """Ajoute (sign=1) ou retire (sign=-1) la contribution d'un dossier aux statistiques."""
+        explorer = self.explorer
+        stats = explorer.stats
+        stats['excluded_items'] += sign * entry.excluded
+        stats['permission_errors'] += sign * (entry.stat_errors + (entry.error is not None))
+        if entry.error is None and not entry.nodes and entry.depth > 0:
+            stats['empty_dirs'] += sign
+        stats['empty_dirs'] += sign * sum(1 for _totals, empty in entry.cut.values() if empty)
+        
+        for node in entry.nodes:
+            if sign > 0:
+                explorer._record_stats(node)
+            else:
+                self._unrecord_stats(node)
+    
+    def _unrecord_stats(self, node: TreeNode):
+        """Inverse de DirectoryTreeExplorer._record_stats."""
+        stats = self.explorer.stats
+        if node.is_dir:
+            stats['total_dirs'] -= 1
+            return
+        
+        stats['total_files'] -= 1
+        if node.size is None:
+            return
+        
+        stats['total_size'] -= node.size
+        if node.path == stats['largest_file']['name']:
+            self._largest_stale = True
+        
+        ext = os.path.splitext(node.name)[1].lower() or 'no_extension'
+        count = stats['file_types'].get(ext, 0) - 1
+        if count > 0:
+            stats['file_types'][ext] = count
+        else:
+            stats['file_types'].pop(ext, None)
+    
+    def _refresh(self, path: str):
+        """Relit un dossier modifié et met à jour le modèle et les statistiques."""
+        old = self.model.get(path)
+        if old is None:
+            return
+        new = self._load(path, old.depth)
+        new.wd = old.wd
+        
+        self._account(old, -1)
+        self.model[path] = new
+        self._account(new, 1)
+        
+        if self._children_cut(old.depth):
+            return
+        old_dirs = {node.path for node in old.nodes if node.is_dir}
+        new_dirs = {node.path for node in new.nodes if node.is_dir}
+        for removed in old_dirs - new_dirs:
+            self._drop(removed)
+        for added in new_dirs - old_dirs:
+            self._scan(added, old.depth + 1)
+            self._added.add(added)
+    
+    def _recompute_largest(self):
+        largest = {'name': '', 'size': 0}
+        for entry in self.model.values():
+            for node in entry.nodes:
+                if not node.is_dir and node.size is not None and node.size > largest['size']:
+                    largest = {'name': node.path, 'size': node.size}
+        self.explorer.stats['largest_file'] = largest
+        self._largest_stale = False
+    
+    # Rendu
+    
+    def _events(self, path: str, expand: Optional[Set[str]] = None) -> Iterator[TreeEvent]:
+        """
+        Événements de parcours d'un sous-arbre du modèle (aucun accès disque).
+        
+        Si `expand` est fourni, seuls ces sous-dossiers (et leur contenu) sont
+        développés ; les autres sont rendus comme des dossiers non explorés.
+        """
+        root = TreeNode(os.path.basename(path) or path, path, True)
+        yield TreeEvent('enter', root, True, None)
+        totals = yield from self._entry_events(self.model[path], expand)
+        self.explorer._note_dir(path, totals)
+        yield TreeEvent('leave', root, True, None, totals)
+    
+    def _entry_events(self, entry: WatchedDir,
+                      expand: Optional[Set[str]] = None) -> Generator[TreeEvent, None, DirTotals]:
+        explorer = self.explorer
+        aggregate = explorer._needs_subtree_totals
+        totals = DirTotals()
+        if entry.error is not None:
+            yield TreeEvent('error', None, True, entry.error)
+            return totals
+        
+        last = len(entry.nodes) - 1
+        for i, node in enumerate(entry.nodes):
+            is_last = i == last
+            child_entry = self.model.get(node.path) if node.is_dir else None
+            if not node.is_dir:
+                if aggregate:
+                    totals.add_file(node)
+                yield TreeEvent('file', node, is_last, None)
+            elif child_entry is None:
+                child, _empty = entry.cut.get(node.name, (None, False))
+                if aggregate and child is not None:
+                    totals.add_subtree(child)
+                    explorer._note_dir(node.path, child)
+                yield TreeEvent('cut', node, is_last, None, child)
+            elif expand is not None and node.path not in expand:
+                # Inchangé : une ligne, sans son contenu
+                child = self._entry_totals(child_entry) if aggregate else None
+                if child is not None:
+                    totals.add_subtree(child)
+                yield TreeEvent('cut', node, is_last, None, child)
+            else:
+                yield TreeEvent('enter', node, is_last, None)
+                child = yield from self._entry_events(child_entry)
+                if aggregate:
+                    totals.add_subtree(child)
+                    explorer._note_dir(node.path, child)
+                yield TreeEvent('leave', node, is_last, None, child)
+        return totals
+    
+    def _entry_totals(self, entry: WatchedDir) -> DirTotals:
+        """Totaux d'un sous-arbre du modèle, sans produire d'événements."""
+        events = self._entry_events(entry)
+        while True:
+            try:
+                next(events)
+            except StopIteration as stop:
+                return stop.value
+    
+    def _render(self, path: str, full: bool = False) -> Iterator[str]:
+        """Lignes d'un sous-arbre : complet, ou seulement le dossier et ses nouveaux sous-dossiers."""
+        if full:
+            self.explorer.largest_dirs = []
+        if path not in self.model:
+            return
+        renderer = TreeLineRenderer(self.explorer)
+        for event in self._events(path, None if full else self._added):
+            yield from renderer.feed(event)
+    
+    def _write_outputs(self):
+        if not self.outputs:
+            return
+        self.explorer.largest_dirs = []
+        events = self._events(self.root) if self.root in self.model else iter(())
+        self.explorer._export(Path(self.root), self.outputs, events)
+    
+    # Surveillance
+    
+    def _loop(self):
+        pending: Set[str] = set()
+        first_event = None
+        overflow = False
+        while True:
+            timeout = None
+            if pending or overflow:
+                timeout = max(0.0, min(self.DEBOUNCE, first_event + self.MAX_DELAY - time.monotonic()))
+            events = self.inotify.read_events(timeout)
+            
+            for wd, mask, _name in events:
+                if mask & Inotify.IN_Q_OVERFLOW:
+                    overflow = True
+                path = self._wd_paths.get(wd)
+                if path is None:
+                    continue
+                if mask & Inotify.IN_IGNORED:
+                    del self._wd_paths[wd]
+                elif mask & (Inotify.IN_DELETE_SELF | Inotify.IN_MOVE_SELF):
+                    # Disparition constatée par la relecture du dossier parent
+                    pending.add(os.path.dirname(path))
+                else:
+                    pending.add(path)
+            
+            if events and first_event is None:
+                first_event = time.monotonic()
+            if (pending or overflow) and (not events or time.monotonic() - first_event >= self.MAX_DELAY):
+                if overflow:
+                    # File d'événements du noyau débordée : on repart d'un parcours complet
+                    self._drop(self.root)
+                    self._scan(self.root, 0)
+                    self._apply({self.root}, refresh=False)
+                    overflow = False
+                else:
+                    self._apply(pending)
+                pending = set()
+                first_event = None
+    
+    def _apply(self, paths: Set[str], refresh: bool = True):
+        """Traite un lot de dossiers modifiés puis réaffiche les sous-arbres touchés."""
+        self._added = set()
+        # Parents d'abord : un dossier supprimé avec son parent n'est pas relu
+        for path in sorted(paths, key=lambda p: p.count(os.sep)) if refresh else ():
+            if path in self.model:
+                self._refresh(path)
+        if self._largest_stale:
+            self._recompute_largest()
+        
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f"Dossier surveillé supprimé: {self.root}")
+        
+        # Un dossier apparu est déjà affiché en entier avec son parent
+        changed = sorted(p for p in paths if p in self.model
+                         and not any(p == q or p.startswith(q + os.sep) for q in self._added))
+        for path in changed:
+            print(f"\n🔄 {datetime.now().strftime('%H:%M:%S')} {path}")
+            for line in self._render(path, full=not refresh):
+                print(line)
+        
+        stats = self.explorer.stats
+        print(f"📊 {stats['total_dirs']} dossiers, {stats['total_files']} fichiers, "
+              f"{self.explorer._format_size(stats['total_size'])}")
+        self._write_outputs()
+
+
+class DuplicateFinder:
+    """
+    Recherche des fichiers en double par filtrage en étapes.
+    
+    1. Taille : seuls des fichiers de même taille peuvent être identiques ;
+       les tailles viennent du parcours, sans accès supplémentaire.
+    2. Empreinte des bords : hash des EDGE_SIZE premiers et derniers octets.
+       Pour un fichier d'au plus 2 × EDGE_SIZE, c'est déjà le contenu complet.
+    3. Empreinte complète (lecture par mmap) des seuls candidats restants.
+    
+    Les liens physiques (même inode) ne comptent qu'une fois, puisqu'ils ne
+    libèrent rien. Les étapes 2 et 3 tournent dans un pool de threads :
+    hashlib libère le GIL sur les gros blocs et les lectures se recouvrent.
+    """
+    
+    EDGE_SIZE = 64 * 1024
+    READ_BLOCK = 1 << 20
+    
+    def __init__(self, explorer: DirectoryTreeExplorer, jobs: Optional[int] = None):
+        self.explorer = explorer
+        self.jobs = max(1, jobs or min(8, os.cpu_count() or 1))
+        self.errors = 0
+        # Fichiers examinés à chaque étape (affichés dans le rapport)
+        self.stage_files = {'size': 0, 'edges': 0, 'full': 0}
+    
+    def find(self, directory: Union[str, Path]) -> List[tuple]:
+        """
+        Returns:
+            Liste de (taille, [chemins]) triée par octets récupérables décroissants
+        """
+        self.errors = 0
+        by_size = self._group_by_size(directory)
+        
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="dup-hash") as pool:
+            groups = self._split_by_inode(pool, by_size)
+            self.stage_files['size'] = sum(len(paths) for _, paths in groups)
+            
+            groups = self._refine(pool, groups, self._edge_digest)
+            self.stage_files['edges'] = sum(len(paths) for _, paths in groups)
+            
+            # Les petits fichiers ont été lus en entier à l'étape précédente
+            done = [g for g in groups if g[0] <= 2 * self.EDGE_SIZE]
+            large = [g for g in groups if g[0] > 2 * self.EDGE_SIZE]
+            self.stage_files['full'] = sum(len(paths) for _, paths in large)
+            groups = done + self._refine(pool, large, self._full_digest)
+        
+        groups.sort(key=lambda g: (-g[0] * (len(g[1]) - 1), g[1][0]))
+        return groups
+    
+    def _group_by_size(self, directory: Union[str, Path]) -> Dict[int, Union[str, List[str]]]:
+        """Regroupe les fichiers non vides du parcours par taille."""
+        explorer = self.explorer
+        explorer._reset_stats()
+        # Un seul chemin par taille tant qu'elle est unique (cas le plus courant)
+        by_size: Dict[int, Union[str, List[str]]] = {}
+        for event in explorer.walk_tree(Path(directory).resolve()):
+            if event.kind != 'file' or not event.node.size:
+                continue
+            size = event.node.size
+            known = by_size.get(size)
+            if known is None:
+                by_size[size] = event.node.path
+            elif isinstance(known, str):
+                by_size[size] = [known, event.node.path]
+            else:
+                known.append(event.node.path)
+        return by_size
+    
+    def _split_by_inode(self, pool: ThreadPoolExecutor,
+                        by_size: Dict[int, Union[str, List[str]]]) -> List[tuple]:
+        """Garde les tailles partagées par au moins deux inodes distincts."""
+        candidates = [(size, path) for size, paths in by_size.items()
+                      if isinstance(paths, list) for path in paths]
+        groups: Dict[int, Dict[tuple, str]] = {}
+        for (size, path), inode in zip(candidates, pool.map(self._inode, candidates)):
+            if inode is None:
+                self.errors += 1
+            else:
+                groups.setdefault(size, {}).setdefault(inode, path)
+        return [(size, list(inodes.values())) for size, inodes in groups.items()
+                if len(inodes) > 1]
+    
+    @staticmethod
+    def _inode(item: tuple) -> Optional[tuple]:
+        try:
+            st = os.stat(item[1])
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+    
+    def _refine(self, pool: ThreadPoolExecutor, groups: List[tuple], digest) -> List[tuple]:
+        """Sépare chaque groupe selon l'empreinte de ses fichiers."""
+        items = [(size, path) for size, paths in groups for path in paths]
+        refined: Dict[tuple, List[str]] = {}
+        for (size, path), value in zip(items, pool.map(digest, items)):
+            if value is None:
+                self.errors += 1
+            else:
+                refined.setdefault((size, value), []).append(path)
+        return [(size, paths) for (size, _), paths in refined.items() if len(paths) > 1]
+    
+    def _edge_digest(self, item: tuple) -> Optional[bytes]:
+        size, path = item
+        edge = self.EDGE_SIZE
+        h = hashlib.blake2b(digest_size=20)
+        try:
+            with open(path, 'rb') as f:
+                if size <= 2 * edge:
+                    h.update(f.read())
+                else:
+                    h.update(f.read(edge))
+                    f.seek(size - edge)
+                    h.update(f.read(edge))
+        except OSError:
+            return None
+        return h.digest()
+    
+    def _full_digest(self, item: tuple) -> Optional[bytes]:
+        h = hashlib.blake2b(digest_size=20)
+        try:
+            with open(item[1], 'rb') as f:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mapped.madvise(mmap.MADV_SEQUENTIAL)
+                        h.update(mapped)
+                except (ValueError, OSError):
+                    # Fichier non projetable (pseudo-fichier, FS sans mmap)
+                    f.seek(0)
+                    for block in iter(lambda: f.read(self.READ_BLOCK), b''):
+                        h.update(block)
+        except OSError:
+            return None
+        return h.digest()
+    
+    def report_lines(self, directory: Union[str, Path], groups: List[tuple]) -> List[str]:
+        """Rapport texte : groupes de doublons et octets récupérables."""
+        fmt = self.explorer._format_size
+        reclaimable = sum(size * (len(paths) - 1) for size, paths in groups)
+        extra = sum(len(paths) - 1 for _, paths in groups)
+        lines = [
+            f"🔁 Doublons dans: {Path(directory).resolve()}",
+            "=" * 80,
+        ]
+        for size, paths in groups:
+            lines.append(f"▸ {fmt(size)} × {len(paths)} "
+                         f"({fmt(size * (len(paths) - 1))} récupérables)")
+            lines.extend(f"   {path}" for path in sorted(paths))
+        lines.extend([
+            "=" * 80,
+            f"📄 Fichiers examinés: {self.explorer.stats['total_files']} | "
+            f"même taille: {self.stage_files['size']} | "
+            f"mêmes bords: {self.stage_files['edges']} | "
+            f"hachés en entier: {self.stage_files['full']}",
+            f"🔁 Groupes de doublons: {len(groups)} ({extra} fichiers en trop)",
+            f"💾 Espace récupérable: {fmt(reclaimable)}",
+        ])
+        if self.errors:
+            lines.append(f"⚠️ Fichiers illisibles: {self.errors}")
+        return lines
+
+
+def benchmark_exclusions(explorer: DirectoryTreeExplorer, directory: Union[str, Path],
+                         sample_size: int = 20000, repeat: int = 3):
+    """
+    Micro-benchmark du coût d'exclusion par chemin.
+    
+    Compare l'ancienne boucle fnmatch (2 appels par pattern) au matcher
+    compilé, sans cache puis avec cache, sur des chemins réels du dossier.
+    """
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in dirs + files)
+        if len(paths) >= sample_size:
+            break
+    paths = paths[:sample_size]
+    if not paths:
+        print("Aucun chemin à mesurer")
+        return
+    
+    patterns = explorer.exclude_patterns
+    show_hidden = explorer.show_hidden
+    
+    def legacy():
+        for path in paths:
+            name = os.path.basename(path)
+            if not show_hidden and name.startswith('.'):
+                continue
+            for pattern in patterns:
+                if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern):
+                    break
+    
+    def compiled_cold():
+        matcher = ExcludeMatcher(patterns, show_hidden)
+        for path in paths:
+            matcher.matches(os.path.basename(path), path)
+    
+    warm_matcher = ExcludeMatcher(patterns, show_hidden)
+    
+    def compiled_warm():
+        for path in paths:
+            warm_matcher.matches(os.path.basename(path), path)
+    
+    compiled_warm()
+    print(f"⏱️ Coût d'exclusion par chemin ({len(paths)} chemins, {len(patterns)} patterns)")
+    for label, func in [("fnmatch (ancien)", legacy),
+                        ("compilé, cache vide", compiled_cold),
+                        ("compilé, cache chaud", compiled_warm)]:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"   {label:<22} {best / len(paths) * 1e9:10.0f} ns/chemin")
+
+
+def main():
+    """Fonction principale avec arguments en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Explorateur d'arborescence de dossiers amélioré",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemples d'utilisation:
+  python DirectoryTreeExplorer.py /home/user                    # Arborescence basique
+  python DirectoryTreeExplorer.py . --max-depth 3               # Profondeur limitée
+  python DirectoryTreeExplorer.py ~/Documents --hidden --size   # Avec fichiers cachés
+  python DirectoryTreeExplorer.py . --copy                      # Copie dans le presse-papiers
+  python DirectoryTreeExplorer.py . --no-default-excludes       # Sans exclusions par défaut
+  python DirectoryTreeExplorer.py . --add-exclude "*.bak,temp"  # Exclusions supplémentaires
+  python DirectoryTreeExplorer.py . --show-excludes             # Voir les patterns d'exclusion
+  python DirectoryTreeExplorer.py . --bench-excludes            # Coût d'exclusion par chemin
+  python DirectoryTreeExplorer.py . --output tree.txt           # Sauvegarde en fichier
+  python DirectoryTreeExplorer.py . --output tree.json --format json  # Export JSON
+  python DirectoryTreeExplorer.py . -o tree --format txt,json,html  # 3 formats, 1 parcours
+  python DirectoryTreeExplorer.py /mnt/nfs --jobs 16            # Lecture parallèle (FS réseau)
+  python DirectoryTreeExplorer.py /srv/data --cache             # Ne relit que les dossiers modifiés
+  python DirectoryTreeExplorer.py . -d 2 --dir-sizes --top 10   # Tailles des dossiers + top 10
+  python DirectoryTreeExplorer.py /srv/data --watch -o arbre.json -f json  # Suivi en continu
+  python DirectoryTreeExplorer.py /srv/partage --find-duplicates -j 8  # Fichiers en double
+        """
+    )
+    
+    parser.add_argument("directory", 
+                       nargs="?", 
+                       default=".", 
+                       help="Dossier à explorer (défaut: dossier courant)")
+    
+    parser.add_argument("--hidden", 
+                       action="store_true",
+                       help="Afficher les fichiers et dossiers cachés")
+    
+    parser.add_argument("--no-size", 
+                       action="store_true",
+                       help="Ne pas afficher les tailles des fichiers")
+    
+    parser.add_argument("--max-depth", "-d",
+                       type=int,
+                       help="Profondeur maximale d'exploration")
+    
+    parser.add_argument("--exclude", "-e",
+                       help="Patterns à exclure (remplace les défauts, séparés par des virgules)")
+    
+    parser.add_argument("--add-exclude", "-a",
+                       help="Patterns d'exclusion supplémentaires (séparés par des virgules)")
+    
+    parser.add_argument("--no-default-excludes",
+                       action="store_true",
+                       help="Ne pas utiliser les patterns d'exclusion par défaut")
+    
+    parser.add_argument("--show-excludes",
+                       action="store_true",
+                       help="Afficher les patterns d'exclusion actifs et quitter")
+    
+    parser.add_argument("--bench-excludes",
+                       action="store_true",
+                       help="Mesurer le coût d'exclusion par chemin et quitter")
+    
+    parser.add_argument("--copy", "-c",
+                       action="store_true",
+                       help="Copier l'arborescence dans le presse-papiers")
+    
+    parser.add_argument("--output", "-o",
+                       help="Fichier de sortie pour sauvegarder l'arborescence")
+    
+    parser.add_argument("--format", "-f",
+                       default="txt",
+                       help="Format(s) de sortie séparés par des virgules: txt, json, html (défaut: txt)")
+    
+    parser.add_argument("--jobs", "-j",
+                       type=int,
+                       default=1,
+                       help="Threads de lecture en parallèle (défaut: 1, séquentiel)")
+    
+    parser.add_argument("--dir-sizes",
+                       action="store_true",
+                       help="Afficher la taille et le nombre de fichiers de chaque dossier")
+    
+    parser.add_argument("--top",
+                       type=int,
+                       default=0,
+                       metavar="N",
+                       help="Lister les N plus gros dossiers (façon du) dans les statistiques")
+    
+    parser.add_argument("--watch", "-w",
+                       action="store_true",
+                       help="Surveiller le dossier (inotify) et afficher les changements au fil de l'eau")
+    
+    parser.add_argument("--find-duplicates",
+                       action="store_true",
+                       help="Rechercher les fichiers en double (taille, puis bords, puis contenu) "
+                            "et l'espace récupérable")
+    
+    parser.add_argument("--cache",
+                       action="store_true",
+                       help="Réutiliser les dossiers inchangés (mtime) d'une exploration précédente")
+    
+    parser.add_argument("--cache-file",
+                       help="Fichier du cache de parcours (implique --cache, "
+                            "défaut: ~/.cache/directory-tree-explorer/)")
+    
+    parser.add_argument("--verbose", "-v",
+                       action="store_true",
+                       help="Mode verbeux (affiche plus d'informations)")
+    
+    args = parser.parse_args()
+    
+    try:
+        DirectoryTreeExplorer.parse_formats(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    # Configuration du logging en mode verbeux
+    if args.verbose:
+        logging.getLogger().setLevel(logging.INFO)
+    
+    try:
+        # Traitement des exclusions
+        exclude_patterns = None
+        custom_excludes = None
+        use_default_excludes = not args.no_default_excludes
+        
+        if args.exclude:
+            # Patterns fournis remplacent les défauts
+            exclude_patterns = [pattern.strip() for pattern in args.exclude.split(",")]
+            use_default_excludes = False
+        
+        if args.add_exclude:
+            # Patterns supplémentaires à ajouter aux défauts
+            custom_excludes = [pattern.strip() for pattern in args.add_exclude.split(",")]
+        
+        # Création de l'explorateur
+        explorer = DirectoryTreeExplorer(
+            show_hidden=args.hidden,
+            show_size=not args.no_size,
+            max_depth=args.max_depth,
+            exclude_patterns=exclude_patterns,
+            use_default_excludes=use_default_excludes,
+            custom_excludes=custom_excludes,
+            jobs=args.jobs,
+            scan_cache=ScanCache(args.cache_file) if args.cache or args.cache_file else None,
+            dir_sizes=args.dir_sizes,
+            top_dirs=args.top
+        )
+        
+        # Affichage des patterns d'exclusion si demandé
+        if args.show_excludes:
+            explorer.show_excluded_patterns()
+            return 0
+        
+        directory = Path(args.directory).resolve()
+        
+        if not directory.exists():
+            print(f"❌ Erreur: Le dossier '{directory}' n'existe pas!")
+            return 1
+        
+        if not directory.is_dir():
+            print(f"❌ Erreur: '{directory}' n'est pas un dossier!")
+            return 1
+        
+        if args.bench_excludes:
+            benchmark_exclusions(explorer, directory)
+            return 0
+        
+        if args.find_duplicates:
+            finder = DuplicateFinder(explorer, jobs=args.jobs if args.jobs > 1 else None)
+            lines = finder.report_lines(directory, finder.find(directory))
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    f.write("\n".join(lines) + "\n")
+                print(f"✅ Rapport de doublons sauvegardé dans: {args.output}")
+            else:
+                print("\n".join(lines))
+            return 0
+        
+        # Affichage ou sauvegarde
+        if args.watch:
+            outputs = None
+            if args.output:
+                outputs = explorer._output_paths(args.output, explorer.parse_formats(args.format))
+            TreeWatcher(explorer, directory, outputs).run()
+        elif args.output:
+            explorer.save_to_file(directory, args.output, args.format)
+        else:
+            explorer.print_tree(directory, copy_to_clipboard=args.copy)
+        
+    except KeyboardInterrupt:
+        print("\n👋 Exploration interrompue!")
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+    
+    return 0
+
+
+def interactive_mode():
+    """Mode interactif pour explorer des dossiers."""
+    print("🚀 Mode interactif - Explorateur d'arborescence")
+    print("=" * 50)
+    
+    while True:
+        try:
+            print("\nOptions disponibles:")
+            print("1. Explorer un dossier")
+            print("2. Configurer les exclusions")
+            print("3. Afficher l'aide")
+            print("4. Quitter")
+            
+            choice = input("\nChoix (1-4): ").strip()
+            
+            if choice == "1":
+                path = input("Chemin du dossier à explorer: ").strip()
+                if not path:
+                    path = "."
+                
+                show_hidden = input("Afficher les fichiers cachés? (o/n): ").lower().startswith('o')
+                show_size = not input("Cacher les tailles? (o/n): ").lower().startswith('o')
+                
+                max_depth_input = input("Profondeur max (vide=illimitée): ").strip()
+                max_depth = int(max_depth_input) if max_depth_input.isdigit() else None
+                
+                copy_clipboard = input("Copier dans le presse-papiers? (o/n): ").lower().startswith('o')
+                
+                explorer = DirectoryTreeExplorer(
+                    show_hidden=show_hidden,
+                    show_size=show_size,
+                    max_depth=max_depth
+                )
+                
+                explorer.print_tree(path, copy_to_clipboard=copy_clipboard)
+                
+            elif choice == "2":
+                print("\nConfiguration des exclusions:")
+                print("1. Voir les exclusions actuelles")
+                print("2. Utiliser uniquement les exclusions par défaut")
+                print("3. Ajouter des exclusions personnalisées")
+                
+                config_choice = input("Choix (1-3): ").strip()
+                
+                if config_choice == "1":
+                    explorer = DirectoryTreeExplorer()
+                    explorer.show_excluded_patterns()
+                elif config_choice in ["2", "3"]:
+                    print("Fonctionnalité disponible en mode ligne de commande")
+                
+            elif choice == "3":
+                print_help()
+                
+            elif choice == "4":
+                print("👋 Au revoir!")
+                break
+                
+            else:
+                print("❌ Choix invalide!")
+                
+        except KeyboardInterrupt:
+            print("\n👋 Au revoir!")
+            break
+        except Exception as e:
+            print(f"❌ Erreur: {e}")
+
+
+def print_help():
+    """Affiche l'aide détaillée."""
+    help_text = """
+🔍 AIDE - Explorateur d'arborescence
+
+FONCTIONNALITÉS PRINCIPALES:
+• Affichage d'arborescence avec icônes
+• Exclusion intelligente des dossiers courants (node_modules, venv, etc.)
+• Calcul de statistiques (tailles, types de fichiers, etc.)
+• Copie dans le presse-papiers
+• Export en multiple formats (txt, json, html)
+• Mode interactif
+
+EXCLUSIONS PAR DÉFAUT:
+• Environnements virtuels: venv, env, node_modules, etc.
+• Fichiers de cache: __pycache__, .cache, .pytest_cache, etc.
+• Systèmes de contrôle de version: .git, .svn, etc.
+• IDEs: .vscode, .idea, etc.
+• Fichiers temporaires: *.tmp, *.log, *.bak, etc.
+
+EXEMPLES D'USAGE:
+  python DirectoryTreeExplorer.py                              # Dossier courant
+  python DirectoryTreeExplorer.py /path/to/folder --copy       # Avec copie
+  python DirectoryTreeExplorer.py . --max-depth 2             # Profondeur limitée
+  python DirectoryTreeExplorer.py . --no-default-excludes     # Sans exclusions
+  python DirectoryTreeExplorer.py . --add-exclude "*.pdf"     # Exclusions custom
+  python DirectoryTreeExplorer.py --show-excludes             # Voir exclusions
+
+FORMATS D'EXPORT:
+• TXT: Format texte simple
+• JSON: Structure arborescente pour traitement automatique
+• HTML: Page web interactive avec copie en un clic
+
+INSTALLATION RECOMMANDÉE:
+  pip install pyperclip  # Pour la fonctionnalité presse-papiers
+"""
+    print(help_text)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 1:
+        # Mode interactif si aucun argument
+        try:
+            interactive_mode()
+        except KeyboardInterrupt:
+            print("\n👋 Au revoir!")
+    else:
+        # Mode ligne de commande
+        exit(main())
+
+
+# DOCUMENTATION TECHNIQUE
+"""
+DirectoryTreeExplorer - Explorateur d'arborescence de dossiers amélioré
+
+NOUVELLES FONCTIONNALITÉS AJOUTÉES:
+
+1. GESTION AVANCÉE DES EXCLUSIONS:
+   - Patterns par défaut étendus incluant node_modules, venv, etc.
+   - Option --no-default-excludes pour désactiver les exclusions par défaut
+   - Option --add-exclude pour ajouter des exclusions personnalisées
+   - Cache d'exclusion pour optimiser les performances
+   - Compteur d'éléments exclus dans les statistiques
+
+2. PRESSE-PAPIERS:
+   - Fonction copy_to_clipboard() compatible multi-plateforme
+   - Support pour pyperclip, pbcopy (macOS), xclip/wl-copy (Linux), clip (Windows)
+   - Option --copy pour copier automatiquement l'arborescence
+   - Bouton de copie dans l'export HTML
+
+3. ICÔNES AMÉLIORÉES:
+   - Icônes spéciales pour les dossiers système (.git, node_modules, etc.)
+   - Support étendu des types de fichiers (TypeScript, Rust, Docker, etc.)
+   - Icônes contextuelles selon le type de dossier
+
+4. STATISTIQUES ÉTENDUES:
+   - Compteur d'éléments exclus
+   - Compteur d'erreurs de permission
+   - Détection des dossiers vides améliorée
+
+5. MODE INTERACTIF:
+   - Lancement automatique si aucun argument fourni
+   - Interface utilisateur simple pour configurer l'exploration
+   - Gestion des exceptions améliorée
+
+6. EXPORT HTML AMÉLIORÉ:
+   - Bouton de copie JavaScript intégré
+   - Styles améliorés avec thème sombre
+   - Responsive design
+
+7. OPTIONS SUPPLÉMENTAIRES:
+   - --verbose pour plus d'informations de debug
+   - --show-excludes pour voir les patterns actifs
+   - Validation des arguments améliorée
+
+UTILISATION RECOMMANDÉE:
+
+Pour un usage quotidien:
+  python DirectoryTreeExplorer.py ~/projet --copy
+
+Pour analyser un projet sans pollution:
+  python DirectoryTreeExplorer.py . --max-depth 3 --add-exclude "*.min.js,dist"
+
+Pour export documenté:
+  python DirectoryTreeExplorer.py . --output arbre.html --format html
+
+OPTIMISATIONS:
+- Parcours os.scandir en une passe : type issu du cache DirEntry, un seul stat() par fichier
+- Statistiques et dossiers vides calculés pendant le parcours (pas de relecture)
+- Exclusions compilées : ensembles de noms/suffixes + regex unique, testées sur le nom
+- Cache d'exclusion borné, indexé par nom de fichier
+- --jobs N : lecture des dossiers par un pool de threads (file partagée), rendu
+  identique au mode séquentiel car l'ordre et les statistiques restent ceux du parcours
+- Rendu en flux (iter_tree) : lignes écrites sur la sortie ou le fichier dès leur
+  production, mémoire proportionnelle à la profondeur et non à la taille de l'arbre
+- Export multi-format en un seul parcours : walk_tree produit des événements rendus
+  simultanément en txt/json/html ; JSON encodé en flux (JsonTreeEncoder), sans dict géant
+- Tailles des dossiers (--dir-sizes, --top) agrégées de bas en haut pendant le
+  parcours : chaque entrée n'est lue qu'une fois, quelle que soit la profondeur
+- --watch : un seul parcours puis inotify ; seul le dossier modifié est relu, les
+  statistiques sont ajustées par différence et seul son sous-arbre est réaffiché
+- --cache : listings conservés sur disque et réutilisés tant que le mtime du dossier
+  est inchangé ; une nouvelle exploration se réduit à un stat() par dossier
+  (base SQLite indexée par chemin, lue dossier par dossier, entrées en JSON)
+- --find-duplicates : filtrage en étapes (taille issue du parcours, hash des 64 Kio
+  de début et de fin, puis hash complet par mmap des seuls candidats), en threads
+- API backend (/api/files) : un niveau à la fois (list_directory), pagination par
+  curseur et tailles de dossiers servies depuis un cache calculé en arrière-plan
+- Tri optimisé (dossiers avant fichiers)
+- Gestion robuste des erreurs de permission
+- Logging configurable selon le niveau de verbosité
+
+DÉPENDANCES OPTIONNELLES:
+- pyperclip: Pour la fonctionnalité presse-papiers optimale
+- Outils système: pbcopy, xclip, wl-copy, clip selon la plateforme
+
+COMPATIBILITÉ:
+- Python 3.6+
+- Windows, macOS, Linux
+- Tous environnements de développement courants
+"""
\ No newline at end of file
@@ -0,0 +1,249 @@
+import hashlib
+import math
+from array import array
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+class EWMA:
+    """Exponentially weighted mean and variance, updated in O(1) per sample.
+
+    Weights decay with elapsed time (half_life seconds), so irregular or
+    bursty sampling does not skew the estimate. Until the decay factor
+    drops below 1/n the update is a plain running mean, which avoids the
+    start-up bias towards the first sample.
+    """
+
+    __slots__ = ("half_life", "mean", "var", "n", "_last_t")
+
+    def __init__(self, half_life: float):
+        self.half_life = half_life
+        self.mean = 0.0
+        self.var = 0.0
+        self.n = 0
+        self._last_t: Optional[float] = None
+
+    def update(self, x: float, t: float):
+        self.n += 1
+        if self.n == 1:
+            self.mean, self.var, self._last_t = x, 0.0, t
+            return
+        dt = max(t - self._last_t, 0.0)
+        self._last_t = max(t, self._last_t)
+        alpha = max(1.0 - math.exp(-math.log(2) * dt / self.half_life), 1.0 / self.n)
+        delta = x - self.mean
+        self.mean += alpha * delta
+        self.var = (1.0 - alpha) * (self.var + alpha * delta * delta)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+    def to_dict(self) -> Dict:
+        return {"half_life": self.half_life, "mean": self.mean, "var": self.var,
+                "n": self.n, "last_t": self._last_t}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EWMA":
+        ewma = cls(data["half_life"])
+        ewma.mean, ewma.var, ewma.n = data["mean"], data["var"], data["n"]
+        ewma._last_t = data["last_t"]
+        return ewma
+
+class RollingStats:
+    """Mean and variance over a sliding time window.
+
+    Keeps the samples of the window in a deque with running sums: adding a
+    sample and evicting expired ones is O(1) amortized.
+    """
+
+    __slots__ = ("window", "_samples", "_sum", "_sumsq")
+
+    def __init__(self, window: float):
+        self.window = window
+        self._samples: deque = deque()
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def update(self, x: float, t: float):
+        self._samples.append((t, x))
+        self._sum += x
+        self._sumsq += x * x
+        horizon = t - self.window
+        while self._samples and self._samples[0][0] < horizon:
+            _, old = self._samples.popleft()
+            self._sum -= old
+            self._sumsq -= old * old
+
+    @property
+    def n(self) -> int:
+        return len(self._samples)
+
+    @property
+    def mean(self) -> float:
+        return self._sum / len(self._samples) if self._samples else 0.0
+
+    @property
+    def var(self) -> float:
+        n = len(self._samples)
+        if n < 2:
+            return 0.0
+        # Running sums can drift slightly negative through rounding
+        return max((self._sumsq - self._sum * self._sum / n) / (n - 1), 0.0)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+class SeasonalBaseline:
+    """One slowly decaying EWMA per hour of the day.
+
+    Captures daily patterns (backups at night, load during office hours) so
+    a busy hour is compared with the same hour on previous days rather than
+    with the quiet hours around it.
+    """
+
+    __slots__ = ("buckets",)
+
+    def __init__(self, half_life: float):
+        self.buckets = [EWMA(half_life) for _ in range(24)]
+
+    def update(self, x: float, t: float, hour: int):
+        self.buckets[hour].update(x, t)
+
+    def get(self, hour: int) -> EWMA:
+        return self.buckets[hour]
+
+def zscore(x: float, mean: float, std: float, min_std: float) -> float:
+    """Standard score with a floor on the deviation (flat series would divide by ~0)"""
+    return (x - mean) / max(std, min_std)
+
+def baseline_for(rolling: RollingStats, seasonal: EWMA,
+                 seasonal_min_samples: int) -> Tuple[float, float, str]:
+    """Pick the seasonal bucket once it has enough history, else the rolling window"""
+    if seasonal.n >= seasonal_min_samples:
+        return seasonal.mean, seasonal.std, "seasonal"
+    return rolling.mean, rolling.std, "rolling"
+
+class OnlineRegression:
+    """Least-squares line through (t, y) samples, updated in O(1) per sample.
+
+    Keeps exponentially decayed sums (half_life seconds, None for no decay)
+    instead of the samples, so the fit follows the recent trend and never
+    has to be recomputed from history. Times are stored relative to the
+    first sample to keep the sums well conditioned.
+    """
+
+    __slots__ = ("half_life", "n", "_t0", "_last_t", "_w", "_sx", "_sy", "_sxx", "_sxy", "_syy")
+
+    def __init__(self, half_life: Optional[float] = None):
+        self.half_life = half_life
+        self.n = 0
+        self._t0: Optional[float] = None
+        self._last_t: Optional[float] = None
+        self._w = self._sx = self._sy = self._sxx = self._sxy = self._syy = 0.0
+
+    def update(self, y: float, t: float):
+        if self._t0 is None:
+            self._t0 = self._last_t = t
+        elif self.half_life:
+            decay = 0.5 ** (max(t - self._last_t, 0.0) / self.half_life)
+            self._w *= decay
+            self._sx *= decay
+            self._sy *= decay
+            self._sxx *= decay
+            self._sxy *= decay
+            self._syy *= decay
+        self._last_t = max(t, self._last_t)
+        x = t - self._t0
+        self.n += 1
+        self._w += 1.0
+        self._sx += x
+        self._sy += y
+        self._sxx += x * x
+        self._sxy += x * y
+        self._syy += y * y
+
+    @property
+    def span(self) -> float:
+        """Seconds between the first and the latest sample"""
+        return 0.0 if self._t0 is None else self._last_t - self._t0
+
+    def fit(self) -> Optional[Tuple[float, float]]:
+        """(slope per second, intercept at time 0), or None while undetermined"""
+        if self.n < 2:
+            return None
+        sxx = self._sxx - self._sx * self._sx / self._w
+        if sxx <= 1e-9:
+            return None
+        slope = (self._sxy - self._sx * self._sy / self._w) / sxx
+        intercept = (self._sy - slope * self._sx) / self._w
+        return slope, intercept - slope * self._t0
+
+    def predict(self, t: float) -> Optional[float]:
+        fit = self.fit()
+        return None if fit is None else fit[1] + fit[0] * t
+
+    @property
+    def r2(self) -> float:
+        """Share of the variance explained by the line (0 when undetermined)"""
+        fit = self.fit()
+        syy = self._syy - self._sy * self._sy / self._w if self.n else 0.0
+        if fit is None or syy <= 1e-12:
+            return 0.0
+        explained = fit[0] * (self._sxy - self._sx * self._sy / self._w)
+        return min(max(explained / syy, 0.0), 1.0)
+
+class CountMinSketch:
+    """Approximate counts of string keys in fixed memory (depth x width counters).
+
+    Estimates never undercount, so an estimate of 0 means the key was
+    certainly never added; a key added before may be overestimated when
+    it collides with others in every row. Updates and queries are O(depth).
+    Keys are hashed with blake2b rather than hash(), which is salted per
+    process, so a persisted sketch stays valid across restarts.
+    """
+
+    __slots__ = ("width", "depth", "_rows", "total")
+
+    def __init__(self, width: int = 4096, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self._rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        h1 = int.from_bytes(digest[:4], "little")
+        h2 = int.from_bytes(digest[4:], "little") | 1
+        # Double hashing: depth independent-enough positions from one digest
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add to a key (conservative update) and return its new estimate"""
+        indexes = self._indexes(key)
+        estimate = min(row[i] for row, i in zip(self._rows, indexes)) + count
+        # Only raise counters that are below the new estimate: tighter overestimates
+        for row, i in zip(self._rows, indexes):
+            if row[i] < estimate:
+                row[i] = min(estimate, 0xFFFFFFFF)
+        self.total += count
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key)))
+
+    @property
+    def fill_ratio(self) -> float:
+        """Share of non-zero counters; near 1 the sketch stops telling keys apart"""
+        return sum(self.width - row.count(0) for row in self._rows) / (self.width * self.depth)
+
+    def to_dict(self) -> Dict:
+        return {"width": self.width, "depth": self.depth, "total": self.total,
+                "rows": [row.tobytes().hex() for row in self._rows]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CountMinSketch":
+        sketch = cls(data["width"], data["depth"])
+        sketch.total = data["total"]
+        sketch._rows = [array("I", bytes.fromhex(row)) for row in data["rows"]]
+        return sketch
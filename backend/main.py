@@ -8,10 +8,20 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-from api.endpoints import system, auth, ai_analysis
+from api.endpoints import system, auth, ai_analysis, files
 from core.config import settings
 from db import engine, Base, SessionLocal
-from services import ProcessService, ServiceService
+from services import ProcessService, SecurityService, ServiceService
+from services.analysis_scheduler import analysis_scheduler
+from services.network_baseline import network_baseline
+from services.process_integrity import process_integrity
+from services.security_service import security_event_queue
+
+async def _schedule_analysis():
+    # Jobs run in the scheduler's worker pool; this only resubmits expired ones
+    while True:
+        analysis_scheduler.tick()
+        await asyncio.sleep(5)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,14 +30,25 @@ async def lifespan(app: FastAPI):
     
     # Create database tables
     try:
+        if engine.dialect.name == "sqlite":
+            # Only takes effect on a new database: lets retention release space incrementally
+            with engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
         Base.metadata.create_all(bind=engine)
+        # create_all skips indexes added to tables that already exist
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
         print("Database tables created successfully")
     except Exception as e:
         print(f"Error creating database tables: {e}")
 
-    # Sync services and processes
     db = SessionLocal()
     try:
+        # Events stored before timestamps were written from Python
+        SecurityService.normalize_timestamps(db)
+        
+        # Sync services and processes
         print("Syncing services...")
         ServiceService.sync_services(db)
         print("Services synced.")
@@ -38,10 +59,17 @@ async def lifespan(app: FastAPI):
     finally:
         db.close()
 
+    scheduler_task = asyncio.create_task(_schedule_analysis())
+
     yield
     
     # Shutdown
     print("Shutting down IndraOS Backend...")
+    scheduler_task.cancel()
+    analysis_scheduler.shutdown()
+    security_event_queue.stop()
+    network_baseline.save()
+    process_integrity.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
@@ -64,6 +92,7 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(system.router, prefix="/api", tags=["System"])
 app.include_router(ai_analysis.router, prefix="/api", tags=["AI Analysis"])
+app.include_router(files.router, prefix="/api", tags=["Files"])
 
 @app.get("/")
 def read_root():
@@ -1,8 +1,9 @@
-from .system import SystemMetrics, Process, Service, NetworkInterface, SecurityEvent
+from .system import SystemMetrics, DiskMetrics, Process, Service, NetworkInterface, SecurityEvent
 from .user import User
 
 __all__ = [
     "SystemMetrics",
+    "DiskMetrics",
     "Process", 
     "Service",
     "NetworkInterface",
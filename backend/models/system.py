@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from db import Base
 import datetime
 
+def _utcnow() -> datetime.datetime:
+    # Naive UTC like func.now() on SQLite, but written by the driver with
+    # microseconds so it compares correctly with Python-side bounds
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
 class SystemMetrics(Base):
     __tablename__ = "system_metrics"
     
@@ -32,6 +37,37 @@ class SystemMetrics(Base):
     # System status
     system_status = Column(String(50), default="operational")
     uptime = Column(Float)
+    
+    # Per-mountpoint samples taken with this snapshot
+    disks = relationship("DiskMetrics", back_populates="system_metrics", cascade="all, delete-orphan")
+
+class DiskMetrics(Base):
+    __tablename__ = "disk_metrics"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    system_metrics_id = Column(Integer, ForeignKey("system_metrics.id", ondelete="CASCADE"), index=True)
+    timestamp = Column(DateTime, default=func.now(), index=True)
+    
+    # Mount
+    device = Column(String(255))
+    mountpoint = Column(String(500), index=True)
+    fstype = Column(String(50))
+    
+    # Usage (GB / %)
+    total = Column(Float)
+    used = Column(Float)
+    free = Column(Float)
+    usage = Column(Float)
+    
+    # I/O rates since the previous sample
+    read_iops = Column(Float)
+    write_iops = Column(Float)
+    read_throughput = Column(Float)  # MB/s
+    write_throughput = Column(Float)  # MB/s
+    read_await = Column(Float)  # ms per read
+    write_await = Column(Float)  # ms per write
+    
+    system_metrics = relationship("SystemMetrics", back_populates="disks")
 
 class Process(Base):
     __tablename__ = "processes"
@@ -78,7 +114,7 @@ class SecurityEvent(Base):
     __tablename__ = "security_events"
     
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=func.now(), index=True)
+    timestamp = Column(DateTime, default=_utcnow, index=True)
     event_type = Column(String(100), index=True)
     severity = Column(String(50), index=True)
     source = Column(String(255))
@@ -87,3 +123,12 @@ class SecurityEvent(Base):
     ip_address = Column(String(45))
     resolved = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now())
+    
+    # Keyset pagination (newest first), alone and behind each equality filter
+    __table_args__ = (
+        Index("ix_security_events_timestamp_id", "timestamp", "id"),
+        Index("ix_security_events_type_timestamp_id", "event_type", "timestamp", "id"),
+        Index("ix_security_events_source_timestamp_id", "source", "timestamp", "id"),
+        Index("ix_security_events_ip_timestamp_id", "ip_address", "timestamp", "id"),
+        Index("ix_security_events_severity_resolved_timestamp_id", "severity", "resolved", "timestamp", "id"),
+    )
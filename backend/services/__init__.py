@@ -4,6 +4,7 @@ from .service_service import ServiceService
 from .network_service import NetworkService
 from .security_service import SecurityService
 from .user_service import UserService
+from .file_browser_service import FileBrowserService
 
 __all__ = [
     "SystemService",
@@ -11,5 +12,6 @@ __all__ = [
     "ServiceService", 
     "NetworkService",
     "SecurityService",
-    "UserService"
+    "UserService",
+    "FileBrowserService"
 ]
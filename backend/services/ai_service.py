@@ -1,59 +1,36 @@
-from typing import List
-from api.schemas.ai_analysis import AIAnalysisData, AIAnalysisStats, AIAnalysisStatus, AIInsight
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from api.schemas.ai_analysis import AIAnalysisData
+from services.analysis_engine import analysis_engine
+from services.analysis_scheduler import analysis_scheduler
+from services.security_service import SecurityService
 
-def get_ai_analysis_data() -> AIAnalysisData:
+def get_ai_analysis_data(db: Session) -> AIAnalysisData:
     """
-    Generates mock AI analysis data.
-    In a real application, this would involve running complex AI models.
-    """
-    mock_insights = [
-        AIInsight(
-            id=1,
-            category="Performance",
-            description="High CPU usage detected in 'explorer.exe' process.",
-            recommendation="Consider closing unused applications or tabs to reduce CPU load.",
-            severity="Medium"
-        ),
-        AIInsight(
-            id=2,
-            category="Security",
-            description="Unusual outbound network traffic detected from a non-standard application.",
-            recommendation="Review the application in the firewall settings and run a security scan.",
-            severity="High"
-        ),
-        AIInsight(
-            id=3,
-            category="Optimization",
-            description="Several large temporary files found in the system cache.",
-            recommendation="Use the system cleanup utility to free up disk space.",
-            severity="Low"
-        ),
-        AIInsight(
-            id=4,
-            category="Performance",
-            description="Memory usage is consistently above 85%.",
-            recommendation="Upgrade RAM or configure virtual memory for better performance.",
-            severity="Medium"
-        ),
-    ]
+    Return the current findings of the analysis engine.
 
-    mock_stats = AIAnalysisStats(
-        insights_generated=47,
-        optimizations_applied=23,
-        security_issues_fixed=5,
-        performance_gain_percentage=15.0
+    The engine is updated incrementally as metric samples and process
+    snapshots are collected, and by the scheduled analysis jobs; this only
+    reads its precomputed state (and resubmits expired jobs without waiting).
+    Security issues count as fixed only once their event is marked resolved.
+    """
+    analysis_scheduler.tick()
+    stats = analysis_engine.get_stats()
+    stats.security_issues_fixed = SecurityService.count_resolved_events(db)
+    return AIAnalysisData(
+        stats=stats,
+        status=analysis_scheduler.get_status(analysis_engine.status_message()),
+        insights=analysis_engine.insights()
     )
 
-    mock_status = AIAnalysisStatus(
-        system_scan_progress=100.0,
-        security_analysis_progress=87.0,
-        performance_check_progress=65.0,
-        optimization_scan_progress=23.0,
-        status_message="Neural networks are actively monitoring your system. Next full analysis scheduled in 2 hours."
-    )
+def get_analysis_jobs() -> List[Dict]:
+    return analysis_scheduler.list()
 
-    return AIAnalysisData(
-        stats=mock_stats,
-        status=mock_status,
-        insights=mock_insights
-    )
+def run_analysis_job(name: str) -> Optional[Dict]:
+    return analysis_scheduler.run(name)
+
+def cancel_analysis_job(name: str) -> Optional[bool]:
+    """None for an unknown job, False if it is not running"""
+    if analysis_scheduler.get(name) is None:
+        return None
+    return analysis_scheduler.cancel(name)
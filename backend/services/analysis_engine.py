@@ -0,0 +1,365 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Tuple
+from api.schemas.ai_analysis import AIAnalysisStats, AIInsight
+from api.schemas.system import ProcessCreate, SystemMetricsCreate
+from core.config import settings
+from core.online_stats import EWMA, OnlineRegression, RollingStats, SeasonalBaseline, baseline_for, zscore
+
+# An active finding is cleared once its score falls below threshold * CLEAR_RATIO
+CLEAR_RATIO = 0.75
+
+SEVERITY_ORDER = {"High": 0, "Medium": 1, "Low": 2}
+
+# metric -> (category, label, unit, minimum deviation, recommendation)
+SYSTEM_METRICS = {
+    "cpu_usage": (
+        "Performance", "CPU usage", "%", 2.0,
+        "Look for the process driving the load in the process list and stop or reschedule it."
+    ),
+    "memory_usage": (
+        "Performance", "Memory usage", "%", 1.0,
+        "Check for processes whose memory keeps growing and restart or limit them."
+    ),
+    "disk_usage": (
+        "Optimization", "Root filesystem usage", "%", 0.2,
+        "Find what is writing to the root filesystem and clean up logs, caches or temporary files."
+    ),
+    "network_in_rate": (
+        "Performance", "Inbound network traffic", " MB/s", 0.05,
+        "Check which connections are receiving data and whether the transfer is expected."
+    ),
+    "network_out_rate": (
+        "Security", "Outbound network traffic", " MB/s", 0.05,
+        "Review the processes with open outbound connections; unexpected uploads can indicate data exfiltration."
+    ),
+}
+
+def _format_hours(hours: float) -> str:
+    if hours < 1:
+        return f"{max(hours * 60, 1):.0f} min"
+    if hours < 48:
+        return f"{hours:.0f}h"
+    return f"{hours / 24:.0f} days"
+
+def _severity(score: float) -> str:
+    threshold = settings.analysis_zscore_threshold
+    if score >= 2 * threshold:
+        return "High"
+    if score >= 4 / 3 * threshold:
+        return "Medium"
+    return "Low"
+
+class MetricDetector:
+    """Online anomaly detector for one metric series.
+
+    A short EWMA smooths the live value and is scored against the expected
+    level: the hour-of-day baseline once that hour has enough history,
+    otherwise a rolling window. The score is taken before the sample
+    updates the baselines, and outliers enter the baselines clipped to the
+    detection band, so an anomaly does not hide itself while a lasting
+    change of level is still learned progressively.
+    """
+
+    def __init__(self, min_std: float):
+        self.min_std = min_std
+        self.short = EWMA(settings.analysis_short_half_life)
+        self.rolling = RollingStats(settings.analysis_baseline_window)
+        self.seasonal = SeasonalBaseline(settings.analysis_seasonal_half_life)
+        self.score = 0.0
+        self.baseline: Tuple[float, float, str] = (0.0, 0.0, "rolling")
+
+    def update(self, x: float, t: float, hour: int) -> float:
+        self.short.update(x, t)
+        bucket = self.seasonal.get(hour)
+        self.baseline = baseline_for(self.rolling, bucket, settings.analysis_seasonal_min_samples)
+        warm = self.rolling.n >= settings.analysis_warmup_samples or self.baseline[2] == "seasonal"
+        mean, std, _ = self.baseline
+        self.score = zscore(self.short.mean, mean, std, self.min_std) if warm else 0.0
+        if warm:
+            band = settings.analysis_zscore_threshold * max(std, self.min_std)
+            x = min(max(x, mean - band), mean + band)
+        self.rolling.update(x, t)
+        self.seasonal.update(x, t, hour)
+        return self.score
+
+    @property
+    def warm(self) -> bool:
+        return self.rolling.n >= settings.analysis_warmup_samples
+
+class ProcessTracker:
+    """CPU and RSS history of one process (keyed by pid and name to survive pid reuse)"""
+
+    __slots__ = ("short", "long", "score", "rss")
+
+    def __init__(self):
+        self.short = EWMA(settings.analysis_short_half_life)
+        self.long = EWMA(settings.analysis_baseline_window)
+        self.score = 0.0
+        self.rss = OnlineRegression(settings.analysis_forecast_half_life)
+
+def _forecast_ready(regression: OnlineRegression) -> bool:
+    return (regression.n >= settings.analysis_forecast_min_samples
+            and regression.span >= settings.analysis_forecast_min_span)
+
+class AnalysisEngine:
+    """Incremental system analysis behind /ai-analysis.
+
+    Metric samples and process snapshots are folded into online statistics
+    as they are collected (O(1) per series per sample). Findings are kept
+    as a set of active insights, one per metric or process: a sustained
+    condition updates its insight in place and clears it once the value
+    returns to normal. Scheduled analysis jobs report their findings into
+    the same set. Reads only format this precomputed state.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, MetricDetector] = {
+            name: MetricDetector(spec[3]) for name, spec in SYSTEM_METRICS.items()
+        }
+        self._processes: Dict[Tuple[int, str], ProcessTracker] = {}
+        # mountpoint -> regression of used GB over time
+        self._disks: Dict[str, OnlineRegression] = {}
+        self._network: Optional[Tuple[float, float, float]] = None
+        self._last_sample_t: Optional[float] = None
+        self._insights: Dict[tuple, AIInsight] = {}
+        self._next_id = 1
+        self.samples = 0
+        self.process_snapshots = 0
+        self.last_sample_at: Optional[datetime] = None
+        self.insights_generated = 0
+
+    # Inputs
+
+    def observe_metrics(self, metrics: SystemMetricsCreate, t: Optional[float] = None) -> bool:
+        """Fold one system metrics sample into the baselines.
+
+        Samples closer than analysis_min_sample_interval to the previous one
+        are ignored (False), so an extra collection between two scheduled ones
+        does not skew the sample weights or the network rates.
+        """
+        if metrics.system_status == "error":
+            return False
+        t = time.time() if t is None else t
+        now = datetime.fromtimestamp(t)
+        values = {
+            "cpu_usage": metrics.cpu_usage,
+            "memory_usage": metrics.memory_usage,
+            "disk_usage": metrics.disk_usage,
+        }
+        with self._lock:
+            if self._last_sample_t is not None and t - self._last_sample_t < settings.analysis_min_sample_interval:
+                return False
+            self._last_sample_t = t
+            values.update(self._network_rates(metrics, t))
+            self._observe_disks(metrics, t)
+            for name, value in values.items():
+                if value is None:
+                    continue
+                score = self._metrics[name].update(value, t, now.hour)
+                self._evaluate_metric(name, value, score, now.hour)
+            self.samples += 1
+            self.last_sample_at = now
+        return True
+
+    def observe_processes(self, processes: List[ProcessCreate], t: Optional[float] = None):
+        """Fold one process snapshot into the per-process CPU baselines"""
+        t = time.time() if t is None else t
+        threshold = settings.analysis_process_cpu_threshold
+        with self._lock:
+            seen = set()
+            for proc in processes:
+                key = (proc.pid, proc.name)
+                seen.add(key)
+                tracker = self._processes.get(key)
+                if tracker is None:
+                    tracker = self._processes[key] = ProcessTracker()
+                if proc.memory_rss is not None:
+                    tracker.rss.update(proc.memory_rss, t)
+                    self._evaluate_leak(key, tracker, proc)
+                if proc.cpu_usage is None:
+                    continue
+                warm = tracker.long.n >= settings.analysis_process_warmup_samples
+                if warm:
+                    tracker.score = zscore(proc.cpu_usage, tracker.long.mean, tracker.long.std, 5.0)
+                tracker.short.update(proc.cpu_usage, t)
+                tracker.long.update(proc.cpu_usage, t)
+                self._evaluate_process(key, tracker, proc, threshold, warm)
+
+            # Exited processes: drop their state and their findings
+            for key in [key for key in self._processes if key not in seen]:
+                del self._processes[key]
+                self._clear(("process", key))
+                self._clear(("leak", key))
+            self.process_snapshots += 1
+
+    def _network_rates(self, metrics: SystemMetricsCreate, t: float) -> Dict[str, float]:
+        """Turn the cumulative network counters (MB since boot) into MB/s"""
+        if metrics.network_in is None or metrics.network_out is None:
+            return {}
+        previous, self._network = self._network, (t, metrics.network_in, metrics.network_out)
+        if previous is None or t <= previous[0]:
+            return {}
+        dt = t - previous[0]
+        rates = {
+            "network_in_rate": (metrics.network_in - previous[1]) / dt,
+            "network_out_rate": (metrics.network_out - previous[2]) / dt,
+        }
+        # Counters reset (interface restarted): skip this interval
+        return {name: rate for name, rate in rates.items() if rate >= 0}
+
+    def _observe_disks(self, metrics: SystemMetricsCreate, t: float):
+        """Feed used space per mount, from samples that carry per-disk rows only.
+
+        Realtime samples have no per-disk rows and their root summary counts
+        reserved blocks as used: mixing both in one regression would show
+        steps of several GB, so they are left out.
+        """
+        if not metrics.disks:
+            return
+        disks = {d.mountpoint: (d.used, d.free) for d in metrics.disks if d.used is not None}
+        root = os.path.abspath(os.sep)
+        if root not in disks and metrics.disk_total is not None and metrics.disk_available is not None:
+            # Root missing from the per-mount rows (overlay fs): the summary of
+            # the same samples, so this series keeps a single definition of used
+            disks[root] = (metrics.disk_total - metrics.disk_available, metrics.disk_available)
+        # Unmounted volumes: drop their state and their findings
+        for mountpoint in [mp for mp in self._disks if mp not in disks]:
+            del self._disks[mountpoint]
+            self._clear(("disk", mountpoint))
+        for mountpoint, (used, free) in disks.items():
+            regression = self._disks.get(mountpoint)
+            if regression is None:
+                regression = self._disks[mountpoint] = OnlineRegression(settings.analysis_forecast_half_life)
+            regression.update(used, t)
+            self._evaluate_disk(mountpoint, regression, free)
+
+    # Findings
+
+    def _evaluate_disk(self, mountpoint: str, regression: OnlineRegression, free: float):
+        key = ("disk", mountpoint)
+        fit = regression.fit() if _forecast_ready(regression) else None
+        rate = fit[0] * 3600 if fit else 0.0  # GB/h
+        hours = free / rate if rate > 0 and free is not None else None
+        horizon = settings.analysis_disk_full_horizon
+        if hours is None or hours > horizon:
+            if key in self._insights and (hours is None or hours > horizon / CLEAR_RATIO):
+                self._clear(key)
+            return
+        self._raise(key, "Optimization", (
+            f"Volume {mountpoint} will be full in ~{_format_hours(hours)} "
+            f"(growing {rate:.2f} GB/h, {free:.1f} GB free)."
+        ), "Find what is filling the volume and clean up or move data before it runs out of space.",
+            "High" if hours < 6 else "Medium" if hours < 24 else "Low")
+
+    def _evaluate_leak(self, key: tuple, tracker: ProcessTracker, proc: ProcessCreate):
+        insight_key = ("leak", key)
+        regression = tracker.rss
+        fit = regression.fit() if _forecast_ready(regression) else None
+        rate = fit[0] * 3600 if fit else 0.0  # MB/h
+        min_rate = settings.analysis_leak_min_rate
+        if rate < min_rate or regression.r2 < settings.analysis_leak_min_r2:
+            if insight_key in self._insights and (rate < min_rate * CLEAR_RATIO or regression.r2 < 0.5):
+                self._clear(insight_key)
+            return
+        self._raise(insight_key, "Performance", (
+            f"Process '{proc.name}' (PID {proc.pid}) is leaking ~{rate:.0f} MB/h "
+            f"(RSS {proc.memory_rss:.0f} MB, growing steadily for {_format_hours(regression.span / 3600)})."
+        ), "Restart the process to reclaim memory and check it for leaks; report the growth to its maintainer.",
+            "High" if rate >= 10 * min_rate else "Medium")
+
+    def _evaluate_metric(self, name: str, value: float, score: float, hour: int):
+        threshold = settings.analysis_zscore_threshold
+        key = ("metric", name)
+        if score < threshold:
+            if key in self._insights and score < threshold * CLEAR_RATIO:
+                self._clear(key)
+            return
+        category, label, unit, _, recommendation = SYSTEM_METRICS[name]
+        mean, std, kind = self._metrics[name].baseline
+        reference = f"usual for {hour:02d}:00" if kind == "seasonal" else "recent average"
+        self._raise(key, category, (
+            f"{label} is abnormally high: {value:.2f}{unit} "
+            f"({reference} {mean:.2f}{unit} ± {std:.2f}, score {score:.1f})"
+        ), recommendation, _severity(score))
+
+    def _evaluate_process(self, key: tuple, tracker: ProcessTracker, proc: ProcessCreate,
+                          threshold: float, warm: bool):
+        insight_key = ("process", key)
+        sustained = warm and tracker.short.mean >= threshold
+        spike = warm and proc.cpu_usage >= threshold and tracker.score >= settings.analysis_zscore_threshold
+        if sustained:
+            self._raise(insight_key, "Performance", (
+                f"Process '{proc.name}' (PID {proc.pid}) has used {tracker.short.mean:.1f}% CPU "
+                f"on average recently."
+            ), "Check whether the workload is expected; lower its priority or limit it if not.",
+                "High" if tracker.short.mean >= 2 * threshold else "Medium")
+        elif spike:
+            self._raise(insight_key, "Performance", (
+                f"Process '{proc.name}' (PID {proc.pid}) jumped to {proc.cpu_usage:.1f}% CPU "
+                f"(usually {tracker.long.mean:.1f}%)."
+            ), "Check what the process is doing; a sudden change in its load can indicate a fault.",
+                _severity(tracker.score))
+        elif insight_key in self._insights and tracker.short.mean < threshold * CLEAR_RATIO:
+            self._clear(insight_key)
+
+    def report(self, source: str, findings: Dict[Hashable, Tuple[str, str, str, str]]):
+        """Replace the findings of a scheduled job: {key: (category, description, recommendation, severity)}
+
+        Findings the job no longer reports are cleared; those it reports again
+        keep their insight id.
+        """
+        with self._lock:
+            for key in [k for k in self._insights if k[0] == "job" and k[1] == source]:
+                if key[2] not in findings:
+                    self._clear(key)
+            for key, (category, description, recommendation, severity) in findings.items():
+                self._raise(("job", source, key), category, description, recommendation, severity)
+
+    def _raise(self, key: tuple, category: str, description: str, recommendation: str, severity: str):
+        insight = self._insights.get(key)
+        if insight is None:
+            self._insights[key] = AIInsight(
+                id=self._next_id, category=category, description=description,
+                recommendation=recommendation, severity=severity
+            )
+            self._next_id += 1
+            self.insights_generated += 1
+        else:
+            insight.description = description
+            insight.severity = severity
+
+    def _clear(self, key: tuple):
+        # A finding that disappears was not necessarily fixed: nothing is counted
+        self._insights.pop(key, None)
+
+    # Output
+
+    def insights(self) -> List[AIInsight]:
+        with self._lock:
+            insights = [insight.model_copy() for insight in self._insights.values()]
+        return sorted(insights, key=lambda i: (SEVERITY_ORDER.get(i.severity, 3), -i.id))
+
+    def get_stats(self) -> AIAnalysisStats:
+        """Counters of the engine; resolutions are recorded on the security events, not here"""
+        with self._lock:
+            return AIAnalysisStats(insights_generated=self.insights_generated)
+
+    def status_message(self) -> str:
+        with self._lock:
+            return self._status_message(len(self._insights))
+
+    def _status_message(self, active: int) -> str:
+        if self.samples == 0:
+            return "Waiting for metric samples to build baselines."
+        if not self._metrics["cpu_usage"].warm:
+            return (f"Learning baselines: {self.samples}/{settings.analysis_warmup_samples} "
+                    f"samples collected.")
+        return (f"Monitoring {len(self._metrics)} metrics and {len(self._processes)} processes; "
+                f"last sample at {self.last_sample_at:%H:%M:%S}, {active} active findings.")
+
+# Shared instance fed by SystemService and ProcessService
+analysis_engine = AnalysisEngine()
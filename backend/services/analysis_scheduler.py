@@ -0,0 +1,347 @@
+import os
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import psutil
+from api.schemas.ai_analysis import AIAnalysisStatus
+from core.config import settings
+from db import SessionLocal
+from services.analysis_engine import analysis_engine
+from services.disk_probe import disk_probe
+from services.process_integrity import process_integrity
+from services.process_service import ProcessService
+from services.retention_service import retention_manager
+from services.security_rules import security_rules
+from services.security_service import SecurityService
+from services.system_service import SystemService
+
+class JobCancelled(Exception):
+    pass
+
+class JobContext:
+    """Handed to a job function to report progress and poll for cancellation"""
+
+    def __init__(self, state: Dict, cancel_event: threading.Event):
+        self._state = state
+        self._cancel_event = cancel_event
+
+    def progress(self, done: float, total: float = 1.0):
+        """Record progress (done out of total) and stop here if cancelled"""
+        self._state["progress"] = round(100.0 * min(done / total, 1.0), 1) if total else 100.0
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+# A job returns its findings: {key: (category, description, recommendation, severity)}
+JobFunc = Callable[[JobContext], Dict]
+
+def system_scan(ctx: JobContext) -> Dict:
+    """Collect and store a metrics sample; storing it feeds the engine and the rules"""
+    ctx.progress(0)
+    metrics = SystemService.collect_system_metrics()
+    ctx.progress(0.5)
+    db = SessionLocal()
+    try:
+        SystemService.save_metrics(db, metrics)
+    finally:
+        db.close()
+    ctx.progress(1)
+    return {}
+
+# Executables run from these directories are a common sign of a dropped payload
+SUSPICIOUS_EXE_DIRS = ("/tmp/", "/var/tmp/", "/dev/shm/")
+
+def _exe_deleted(pid: int) -> bool:
+    """Whether the executable of a process was deleted from disk.
+
+    psutil strips the " (deleted)" suffix the kernel appends to
+    /proc/<pid>/exe, so the link is read directly (Linux only).
+    """
+    try:
+        return os.readlink(f"/proc/{pid}/exe").endswith(" (deleted)")
+    except OSError:
+        return False
+
+def _executable_findings(procs: List[psutil.Process], ctx: JobContext) -> Dict:
+    """Processes running a deleted executable or one from a temporary directory"""
+    findings = {}
+    for i, proc in enumerate(procs):
+        if i % 50 == 0:
+            ctx.progress(0.5 + 0.5 * i / len(procs))
+        exe = proc.info.get("exe") or ""
+        if exe and _exe_deleted(proc.info["pid"]):
+            findings[("deleted-exe", proc.info["pid"])] = (
+                "Security",
+                f"Process '{proc.info['name']}' (PID {proc.info['pid']}) runs a deleted executable ({exe}).",
+                "Check where the process comes from; malware often deletes its binary after starting.",
+                "High"
+            )
+        elif exe.startswith(SUSPICIOUS_EXE_DIRS):
+            findings[("tmp-exe", proc.info["pid"])] = (
+                "Security",
+                f"Process '{proc.info['name']}' (PID {proc.info['pid']}) runs from a temporary directory ({exe}).",
+                "Verify that the program is legitimate and stop it if not.",
+                "Medium"
+            )
+    return findings
+
+def security_analysis(ctx: JobContext) -> Dict:
+    """Security rules on a fresh snapshot plus a pass over process executables"""
+    db = SessionLocal()
+    try:
+        SecurityService.scan_for_suspicious_activity(db)
+    finally:
+        db.close()
+    ctx.progress(0.5)
+    # Ongoing rule conditions stay findings until they clear
+    findings = {}
+    for condition in security_rules.active_conditions():
+        rule = condition["rule"]
+        findings[("rule", rule.name, condition["key"])] = (
+            "Security",
+            rule.describe(condition["value"], condition["label"]),
+            "Review the event in the security log and check the processes involved.",
+            rule.severity.capitalize()
+        )
+
+    findings.update(_executable_findings(list(psutil.process_iter(["pid", "name", "exe"])), ctx))
+    ctx.progress(1)
+    return findings
+
+def performance_check(ctx: JobContext) -> Dict:
+    """Take a process snapshot (fed to the engine) and flag the largest memory users"""
+    ctx.progress(0)
+    processes = ProcessService.get_all_processes()
+    ctx.progress(0.8)
+    findings = {}
+    threshold = settings.analysis_process_memory_threshold
+    for proc in processes:
+        if proc.memory_usage is not None and proc.memory_usage >= threshold:
+            findings[("memory", proc.pid, proc.name)] = (
+                "Performance",
+                f"Process '{proc.name}' (PID {proc.pid}) uses {proc.memory_usage:.1f}% of the memory.",
+                "Restart or limit the process if its memory use is not expected.",
+                "High" if proc.memory_usage >= 2 * threshold else "Medium"
+            )
+    ctx.progress(1)
+    return findings
+
+def _tree_size(path: str, ctx: JobContext) -> int:
+    """Bytes under path, without following symlinks or crossing filesystems"""
+    total = 0
+    device = os.lstat(path).st_dev
+    stack = [path]
+    while stack:
+        ctx.check_cancelled()
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if stat.S_ISDIR(st.st_mode):
+                        if st.st_dev == device:
+                            stack.append(entry.path)
+                    else:
+                        total += st.st_size
+        except OSError:
+            continue
+    return total
+
+def optimization_scan(ctx: JobContext) -> Dict:
+    """Nearly full volumes and oversized temporary directories"""
+    findings = {}
+    partitions = psutil.disk_partitions()
+    usages = disk_probe.usage([part.mountpoint for part in partitions])
+    for mountpoint, usage in usages.items():
+        if usage is not None and usage.percent >= settings.analysis_volume_usage_threshold:
+            findings[("volume", mountpoint)] = (
+                "Optimization",
+                f"Volume {mountpoint} is {usage.percent:.0f}% full ({usage.free / 1024**3:.1f} GB free).",
+                "Use the system cleanup utility or move data to free up space.",
+                "High" if usage.percent >= 98 else "Medium"
+            )
+    ctx.progress(0.2)
+
+    temp_dirs = [path for path in sorted({tempfile.gettempdir(), "/var/tmp"}) if os.path.isdir(path)]
+    limit = settings.analysis_temp_size_threshold * 1024**3
+    for i, path in enumerate(temp_dirs):
+        size = _tree_size(path, ctx)
+        if size >= limit:
+            findings[("temp", path)] = (
+                "Optimization",
+                f"Temporary directory {path} holds {size / 1024**3:.1f} GB.",
+                "Use the system cleanup utility to remove old temporary files.",
+                "Low"
+            )
+        ctx.progress(0.2 + 0.8 * (i + 1) / len(temp_dirs))
+    ctx.progress(1)
+    return findings
+
+def process_integrity_scan(ctx: JobContext) -> Dict:
+    """Hash changed executables of running processes and compare them with the files on disk"""
+    ctx.progress(0)
+    issues = process_integrity.scan(ProcessService.get_all_processes(), ctx)
+    # The scanner raises the security events; ongoing issues stay findings
+    findings = {}
+    for issue in issues:
+        findings[(issue["kind"], issue["pid"], issue["path"])] = (
+            "Security",
+            issue["description"] + ".",
+            "Restart the process if the binary was upgraded; otherwise check where the change comes from.",
+            # Insights have no critical level
+            "High" if issue["severity"] == "critical" else issue["severity"].capitalize()
+        )
+    return findings
+
+def retention(ctx: JobContext) -> Dict:
+    """Apply the retention policies; the report is kept by the retention manager"""
+    retention_manager.run(ctx)
+    return {}
+
+class AnalysisScheduler:
+    """Run the analysis jobs periodically in a worker pool, off the request path.
+
+    Each job's findings are cached until its interval expires; tick() (called
+    by the lifespan loop, and on reads) resubmits expired jobs and never
+    waits for them. Findings go to the analysis engine, so /ai-analysis
+    always serves the latest completed run while the next one is in
+    progress. A running job can be cancelled; it stops at its next
+    progress report and keeps its previous findings.
+    """
+
+    def __init__(self, jobs: Dict[str, tuple], max_workers: int = 2, engine=analysis_engine):
+        # name -> (function, interval in seconds)
+        self._jobs = jobs
+        self._engine = engine
+        self._max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._states: Dict[str, Dict] = {
+            name: {
+                "name": name,
+                "status": "idle",  # idle, running, succeeded, failed, cancelled
+                "progress": 0.0,
+                "interval": interval,
+                "started_at": None,
+                "finished_at": None,
+                "duration": None,
+                "findings": 0,
+                "error": None,
+                "_last_run_at": None,  # monotonic end of the last run, whatever its outcome
+            }
+            for name, (_, interval) in jobs.items()
+        }
+
+    def tick(self):
+        """Submit every job whose last result expired"""
+        now = time.monotonic()
+        for name, state in self._states.items():
+            last_run = state["_last_run_at"]
+            if state["status"] != "running" and (last_run is None or now - last_run > state["interval"]):
+                self.run(name)
+
+    def run(self, name: str) -> Optional[Dict]:
+        """Start a job now unless it is already running; None for an unknown job"""
+        if name not in self._jobs:
+            return None
+        with self._lock:
+            state = self._states[name]
+            if state["status"] != "running":
+                state.update(status="running", progress=0.0, started_at=datetime.now(),
+                             finished_at=None, duration=None, error=None)
+                self._cancel_events[name] = threading.Event()
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers, thread_name_prefix="analysis-job"
+                    )
+                self._executor.submit(self._run, name, self._cancel_events[name])
+        return self.get(name)
+
+    def cancel(self, name: str) -> bool:
+        """Cancel a running job, return False if it is not running"""
+        with self._lock:
+            event = self._cancel_events.get(name)
+            if event is None or self._states[name]["status"] != "running":
+                return False
+            event.set()
+            return True
+
+    def shutdown(self):
+        """Cancel running jobs and stop the worker pool without waiting"""
+        with self._lock:
+            for event in self._cancel_events.values():
+                event.set()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _run(self, name: str, cancel_event: threading.Event):
+        state = self._states[name]
+        func = self._jobs[name][0]
+        started = time.monotonic()
+        try:
+            findings = func(JobContext(state, cancel_event))
+            self._engine.report(name, findings)
+            state.update(status="succeeded", progress=100.0, findings=len(findings))
+        except JobCancelled:
+            state["status"] = "cancelled"
+        except Exception as e:
+            state.update(status="failed", error=str(e))
+        finally:
+            # Cancelled or failed runs are retried at the next interval, not on every tick
+            state.update(finished_at=datetime.now(), duration=time.monotonic() - started,
+                         _last_run_at=time.monotonic())
+            with self._lock:
+                self._cancel_events.pop(name, None)
+
+    def get(self, name: str) -> Optional[Dict]:
+        state = self._states.get(name)
+        return {k: v for k, v in state.items() if not k.startswith("_")} if state else None
+
+    def list(self) -> List[Dict]:
+        return [self.get(name) for name in self._states]
+
+    def get_status(self, engine_message: str) -> AIAnalysisStatus:
+        """Progress of the current (or last) run of each job"""
+        def progress(name: str) -> float:
+            state = self._states.get(name)
+            return state["progress"] if state else 0.0
+
+        running = [s for s in self._states.values() if s["status"] == "running"]
+        if running:
+            detail = ", ".join(f"{s['name'].replace('_', ' ')} {s['progress']:.0f}%" for s in running)
+            message = f"{engine_message} Running: {detail}."
+        else:
+            now = time.monotonic()
+            pending = [s["interval"] - (now - s["_last_run_at"])
+                       for s in self._states.values() if s["_last_run_at"] is not None]
+            message = engine_message
+            if pending:
+                message += f" Next analysis in {max(min(pending), 0) / 60:.0f} min."
+        return AIAnalysisStatus(
+            system_scan_progress=progress("system_scan"),
+            security_analysis_progress=progress("security_analysis"),
+            performance_check_progress=progress("performance_check"),
+            optimization_scan_progress=progress("optimization_scan"),
+            status_message=message
+        )
+
+# Shared scheduler behind /ai-analysis
+analysis_scheduler = AnalysisScheduler({
+    "system_scan": (system_scan, settings.analysis_system_scan_interval),
+    "security_analysis": (security_analysis, settings.analysis_security_interval),
+    "performance_check": (performance_check, settings.analysis_performance_interval),
+    "optimization_scan": (optimization_scan, settings.analysis_optimization_interval),
+    "process_integrity": (process_integrity_scan, settings.process_integrity_interval),
+    "retention": (retention, settings.retention_interval),
+}, max_workers=settings.analysis_job_workers)
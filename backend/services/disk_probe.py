@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Optional
+import psutil
+from core.config import settings
+
+class DiskProbe:
+    """Run psutil.disk_usage on many mountpoints in parallel with a deadline.
+
+    A probe that misses the deadline is reported as None and keeps running in
+    the pool; the mountpoint is not probed again until that call returns, so a
+    hung NFS mount holds at most one worker.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="disk-probe"
+            )
+        return self._executor
+
+    def _submit(self, mountpoint: str) -> Optional[Future]:
+        with self._lock:
+            if mountpoint in self._pending:
+                # Previous probe still stuck on this mount
+                return None
+            future = self._get_executor().submit(psutil.disk_usage, mountpoint)
+            self._pending[mountpoint] = future
+
+        def _done(_):
+            with self._lock:
+                self._pending.pop(mountpoint, None)
+
+        future.add_done_callback(_done)
+        return future
+
+    def usage(self, mountpoints: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Optional[object]]:
+        """Return {mountpoint: sdiskusage or None} for every requested mountpoint"""
+        if timeout is None:
+            timeout = settings.disk_probe_timeout
+
+        futures = {mp: self._submit(mp) for mp in mountpoints}
+        running = [f for f in futures.values() if f is not None]
+        if running:
+            wait(running, timeout=timeout)
+
+        results: Dict[str, Optional[object]] = {}
+        for mountpoint, future in futures.items():
+            if future is None or not future.done():
+                results[mountpoint] = None
+                continue
+            try:
+                results[mountpoint] = future.result()
+            except (FileNotFoundError, PermissionError, OSError):
+                results[mountpoint] = None
+        return results
+
+    def pending(self) -> int:
+        """Number of probes still running past their deadline"""
+        with self._lock:
+            return len(self._pending)
+
+class DiskIOSampler:
+    """Turn cumulative psutil.disk_io_counters(perdisk=True) into per-disk rates.
+
+    Each call to sample() returns the rates since the previous call; the first
+    call only records a baseline and returns an empty dict.
+    """
+
+    def __init__(self):
+        self._last: Dict[str, object] = {}
+        self._last_time: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def disk_name(device: str) -> str:
+        """Map a partition device (/dev/sda1, /dev/mapper/root) to its diskstats name"""
+        return os.path.basename(os.path.realpath(device))
+
+    def sample(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Return {disk_name: {read_iops, write_iops, read_throughput, ...}}"""
+        try:
+            counters = psutil.disk_io_counters(perdisk=True) or {}
+        except (OSError, RuntimeError):
+            counters = {}
+        now = time.monotonic()
+
+        with self._lock:
+            last, last_time = self._last, self._last_time
+            self._last, self._last_time = counters, now
+
+        if last_time is None or now <= last_time:
+            return {}
+
+        elapsed = now - last_time
+        rates = {}
+        for name, cur in counters.items():
+            prev = last.get(name)
+            if prev is None:
+                continue
+            reads = max(cur.read_count - prev.read_count, 0)
+            writes = max(cur.write_count - prev.write_count, 0)
+            rates[name] = {
+                "read_iops": reads / elapsed,
+                "write_iops": writes / elapsed,
+                "read_throughput": max(cur.read_bytes - prev.read_bytes, 0) / (1024**2) / elapsed,
+                "write_throughput": max(cur.write_bytes - prev.write_bytes, 0) / (1024**2) / elapsed,
+                # read_time/write_time are cumulative milliseconds spent on I/O
+                "read_await": (cur.read_time - prev.read_time) / reads if reads else None,
+                "write_await": (cur.write_time - prev.write_time) / writes if writes else None,
+            }
+        return rates
+
+# Shared instances used by the system and metrics services. disk_io_sampler
+# backs the persisted disk_metrics series only: every sample() moves its
+# baseline, so realtime readers must not call it.
+disk_probe = DiskProbe(max_workers=settings.disk_probe_workers)
+disk_io_sampler = DiskIOSampler()
@@ -0,0 +1,278 @@
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from core.config import settings
+from core.directory_tree import DirectoryTreeExplorer, DirTotals, ScanCache, TreeNode
+
+def _sort_key(node: TreeNode) -> tuple:
+    # Explorer order (directories first, case-insensitive), made total by the raw name
+    return (not node.is_dir, node.name.lower(), node.name)
+
+class DirectoryListingCache:
+    """Keep the sorted listing of recently browsed directories, validated by mtime.
+
+    Paging through a large directory reads it once: later pages only stat the
+    directory and bisect the cached keys. A directory modified within the
+    explorer's mtime margin of the read is not cached, as the mtime resolution
+    could hide a later change.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._explorers = {
+            hidden: DirectoryTreeExplorer(show_hidden=hidden, use_default_excludes=False)
+            for hidden in (False, True)
+        }
+
+    def get(self, path: str, hidden: bool) -> Tuple[List[TreeNode], List[tuple]]:
+        """Return (nodes, sort keys) for one directory level; raises OSError"""
+        mtime_ns = os.stat(path).st_mtime_ns
+        key = (path, hidden)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == mtime_ns:
+                self._entries.move_to_end(key)
+                return cached[1], cached[2]
+
+        read_at_ns = time.time_ns()
+        listing = self._explorers[hidden].list_directory(path)
+        if listing.error is not None:
+            raise listing.error
+        nodes = sorted(listing.nodes, key=_sort_key)
+        keys = [_sort_key(node) for node in nodes]
+
+        if read_at_ns - mtime_ns >= ScanCache.MTIME_MARGIN_NS:
+            with self._lock:
+                self._entries[key] = (mtime_ns, nodes, keys)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return nodes, keys
+
+class DirSizeCache:
+    """Subtree totals (size, file and directory counts) computed in the background.
+
+    A lookup never walks on the request path: a missing entry is queued for a
+    worker and reported as pending, a stale one is returned as is and
+    refreshed. A worker walk stores the totals of every directory it visits,
+    so expanding a subdirectory afterwards is a cache hit, and it reuses the
+    fresh totals of subdirectories already known instead of walking them again.
+
+    Walks do not follow symlinks and stay on the directory's filesystem (like
+    `du -x`), so /proc or network mounts under a browsed root are not summed.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, max_workers: int):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._max_workers = max(1, max_workers)
+        self._max_pending = self._max_workers * 64
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def lookup(self, path: str) -> Optional[DirTotals]:
+        """Return the cached totals of a directory (None if not computed yet)"""
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None:
+                self._entries.move_to_end(path)
+        if cached is None or time.monotonic() - cached[0] > self._ttl:
+            self._submit(path)
+        return cached[1] if cached is not None else None
+
+    def invalidate(self, path: Optional[str] = None):
+        """Forget the totals of a directory (all of them if path is None)"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def _submit(self, path: str):
+        with self._lock:
+            if path in self._pending or len(self._pending) >= self._max_pending:
+                return
+            self._pending.add(path)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="dir-size"
+                )
+            self._executor.submit(self._compute, path)
+
+    def _fresh(self, path: str) -> Optional[DirTotals]:
+        with self._lock:
+            cached = self._entries.get(path)
+        if cached is not None and time.monotonic() - cached[0] <= self._ttl:
+            return cached[1]
+        return None
+
+    def _store(self, path: str, totals: DirTotals):
+        with self._lock:
+            self._entries[path] = (time.monotonic(), totals)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _compute(self, root: str):
+        try:
+            self._walk(root)
+        except Exception as e:
+            print(f"Error computing size of {root}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(root)
+
+    @staticmethod
+    def _open(path: str, device: int) -> list:
+        """Read one directory: [path, totals of its files, subdirectories to visit]"""
+        totals = DirTotals()
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.stat(follow_symlinks=False).st_dev == device:
+                                subdirs.append(entry.path)
+                            continue
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        size = None
+                    totals.add_file(TreeNode(entry.name, entry.path, False, size))
+        except OSError:
+            pass
+        return [path, totals, subdirs]
+
+    def _walk(self, root: str) -> DirTotals:
+        """Post-order walk of root, storing the totals of every directory visited"""
+        device = os.stat(root).st_dev
+        stack = [self._open(root, device)]
+        while True:
+            path, totals, subdirs = stack[-1]
+            if subdirs:
+                child = subdirs.pop()
+                known = self._fresh(child)
+                if known is not None:
+                    totals.add_subtree(known)
+                else:
+                    stack.append(self._open(child, device))
+                continue
+
+            stack.pop()
+            self._store(path, totals)
+            if not stack:
+                return totals
+            stack[-1][1].add_subtree(totals)
+
+# Shared caches behind FileBrowserService
+directory_listings = DirectoryListingCache(settings.file_browser_listing_cache)
+dir_sizes = DirSizeCache(
+    settings.file_browser_size_cache_entries,
+    settings.file_browser_size_ttl,
+    settings.file_browser_size_workers,
+)
+
+class FileBrowserService:
+    @staticmethod
+    def resolve_path(path: Optional[str]) -> str:
+        """Resolve a requested path, which must lie under one of the configured roots.
+
+        Raises PermissionError outside the roots, FileNotFoundError if missing
+        and NotADirectoryError for a file.
+        """
+        roots = [os.path.realpath(root) for root in settings.file_browser_roots]
+        if not roots:
+            raise PermissionError("File browsing is disabled")
+        resolved = os.path.realpath(path or roots[0])
+        if not any(os.path.commonpath([root, resolved]) == root for root in roots):
+            raise PermissionError(f"{path} is outside the browsable roots")
+        if not os.path.exists(resolved):
+            raise FileNotFoundError(f"{path} not found")
+        if not os.path.isdir(resolved):
+            raise NotADirectoryError(f"{path} is not a directory")
+        return resolved
+
+    @staticmethod
+    def encode_cursor(key: tuple) -> str:
+        raw = json.dumps(list(key), separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        """Decode an opaque page cursor; raises ValueError if it is malformed"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            is_file, lower, name = json.loads(raw)
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+        if not isinstance(is_file, bool) or not isinstance(lower, str) or not isinstance(name, str):
+            raise ValueError("Invalid cursor")
+        return (is_file, lower, name)
+
+    @staticmethod
+    def _size_fields(totals: Optional[DirTotals]) -> Dict:
+        if totals is None:
+            return {"size": None, "file_count": None, "dir_count": None, "size_pending": True}
+        return {"size": totals.size, "file_count": totals.files,
+                "dir_count": totals.dirs, "size_pending": False}
+
+    @staticmethod
+    def list_directory(path: Optional[str] = None, cursor: Optional[str] = None,
+                       limit: Optional[int] = None, hidden: bool = False,
+                       sizes: bool = True) -> Dict:
+        """Return one page of a single directory level.
+
+        Entries are ordered directories first, then by case-insensitive name;
+        next_cursor (None on the last page) resumes after the last entry
+        returned, so pages stay consistent while the directory changes.
+        Directory sizes come from the background size cache; symlinks to
+        directories are listed without totals.
+        """
+        directory = FileBrowserService.resolve_path(path)
+        limit = min(limit or settings.file_browser_page_size, settings.file_browser_max_page_size)
+        after = FileBrowserService.decode_cursor(cursor) if cursor else None
+
+        nodes, keys = directory_listings.get(directory, hidden)
+        start = bisect_right(keys, after) if after is not None else 0
+        page = nodes[start:start + limit]
+
+        entries = []
+        for node in page:
+            entry = {"name": node.name, "path": node.path,
+                     "type": "directory" if node.is_dir else "file"}
+            if not node.is_dir or os.path.islink(node.path):
+                # A symlinked directory may point out of the roots: its tree is not summed
+                entry.update(size=node.size, file_count=None, dir_count=None, size_pending=False)
+            elif sizes:
+                entry.update(FileBrowserService._size_fields(dir_sizes.lookup(node.path)))
+            entries.append(entry)
+
+        next_cursor = None
+        if start + limit < len(nodes):
+            next_cursor = FileBrowserService.encode_cursor(keys[start + limit - 1])
+
+        parent = os.path.dirname(directory)
+        roots = [os.path.realpath(root) for root in settings.file_browser_roots]
+        if directory in roots or parent == directory:
+            parent = None
+        result = {
+            "path": directory,
+            "parent": parent,
+            "entries": entries,
+            "total_entries": len(nodes),
+            "next_cursor": next_cursor,
+        }
+        if sizes:
+            result.update(FileBrowserService._size_fields(dir_sizes.lookup(directory)))
+        return result
@@ -0,0 +1,180 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence
+import numpy as np
+from sqlalchemy import Float, func, select, type_coerce
+from sqlalchemy.orm import Session
+from models.system import SystemMetrics
+
+# Columns summarised by /system/metrics/analytics (the network counters are
+# cumulative since boot, percentiles of them would be meaningless)
+ANALYTICS_COLUMNS = ("cpu_usage", "memory_usage", "disk_usage", "cpu_temperature")
+
+PERCENTILES = (50, 90, 95, 99)
+
+def _epoch_column(db: Session):
+    """SQL expression for SystemMetrics.timestamp as seconds since the epoch"""
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(SystemMetrics.timestamp) - 2440587.5) * 86400.0
+    return type_coerce(func.extract("epoch", SystemMetrics.timestamp), Float)
+
+def load_metric_arrays(db: Session, start: datetime, end: datetime,
+                       columns: Sequence[str] = ANALYTICS_COLUMNS) -> Dict[str, np.ndarray]:
+    """Fetch a time range of metrics as one float64 array per column.
+
+    Rows come straight from the DB-API cursor as tuples, no ORM object is
+    built; NULLs become NaN. The result also holds a "timestamp" array (epoch seconds).
+    """
+    query = (
+        select(_epoch_column(db), *(getattr(SystemMetrics, c) for c in columns))
+        .where(SystemMetrics.timestamp >= start, SystemMetrics.timestamp <= end)
+        .order_by(SystemMetrics.timestamp)
+    )
+    # Run the compiled statement on the driver cursor: the only bound values
+    # are the two datetimes, and skipping per-row result processing halves
+    # the fetch time on long ranges
+    sql = str(query.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    # Transpose in Python and convert column by column: handing numpy the list
+    # of rows directly is several times slower than the fetch itself
+    fetched = list(zip(*rows)) or [()] * (len(columns) + 1)
+    names = ("timestamp",) + tuple(columns)
+    return {name: np.array(values, dtype=np.float64) for name, values in zip(names, fetched)}
+
+def linear_trend(t: np.ndarray, y: np.ndarray) -> Optional[tuple]:
+    """Least-squares (slope per second, intercept) of y over t, ignoring NaNs"""
+    mask = ~np.isnan(y)
+    if np.count_nonzero(mask) < 2:
+        return None
+    t, y = t[mask], y[mask]
+    t0 = t[0]
+    dt = t - t0
+    dt_mean, y_mean = dt.mean(), y.mean()
+    var = np.square(dt - dt_mean).sum()
+    if var == 0:
+        return None
+    slope = ((dt - dt_mean) * (y - y_mean)).sum() / var
+    return float(slope), float(y_mean - slope * (dt_mean + t0))
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing moving average over `window` points, skipping NaNs"""
+    valid = ~np.isnan(values)
+    sums = np.cumsum(np.where(valid, values, 0.0))
+    counts = np.cumsum(valid)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+def resample(t: np.ndarray, columns: Dict[str, np.ndarray], start: float, end: float,
+             points: int) -> tuple:
+    """Mean of each column over `points` equal time buckets (NaN for empty buckets)"""
+    width = max((end - start) / points, 1e-9)
+    bucket = np.clip(((t - start) / width).astype(np.int64), 0, points - 1)
+    centers = start + (np.arange(points) + 0.5) * width
+    resampled = {}
+    for name, values in columns.items():
+        valid = ~np.isnan(values)
+        sums = np.bincount(bucket[valid], weights=values[valid], minlength=points)
+        counts = np.bincount(bucket[valid], minlength=points)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            resampled[name] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    return centers, resampled
+
+def _epoch(dt: datetime) -> float:
+    # Stored timestamps are naive UTC (func.now())
+    return dt.replace(tzinfo=timezone.utc).timestamp()
+
+def _from_epoch(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+
+def _none_if_nan(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else value
+
+def _to_list(values: np.ndarray) -> list:
+    return [None if np.isnan(v) else round(float(v), 3) for v in values]
+
+def _summary(t: np.ndarray, values: np.ndarray) -> dict:
+    valid = values[~np.isnan(values)]
+    if valid.size == 0:
+        return {"count": 0}
+    percentiles = np.percentile(valid, PERCENTILES)
+    trend = linear_trend(t, values)
+    return {
+        "count": int(valid.size),
+        "mean": float(valid.mean()),
+        "min": float(valid.min()),
+        "max": float(valid.max()),
+        **{f"p{p}": float(v) for p, v in zip(PERCENTILES, percentiles)},
+        "slope_per_hour": trend[0] * 3600 if trend else None,
+    }
+
+def _correlation(a: np.ndarray, b: np.ndarray) -> Optional[float]:
+    mask = ~(np.isnan(a) | np.isnan(b))
+    if np.count_nonzero(mask) < 2:
+        return None
+    a, b = a[mask], b[mask]
+    if a.std() == 0 or b.std() == 0:
+        return None
+    return _none_if_nan(np.corrcoef(a, b)[0, 1])
+
+def _disk_forecast(t: np.ndarray, usage: np.ndarray) -> Optional[dict]:
+    """Time until the root filesystem reaches 100% at the current linear trend"""
+    trend = linear_trend(t, usage)
+    if trend is None:
+        return None
+    slope, intercept = trend
+    now = float(t[-1])
+    current = slope * now + intercept
+    forecast = {
+        "current_usage": float(usage[~np.isnan(usage)][-1]),
+        "growth_per_hour": slope * 3600,
+        "hours_until_full": None,
+        "full_at": None,
+    }
+    if slope > 0:
+        seconds = max((100.0 - current) / slope, 0.0)
+        forecast["hours_until_full"] = seconds / 3600
+        forecast["full_at"] = _from_epoch(now + seconds)
+    return forecast
+
+def compute_analytics(arrays: Dict[str, np.ndarray], start: datetime, end: datetime,
+                      points: int = 200, window: int = 5) -> dict:
+    """Summaries, resampled series, CPU/memory correlation and disk forecast"""
+    t = arrays["timestamp"]
+    columns = {name: values for name, values in arrays.items() if name != "timestamp"}
+    centers, resampled = resample(t, columns, _epoch(start), _epoch(end), points)
+    result = {
+        "start": start,
+        "end": end,
+        "samples": int(t.size),
+        "summaries": {name: _summary(t, values) for name, values in columns.items()},
+        "timestamps": [_from_epoch(c) for c in centers],
+        "series": {
+            name: {"values": _to_list(values), "moving_average": _to_list(moving_average(values, window))}
+            for name, values in resampled.items()
+        },
+        "cpu_memory_correlation": None,
+        "disk_forecast": None,
+    }
+    if "cpu_usage" in columns and "memory_usage" in columns:
+        result["cpu_memory_correlation"] = _correlation(columns["cpu_usage"], columns["memory_usage"])
+    if "disk_usage" in columns and t.size:
+        result["disk_forecast"] = _disk_forecast(t, columns["disk_usage"])
+    return result
+
+def get_metrics_analytics(db: Session, hours: float, points: int = 200, window: int = 5) -> dict:
+    """Analytics over the last `hours` of stored metrics"""
+    started = time.monotonic()
+    end = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = end - timedelta(hours=hours)
+    arrays = load_metric_arrays(db, start, end)
+    result = compute_analytics(arrays, start, end, points, window)
+    result["duration"] = time.monotonic() - started
+    return result
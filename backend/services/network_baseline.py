@@ -0,0 +1,236 @@
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from api.schemas.system import SecurityEventCreate
+from core.config import settings
+from core.online_stats import EWMA, CountMinSketch, zscore
+
+def _split_addr(addr: str) -> tuple:
+    """("ip", port) from NetworkService's "ip:port" (IPv6 addresses contain colons too)"""
+    ip, _, port = addr.rpartition(":")
+    return ip, int(port) if port.isdigit() else 0
+
+def _is_loopback(ip: str) -> bool:
+    return ip.startswith("127.") or ip in ("::1", "localhost")
+
+def _ephemeral_ports(path: str = "/proc/sys/net/ipv4/ip_local_port_range") -> Tuple[int, int]:
+    """The kernel's range for ports picked on bind(0), Linux's default if unreadable"""
+    try:
+        with open(path) as f:
+            low, high = map(int, f.read().split())
+        return low, high
+    except (OSError, ValueError):
+        return 32768, 60999
+
+class NetworkBaseline:
+    """Learn what normal network activity looks like and flag departures from it.
+
+    Fed with every NetworkService.get_network_connections() snapshot, it keeps:
+    - the set of listening sockets, keyed by process name, protocol, port and
+      whether they are bound to loopback only. Ports of the ephemeral range
+      are picked by the kernel and change on every run (kernels of language
+      servers, unconnected UDP sockets...), so they share one key per process;
+      listeners unseen for `network_baseline_listener_ttl` are forgotten and
+      at most `network_baseline_max_listeners` are kept;
+    - a count-min sketch of (process name, remote host) pairs, so a host
+      never contacted by a process is recognised without storing the hosts;
+    - per process name, an EWMA of the distinct remote hosts per snapshot.
+
+    During the learning period everything is absorbed silently. After it, a
+    listener missing from the set raises a "new_listener" event (once: it
+    joins the baseline), and a process whose fan-out is far above its own
+    baseline raises a "connection_fanout_spike" event, again once until it
+    returns to normal. Every connection costs a few set and sketch
+    operations, independent of how much history has been learned.
+
+    Process names rather than PIDs key the baseline so it survives restarts
+    of the processes; it is saved to `path` (JSON) every `save_interval`.
+    """
+
+    def __init__(self, path: Optional[str] = None, learning: float = 86400.0,
+                 save_interval: float = 300.0, ephemeral_ports: Optional[Tuple[int, int]] = None):
+        self._path = path
+        self._learning = learning
+        self._save_interval = save_interval
+        self._ephemeral = ephemeral_ports or _ephemeral_ports()
+        self._lock = threading.Lock()
+        self._sink: Optional[Callable[[List[SecurityEventCreate]], None]] = None
+        self.started_at: Optional[float] = None
+        # (process name, socket type, port or None if ephemeral, scope) -> last seen
+        self.listeners: Dict[tuple, float] = {}
+        self.endpoints = CountMinSketch(settings.network_baseline_sketch_width,
+                                        settings.network_baseline_sketch_depth)
+        self.fanout: Dict[str, EWMA] = {}
+        self._spiking: set = set()
+        self._saved_at = 0.0
+        self._aged_at = 0.0
+        self.snapshots = 0
+        self.events = 0
+        if path and os.path.exists(path):
+            try:
+                self._load(path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Error loading network baseline {path}: {e}")
+
+    def set_sink(self, sink: Optional[Callable[[List[SecurityEventCreate]], None]]):
+        self._sink = sink
+
+    def learning(self, t: Optional[float] = None) -> bool:
+        t = time.time() if t is None else t
+        return self.started_at is None or t - self.started_at < self._learning
+
+    def observe(self, connections: Iterable[Dict], t: Optional[float] = None) -> List[SecurityEventCreate]:
+        """Compare a connection snapshot with the baseline, then fold it in"""
+        t = time.time() if t is None else t
+        events = []
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = t
+            learning = self.learning(t)
+            # process name -> (distinct remote hosts, hosts never seen before)
+            remote: Dict[str, tuple] = {}
+            for conn in connections:
+                name = conn.get("process_name") or "N/A"
+                if conn.get("remote_addr"):
+                    host = _split_addr(conn["remote_addr"])[0]
+                    hosts, new = remote.setdefault(name, (set(), set()))
+                    if host not in hosts:
+                        hosts.add(host)
+                        key = f"{name}|{host}"
+                        if self.endpoints.estimate(key) == 0:
+                            new.add(host)
+                        self.endpoints.add(key)
+                elif conn.get("status") == "LISTEN" or conn.get("type") == "SOCK_DGRAM":
+                    ip, port = _split_addr(conn.get("local_addr") or "")
+                    scope = "loopback" if _is_loopback(ip) else "network"
+                    ephemeral = self._ephemeral[0] <= port <= self._ephemeral[1]
+                    listener = (name, conn.get("type"), None if ephemeral else port, scope)
+                    if listener not in self.listeners and not learning:
+                        events.append(self._new_listener_event(listener, port, conn.get("pid")))
+                    self.listeners[listener] = t
+            for name, (hosts, new) in remote.items():
+                event = self._check_fanout(name, len(hosts), len(new), t, learning)
+                if event is not None:
+                    events.append(event)
+            # Processes with no remote connection in this snapshot are back to normal
+            self._spiking &= remote.keys()
+            self._prune_listeners(t)
+            self.snapshots += 1
+            self.events += len(events)
+            if self._path and t - self._saved_at >= self._save_interval:
+                self._saved_at = t
+                self._save(self._path)
+        if events and self._sink is not None:
+            try:
+                self._sink(events)
+            except Exception as e:
+                print(f"Error storing security events: {e}")
+        return events
+
+    def _new_listener_event(self, listener: tuple, port: int, pid: Optional[int]) -> SecurityEventCreate:
+        name, sock_type, key_port, scope = listener
+        protocol = "UDP" if sock_type == "SOCK_DGRAM" else "TCP"
+        what = f"new {protocol} port {port}" if key_port is not None else f"{protocol} ephemeral port {port}"
+        where = "on loopback only" if scope == "loopback" else "on the network"
+        return SecurityEventCreate(
+            event_type="new_listener",
+            severity="high" if scope == "network" else "medium",
+            source="network_baseline",
+            description=f"Process '{name}' (PID {pid}) listens on {what} {where}"
+        )
+
+    def _prune_listeners(self, t: float):
+        """Forget listeners unseen for the TTL (checked once per save interval), then cap the set"""
+        ttl = settings.network_baseline_listener_ttl
+        if ttl > 0 and t - self._aged_at >= self._save_interval:
+            self._aged_at = t
+            for listener in [l for l, seen in self.listeners.items() if t - seen > ttl]:
+                del self.listeners[listener]
+        excess = len(self.listeners) - settings.network_baseline_max_listeners
+        if excess > 0:
+            for listener in heapq.nsmallest(excess, self.listeners, key=self.listeners.get):
+                del self.listeners[listener]
+
+    def _check_fanout(self, name: str, hosts: int, new: int, t: float,
+                      learning: bool) -> Optional[SecurityEventCreate]:
+        stats = self.fanout.get(name)
+        if stats is None:
+            stats = self.fanout[name] = EWMA(settings.network_fanout_half_life)
+        event = None
+        if not learning and stats.n >= settings.network_fanout_warmup_samples:
+            score = zscore(hosts, stats.mean, stats.std, settings.network_fanout_min_std)
+            if hosts >= settings.network_fanout_min_hosts and score >= settings.network_fanout_zscore:
+                if name not in self._spiking:
+                    self._spiking.add(name)
+                    event = SecurityEventCreate(
+                        event_type="connection_fanout_spike",
+                        severity="medium",
+                        source="network_baseline",
+                        description=(f"Process '{name}' is connected to {hosts} remote hosts "
+                                     f"({new} never seen before), usually {stats.mean:.0f}")
+                    )
+                # A spike is not folded into the baseline it is measured against
+                return event
+            self._spiking.discard(name)
+        stats.update(hosts, t)
+        return event
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "learning": self.learning(),
+                "started_at": self.started_at,
+                "snapshots": self.snapshots,
+                "events": self.events,
+                "listeners": [
+                    {"process_name": name, "type": sock_type, "port": port, "scope": scope,
+                     "last_seen": seen}
+                    for (name, sock_type, port, scope), seen in sorted(self.listeners.items(), key=str)
+                ],
+                "processes": len(self.fanout),
+                "endpoint_observations": self.endpoints.total,
+                "sketch_fill_ratio": self.endpoints.fill_ratio,
+            }
+
+    # Persistence
+
+    def _save(self, path: str):
+        data = {
+            "started_at": self.started_at,
+            "listeners": [[*listener, seen] for listener, seen in self.listeners.items()],
+            "endpoints": self.endpoints.to_dict(),
+            "fanout": {name: stats.to_dict() for name, stats in self.fanout.items()},
+        }
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Error saving network baseline {path}: {e}")
+
+    def _load(self, path: str):
+        with open(path) as f:
+            data = json.load(f)
+        self.started_at = data["started_at"]
+        self.listeners = {
+            (name, sock_type, port, scope): seen
+            for name, sock_type, port, scope, seen in data["listeners"]
+        }
+        self.endpoints = CountMinSketch.from_dict(data["endpoints"])
+        self.fanout = {name: EWMA.from_dict(stats) for name, stats in data["fanout"].items()}
+
+    def save(self):
+        if self._path:
+            with self._lock:
+                self._save(self._path)
+
+# Shared baseline fed by NetworkService.get_network_connections()
+network_baseline = NetworkBaseline(
+    path=settings.network_baseline_file,
+    learning=settings.network_baseline_learning,
+    save_interval=settings.network_baseline_save_interval
+)
@@ -1,5 +1,7 @@
 import psutil
 from typing import List, Dict, Any
+from services.network_baseline import network_baseline
+from services.security_rules import security_rules
 
 class NetworkService:
     @staticmethod
@@ -53,6 +55,8 @@ class NetworkService:
                 connection_data["process_name"] = "N/A"
             
             connections.append(connection_data)
+        security_rules.observe_connections(connections)
+        network_baseline.observe(connections)
         return connections
 
     @staticmethod
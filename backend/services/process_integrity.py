@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from api.schemas.system import ProcessCreate, SecurityEventCreate
+from core.config import settings
+
+# (device, inode, size, mtime in ns): a file whose identity is unchanged is
+# assumed unchanged, so it is not read again until its verification is due
+Identity = Tuple[int, int, int, int]
+
+def _identity(st: os.stat_result) -> Identity:
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file, read in chunks into one reused buffer"""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+class ProcessIntegrityScanner:
+    """Check that running processes execute the binaries found on disk.
+
+    For each process of a ProcessService snapshot, the image it is running
+    (/proc/<pid>/exe, which stays readable after the file is deleted or
+    replaced) and the file at its executable path are identified by
+    (device, inode, size, mtime). Only identities missing from the cache,
+    or whose last hash is older than the verification interval, are read;
+    hashing runs in a worker pool, one read per identity however many
+    processes share it. Mismatches become issues:
+    - executable_deleted: the path no longer exists;
+    - executable_replaced: the file on disk differs from the running image
+      (typically an upgrade without restart, or a swapped binary);
+    - executable_tampered: a periodic rehash of an unchanged identity gives a
+      different hash, i.e. the content was modified with its size and mtime kept.
+
+    scan() returns the current issues; each issue is sent once to the sink
+    as a security event while it lasts. The cache is saved to `path` (JSON).
+    """
+
+    def __init__(self, path: Optional[str] = None, workers: int = 2, proc_root: str = "/proc"):
+        self._path = path
+        self._workers = max(1, workers)
+        self._proc_root = proc_root
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._sink: Optional[Callable[[List[SecurityEventCreate]], None]] = None
+        # identity -> {"sha256", "hashed_at", "last_seen"}
+        self.cache: Dict[Identity, Dict] = {}
+        # Identities whose content changed behind an unchanged stat
+        self.tampered: Dict[Identity, Tuple[str, str]] = {}
+        self._reported: set = set()
+        self.hashed = 0
+        self.hashed_bytes = 0
+        self.cache_hits = 0
+        self.last_scan: Optional[Dict] = None
+        self.issues: List[Dict] = []
+        if path and os.path.exists(path):
+            try:
+                self._load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading executable hash cache {path}: {e}")
+
+    def set_sink(self, sink: Optional[Callable[[List[SecurityEventCreate]], None]]):
+        self._sink = sink
+
+    def scan(self, processes: Iterable[ProcessCreate], ctx=None) -> List[Dict]:
+        """Hash what changed, compare images with files and return the current issues"""
+        with self._lock:
+            started = time.monotonic()
+            now = time.time()
+            targets = self._targets(processes)
+            # identity -> a path to read it from
+            to_read: Dict[Identity, str] = {}
+            for target in targets:
+                for identity, path in (target["image"], target["disk"]):
+                    if identity is not None and identity not in to_read and self._due(identity, now):
+                        to_read[identity] = path
+            hashes = self._hash_all(to_read, ctx)
+
+            for identity, sha in hashes.items():
+                entry = self.cache.get(identity)
+                if entry is not None and entry["sha256"] != sha:
+                    self.tampered[identity] = (entry["sha256"], sha)
+                self.cache[identity] = {"sha256": sha, "hashed_at": now, "last_seen": now}
+            issues = []
+            for target in targets:
+                for identity, _ in (target["image"], target["disk"]):
+                    if identity in self.cache:
+                        self.cache[identity]["last_seen"] = now
+                issue = self._tampered_issue(target) or self._compare(target)
+                if issue is not None:
+                    issues.append(issue)
+            self._report(issues)
+            self._prune(now)
+            if self._path:
+                self._save(self._path)
+            self.issues = issues
+            self.last_scan = {"at": now, "processes": len(targets), "hashed": len(hashes),
+                              "duration": time.monotonic() - started}
+            return issues
+
+    def _targets(self, processes: Iterable[ProcessCreate]) -> List[Dict]:
+        targets = []
+        for proc in processes:
+            if not proc.exe:
+                continue
+            path = proc.exe[:-len(" (deleted)")] if proc.exe.endswith(" (deleted)") else proc.exe
+            image_path = os.path.join(self._proc_root, str(proc.pid), "exe")
+            image_st = _stat(image_path)
+            disk_st = _stat(path)
+            if image_st is None and disk_st is None:
+                # Exited, or not allowed to look at it
+                continue
+            targets.append({
+                "pid": proc.pid, "name": proc.name, "path": path,
+                "image": (_identity(image_st) if image_st else None, image_path),
+                "disk": (_identity(disk_st) if disk_st else None, path),
+                "deleted": disk_st is None,
+            })
+        return targets
+
+    def _due(self, identity: Identity, now: float) -> bool:
+        entry = self.cache.get(identity)
+        if entry is None:
+            return True
+        if now - entry["hashed_at"] >= settings.process_integrity_verify_interval:
+            return True
+        self.cache_hits += 1
+        return False
+
+    def _hash_all(self, to_read: Dict[Identity, str], ctx) -> Dict[Identity, str]:
+        if not to_read:
+            return {}
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="exe-hash")
+        futures = {self._executor.submit(hash_file, path): identity for identity, path in to_read.items()}
+        hashes = {}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                identity = futures[future]
+                try:
+                    hashes[identity] = future.result()
+                    self.hashed += 1
+                    self.hashed_bytes += identity[2]
+                except OSError:
+                    # Exited or unreadable since it was identified
+                    pass
+                if ctx is not None:
+                    ctx.progress(done, len(futures))
+        finally:
+            # On cancellation, drop what has not started yet
+            for future in futures:
+                future.cancel()
+        return hashes
+
+    def _compare(self, target: Dict) -> Optional[Dict]:
+        image, disk = target["image"][0], target["disk"][0]
+        label = f"Process '{target['name']}' (PID {target['pid']})"
+        if target["deleted"]:
+            return self._issue("executable_deleted", "high", target,
+                               f"{label} runs {target['path']}, which was deleted from disk")
+        if image is None or image == disk:
+            return None
+        image_sha = self.cache.get(image, {}).get("sha256")
+        disk_sha = self.cache.get(disk, {}).get("sha256")
+        if image_sha is None or disk_sha is None or image_sha == disk_sha:
+            # Same content under a new inode (copied back, restored from backup)
+            return None
+        return self._issue("executable_replaced", "medium", target,
+                           f"{label} runs a different binary than {target['path']} on disk "
+                           f"(running {image_sha[:12]}, on disk {disk_sha[:12]})")
+
+    def _tampered_issue(self, target: Dict) -> Optional[Dict]:
+        for identity, _ in (target["image"], target["disk"]):
+            if identity in self.tampered:
+                old, new = self.tampered[identity]
+                return self._issue("executable_tampered", "critical", target,
+                                   f"{target['path']} (run by process '{target['name']}', PID {target['pid']}) "
+                                   f"changed content with unchanged size and mtime ({old[:12]} -> {new[:12]})")
+        return None
+
+    @staticmethod
+    def _issue(kind: str, severity: str, target: Dict, description: str) -> Dict:
+        return {"kind": kind, "severity": severity, "pid": target["pid"], "name": target["name"],
+                "path": target["path"], "description": description,
+                "key": (kind, target["pid"], target["image"][0])}
+
+    def _report(self, issues: List[Dict]):
+        keys = {issue["key"] for issue in issues}
+        events = [
+            SecurityEventCreate(event_type=issue["kind"], severity=issue["severity"],
+                                source="process_integrity", description=issue["description"])
+            for issue in issues if issue["key"] not in self._reported
+        ]
+        self._reported = keys
+        if events and self._sink is not None:
+            try:
+                self._sink(events)
+            except Exception as e:
+                print(f"Error storing security events: {e}")
+
+    def _prune(self, now: float):
+        ttl = settings.process_integrity_cache_ttl
+        for identity in [i for i, entry in self.cache.items() if now - entry["last_seen"] > ttl]:
+            del self.cache[identity]
+            self.tampered.pop(identity, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"cached": len(self.cache), "hashed": self.hashed, "hashed_bytes": self.hashed_bytes,
+                    "cache_hits": self.cache_hits, "last_scan": self.last_scan,
+                    "issues": [{k: v for k, v in issue.items() if k != "key"} for issue in self.issues]}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # Persistence
+
+    def _save(self, path: str):
+        data = [[*identity, entry["sha256"], entry["hashed_at"], entry["last_seen"]]
+                for identity, entry in self.cache.items()]
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Error saving executable hash cache {path}: {e}")
+
+    def _load(self, path: str):
+        with open(path) as f:
+            data = json.load(f)
+        self.cache = {
+            (dev, ino, size, mtime): {"sha256": sha, "hashed_at": hashed_at, "last_seen": last_seen}
+            for dev, ino, size, mtime, sha, hashed_at, last_seen in data
+        }
+
+# Shared scanner run by the analysis scheduler
+process_integrity = ProcessIntegrityScanner(
+    path=settings.process_integrity_cache_file,
+    workers=settings.process_integrity_workers
+)
@@ -3,6 +3,8 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from models.system import Process
 from api.schemas.system import ProcessCreate
+from services.analysis_engine import analysis_engine
+from services.security_rules import security_rules
 
 class ProcessService:
     
@@ -11,7 +13,7 @@ class ProcessService:
         """Get all running processes from system"""
         processes = []
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cpu_percent', 'memory_percent', 'status']):
+            for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cpu_percent', 'memory_percent', 'memory_info', 'status', 'exe']):
                 try:
                     proc_info = proc.info
                     processes.append(ProcessCreate(
@@ -20,12 +22,16 @@ class ProcessService:
                         command=' '.join(proc_info['cmdline']) if proc_info['cmdline'] else None,
                         cpu_usage=proc_info['cpu_percent'],
                         memory_usage=proc_info['memory_percent'],
-                        status=proc_info['status']
+                        memory_rss=proc_info['memory_info'].rss / (1024**2) if proc_info['memory_info'] else None,
+                        status=proc_info['status'],
+                        exe=proc_info['exe'] or None
                     ))
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     continue
         except Exception as e:
             pass
+        analysis_engine.observe_processes(processes)
+        security_rules.observe_processes(processes)
         return processes
     
     @staticmethod
@@ -41,7 +47,7 @@ class ProcessService:
             
             # Add current processes
             for proc_data in current_processes:
-                db_proc = Process(**proc_data.dict())
+                db_proc = Process(**proc_data.dict(exclude={"memory_rss", "exe"}))
                 db.add(db_proc)
             
             db.commit()
@@ -0,0 +1,185 @@
+import datetime
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+from core.config import settings
+from db import engine
+from models.system import DiskMetrics, SecurityEvent, SystemMetrics
+
+def _log_path() -> str:
+    # Same location as the /system/logs endpoint reads
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", settings.log_file))
+
+def _row_dict(row) -> Dict:
+    data = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.name)
+        data[column.name] = value.isoformat() if isinstance(value, datetime.datetime) else value
+    return data
+
+class RetentionManager:
+    """Enforce the retention policies of Settings on the database and the log file.
+
+    Expired rows are deleted (optionally archived first, as gzipped JSON
+    lines) in batches of `retention_batch_size`, each in its own short
+    transaction with a pause in between, so collectors writing metrics and
+    events are never locked out for long. SQLite free pages are then
+    returned to the filesystem a chunk at a time with incremental vacuum.
+
+    run() is meant to be called from a background job; it reports progress
+    and honours cancellation through the job context when given one.
+    """
+
+    def __init__(self, bind=engine):
+        self._bind = bind
+        self._lock = threading.Lock()
+        self.last_report: Optional[Dict] = None
+
+    def policies(self) -> List[Dict]:
+        """(table, model, cutoff, extra filter) for every enabled policy"""
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        policies = []
+        if settings.retention_system_metrics_days > 0:
+            cutoff = now - datetime.timedelta(days=settings.retention_system_metrics_days)
+            # Per-mount rows go first: SQLite does not enforce ON DELETE CASCADE by default
+            policies.append({"table": "disk_metrics", "model": DiskMetrics, "cutoff": cutoff, "where": []})
+            policies.append({"table": "system_metrics", "model": SystemMetrics, "cutoff": cutoff, "where": []})
+        if settings.retention_security_events_days > 0:
+            cutoff = now - datetime.timedelta(days=settings.retention_security_events_days)
+            where = [SecurityEvent.resolved == True] if settings.retention_security_events_resolved_only else []
+            policies.append({"table": "security_events", "model": SecurityEvent, "cutoff": cutoff, "where": where})
+        return policies
+
+    def run(self, ctx=None) -> Dict:
+        """Apply every policy once and return a report of what was removed and reclaimed"""
+        with self._lock:
+            started = time.monotonic()
+            size_before = self._database_size()
+            report = {"started_at": datetime.datetime.now(), "tables": {}, "log": None}
+            policies = self.policies()
+            for i, policy in enumerate(policies):
+                report["tables"][policy["table"]] = self._purge(policy, ctx, i, len(policies) + 1)
+            report["log"] = self._rotate_log()
+            report["vacuumed_pages"] = self._incremental_vacuum(ctx)
+            if ctx is not None:
+                ctx.progress(1)
+            size_after = self._database_size()
+            report.update(
+                database_size=size_after,
+                reclaimed_bytes=max(size_before - size_after, 0) if size_before is not None else None,
+                duration=time.monotonic() - started
+            )
+            self.last_report = report
+            return report
+
+    def _purge(self, policy: Dict, ctx, step: int, steps: int) -> Dict:
+        model = policy["model"]
+        # Opened on the first expired row, so runs with nothing to delete leave no empty files
+        archive = None
+        deleted = 0
+        try:
+            while True:
+                db = Session(self._bind)
+                try:
+                    query = (select(model).where(model.timestamp < policy["cutoff"], *policy["where"])
+                             .order_by(model.id).limit(settings.retention_batch_size))
+                    if not settings.retention_archive_dir:
+                        ids = db.scalars(query.with_only_columns(model.id)).all()
+                    else:
+                        rows = db.scalars(query).all()
+                        if rows and archive is None:
+                            archive = self._open_archive(policy["table"])
+                        for row in rows:
+                            archive.write(json.dumps(_row_dict(row)) + "\n")
+                        ids = [row.id for row in rows]
+                    if ids:
+                        db.execute(delete(model).where(model.id.in_(ids)))
+                        db.commit()
+                finally:
+                    db.close()
+                deleted += len(ids)
+                if ctx is not None:
+                    # The total is not counted up front: creep towards the end of this step
+                    ctx.progress(step + deleted / (deleted + settings.retention_batch_size), steps)
+                if len(ids) < settings.retention_batch_size:
+                    break
+                time.sleep(settings.retention_batch_pause)
+        finally:
+            if archive is not None:
+                archive.close()
+        return {"deleted": deleted, "cutoff": policy["cutoff"], "archived": archive is not None}
+
+    def _open_archive(self, table: str):
+        os.makedirs(settings.retention_archive_dir, exist_ok=True)
+        name = f"{table}-{datetime.datetime.now():%Y%m%d-%H%M%S}.jsonl.gz"
+        return gzip.open(os.path.join(settings.retention_archive_dir, name), "at", encoding="utf-8")
+
+    def _rotate_log(self) -> Optional[Dict]:
+        """Copy-truncate the log file once it exceeds its size limit (its writer may keep it open)"""
+        path = _log_path()
+        limit = settings.retention_log_max_mb * 1024**2
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        if limit <= 0 or size <= limit:
+            return {"size": size, "rotated": False}
+        backups = max(settings.retention_log_backups, 0)
+        for i in range(backups - 1, 0, -1):
+            older = f"{path}.{i}.gz"
+            if os.path.exists(older):
+                os.replace(older, f"{path}.{i + 1}.gz")
+        if backups:
+            with open(path, "rb") as src, gzip.open(f"{path}.1.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        with open(path, "r+b") as f:
+            f.truncate(0)
+        return {"size": size, "rotated": True}
+
+    def _database_size(self) -> Optional[int]:
+        if self._bind.dialect.name != "sqlite":
+            return None
+        with self._bind.connect() as conn:
+            page_size = conn.execute(text("PRAGMA page_size")).scalar()
+            page_count = conn.execute(text("PRAGMA page_count")).scalar()
+        return page_size * page_count
+
+    def _incremental_vacuum(self, ctx) -> int:
+        """Return free pages to the filesystem in chunks, committing between them.
+
+        Needs auto_vacuum=INCREMENTAL; converting an existing database takes
+        one full VACUUM, which holds the write lock throughout, so it is only
+        done when retention_convert_auto_vacuum is set.
+        """
+        if self._bind.dialect.name != "sqlite" or settings.retention_vacuum_pages <= 0:
+            return 0
+        released = 0
+        # PRAGMA incremental_vacuum and VACUUM cannot run inside a transaction
+        with self._bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if conn.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+                if not settings.retention_convert_auto_vacuum:
+                    return 0
+                free = conn.execute(text("PRAGMA freelist_count")).scalar()
+                conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+                conn.execute(text("VACUUM"))
+                return free
+            while True:
+                free = conn.execute(text("PRAGMA freelist_count")).scalar()
+                if not free:
+                    break
+                pages = min(free, settings.retention_vacuum_pages)
+                conn.execute(text(f"PRAGMA incremental_vacuum({int(pages)})"))
+                released += pages
+                if ctx is not None:
+                    ctx.check_cancelled()
+                time.sleep(settings.retention_batch_pause)
+        return released
+
+# Shared instance run by the analysis scheduler
+retention_manager = RetentionManager()
@@ -0,0 +1,109 @@
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+from api.schemas.system import SecurityEventCreate
+
+class SecurityEventQueue:
+    """Store security events raised outside requests in batches.
+
+    Producers (the rules engine, scheduled scans) only enqueue; a single
+    writer thread drains the queue and hands the writer up to `batch_size`
+    events at a time, so a burst costs one transaction per batch instead of
+    a commit per event. The queue is bounded: when the writer falls behind,
+    new events are dropped and counted rather than blocking the collectors.
+    """
+
+    def __init__(self, writer: Callable[[List[SecurityEventCreate]], List[int]],
+                 max_size: int = 10000, batch_size: int = 500, linger: float = 0.2):
+        self._writer = writer
+        self._queue: "queue.Queue[SecurityEventCreate]" = queue.Queue(maxsize=max_size)
+        self._batch_size = batch_size
+        self._linger = linger
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopping = False
+        # Events enqueued but not written yet; put_many() and the writer update it under self._lock
+        self._unfinished = 0
+        self._drained = threading.Condition(self._lock)
+        self.stored = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def put_many(self, events: List[SecurityEventCreate]) -> int:
+        """Enqueue events without blocking, return how many were accepted"""
+        self._ensure_started()
+        with self._lock:
+            # Counted before they are visible to the writer, so flush() cannot miss them
+            self._unfinished += len(events)
+        accepted = 0
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+                accepted += 1
+            except queue.Full:
+                break
+        if accepted < len(events):
+            with self._drained:
+                self.dropped += len(events) - accepted
+                self._unfinished -= len(events) - accepted
+                self._drained.notify_all()
+        return accepted
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event enqueued so far is written; False on timeout"""
+        with self._drained:
+            return self._drained.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Write what is queued and stop the writer thread"""
+        self.flush(timeout)
+        with self._lock:
+            self._stopping = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+        self._stopping = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"queued": self._unfinished, "stored": self.stored,
+                    "dropped": self.dropped, "failed": self.failed}
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="security-events", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> List[SecurityEventCreate]:
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        # Let a burst accumulate briefly so it lands in one transaction
+        deadline = time.monotonic() + self._linger
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopping:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._writer(batch)
+                stored, failed = len(batch), 0
+            except Exception as e:
+                print(f"Error storing {len(batch)} security events: {e}")
+                stored, failed = 0, len(batch)
+            with self._drained:
+                self.stored += stored
+                self.failed += failed
+                self._unfinished -= len(batch)
+                self._drained.notify_all()
@@ -0,0 +1,309 @@
+import json
+import operator
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from api.schemas.system import ProcessCreate, SecurityEventCreate, SystemMetricsCreate
+from core.config import settings
+
+# A record of a stream: (key, label, {field: value}). Keys identify the entity
+# (the system, a mount, a process) so conditions are tracked per entity.
+Record = Tuple[Hashable, str, Dict[str, Optional[float]]]
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+STREAMS = ("metrics", "processes", "connections")
+
+# Declarative rules; settings.security_rules_file may replace them with a
+# JSON list of the same shape. "for" is how long (seconds) the condition must
+# hold before an event is raised, "suppress" how long after an event the
+# same rule and entity stay silent if the condition comes back.
+DEFAULT_RULES = [
+    {
+        "name": "high_cpu_usage", "stream": "metrics", "field": "cpu_usage",
+        "condition": "threshold", "op": ">", "value": 90, "for": 30, "severity": "medium",
+        "description": "CPU usage is unusually high: {value:.1f}% for over {duration}s"
+    },
+    {
+        "name": "high_memory_usage", "stream": "metrics", "field": "memory_usage",
+        "condition": "threshold", "op": ">", "value": 95, "severity": "medium",
+        "description": "Memory usage is critically high: {value:.1f}%"
+    },
+    {
+        "name": "high_disk_usage", "stream": "metrics", "field": "disk_usage",
+        "condition": "threshold", "op": ">", "value": 95, "severity": "medium",
+        "description": "Disk usage is critically high: {value:.1f}%"
+    },
+    {
+        "name": "volume_almost_full", "stream": "metrics", "field": "mount_usage",
+        "condition": "threshold", "op": ">", "value": 95, "severity": "medium",
+        "description": "Volume {label} is {value:.1f}% full"
+    },
+    {
+        "name": "outbound_traffic_surge", "stream": "metrics", "field": "network_out",
+        "condition": "rate", "op": ">", "value": 50, "for": 60, "severity": "high",
+        "description": "Outbound traffic at {value:.1f} MB/s for over {duration}s"
+    },
+    {
+        "name": "process_cpu_runaway", "stream": "processes", "field": "cpu_usage",
+        "condition": "threshold", "op": ">", "value": 95, "for": 300, "severity": "low",
+        "description": "{label} has used {value:.0f}% CPU for over {duration}s"
+    },
+    {
+        "name": "process_memory_surge", "stream": "processes", "field": "memory_rss",
+        "condition": "rate", "op": ">", "value": 10, "for": 120, "severity": "medium",
+        "description": "{label} memory grows by {value:.1f} MB/s for over {duration}s"
+    },
+    {
+        "name": "connection_flood", "stream": "connections", "field": "established",
+        "condition": "threshold", "op": ">", "value": 1000, "severity": "high",
+        "description": "{value:.0f} established network connections"
+    },
+    {
+        "name": "process_connection_fanout", "stream": "connections", "field": "process_remote_hosts",
+        "condition": "threshold", "op": ">", "value": 200, "severity": "medium",
+        "description": "{label} is connected to {value:.0f} distinct remote hosts"
+    },
+]
+
+class Rule:
+    """One declarative rule and its evaluation statistics"""
+
+    __slots__ = ("name", "stream", "field", "condition", "op", "value", "sustain", "suppress",
+                 "event_type", "severity", "description",
+                 "evaluations", "matches", "events", "suppressed", "time_ns", "last_evaluated_at")
+
+    def __init__(self, spec: Dict):
+        if spec.get("stream") not in STREAMS:
+            raise ValueError(f"Rule {spec.get('name')}: unknown stream {spec.get('stream')!r}")
+        if spec.get("condition", "threshold") not in ("threshold", "rate"):
+            raise ValueError(f"Rule {spec.get('name')}: unknown condition {spec.get('condition')!r}")
+        if spec.get("op", ">") not in OPERATORS:
+            raise ValueError(f"Rule {spec.get('name')}: unknown operator {spec.get('op')!r}")
+        self.name = spec["name"]
+        self.stream = spec["stream"]
+        self.field = spec["field"]
+        self.condition = spec.get("condition", "threshold")
+        self.op = OPERATORS[spec.get("op", ">")]
+        self.value = float(spec["value"])
+        self.sustain = float(spec.get("for", 0))
+        self.suppress = float(spec.get("suppress", settings.security_rule_suppress_window))
+        self.event_type = spec.get("event_type", self.name)
+        self.severity = spec.get("severity", "medium")
+        self.description = spec["description"]
+        self.evaluations = self.matches = self.events = self.suppressed = self.time_ns = 0
+        self.last_evaluated_at: Optional[float] = None
+
+    def describe(self, value: float, label: str) -> str:
+        return self.description.format(value=value, threshold=self.value, label=label,
+                                       duration=int(self.sustain))
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "stream": self.stream,
+            "field": self.field,
+            "condition": self.condition,
+            "threshold": self.value,
+            "sustain": self.sustain,
+            "suppress": self.suppress,
+            "severity": self.severity,
+            "evaluations": self.evaluations,
+            "matches": self.matches,
+            "events": self.events,
+            "suppressed": self.suppressed,
+            "total_time_ms": self.time_ns / 1e6,
+            "avg_time_us": self.time_ns / 1e3 / self.evaluations if self.evaluations else 0.0,
+            "last_evaluated_at": self.last_evaluated_at,
+        }
+
+class _ConditionState:
+    __slots__ = ("previous", "since", "active", "last_event", "value", "label")
+
+    def __init__(self):
+        self.previous: Optional[Tuple[float, float]] = None  # (t, raw value) for rates
+        self.since: Optional[float] = None  # when the condition started to hold
+        self.active = False  # an event was raised (or suppressed) for this episode
+        self.last_event: Optional[float] = None
+        self.value = 0.0
+        self.label = ""
+
+def load_rules() -> List[Rule]:
+    specs = DEFAULT_RULES
+    if settings.security_rules_file:
+        with open(settings.security_rules_file, "r", encoding="utf-8") as f:
+            specs = json.load(f)
+    return [Rule(spec) for spec in specs]
+
+class SecurityRulesEngine:
+    """Evaluate the rules continuously against the metrics, process and connection streams.
+
+    Collectors push their snapshots in as they take them; each rule keeps
+    a small state per entity, so evaluation is O(rules x records) per
+    snapshot with no history kept. A condition that holds raises one
+    event once it has lasted the rule's "for" duration, and no more
+    until it clears; an episode starting again within the rule's
+    suppression window after an event is counted but not reported.
+
+    Raised events go to the sink (set by SecurityService to store them).
+    """
+
+    def __init__(self, rules: Optional[List[Rule]] = None, recent_events: int = 1000):
+        self._lock = threading.Lock()
+        self._rules: Dict[str, List[Rule]] = {stream: [] for stream in STREAMS}
+        for rule in load_rules() if rules is None else rules:
+            self._rules[rule.stream].append(rule)
+        # rule name -> entity key -> state
+        self._states: Dict[str, Dict[Hashable, _ConditionState]] = {
+            rule.name: {} for rules in self._rules.values() for rule in rules
+        }
+        self._sink: Optional[Callable[[List[SecurityEventCreate]], None]] = None
+        # Sequence-numbered tail of raised events, for callers waiting on a scan
+        self._recent: deque = deque(maxlen=recent_events)
+        self.sequence = 0
+
+    def set_sink(self, sink: Optional[Callable[[List[SecurityEventCreate]], None]]):
+        self._sink = sink
+
+    # Streams
+
+    def observe_metrics(self, metrics: SystemMetricsCreate, t: Optional[float] = None) -> List[SecurityEventCreate]:
+        if metrics.system_status == "error":
+            return []
+        records: List[Record] = [("system", "system", metrics.dict(exclude={"disks", "system_status"}))]
+        records += [
+            (("mount", d.mountpoint), d.mountpoint, {"mount_usage": d.usage}) for d in metrics.disks
+        ]
+        # Mounts come and go only with per-disk samples, realtime ones have none
+        return self._evaluate("metrics", records, t, prune=False)
+
+    def observe_processes(self, processes: Iterable[ProcessCreate], t: Optional[float] = None) -> List[SecurityEventCreate]:
+        records: List[Record] = [
+            ((p.pid, p.name), f"Process '{p.name}' (PID {p.pid})",
+             {"cpu_usage": p.cpu_usage, "memory_usage": p.memory_usage, "memory_rss": p.memory_rss})
+            for p in processes
+        ]
+        return self._evaluate("processes", records, t, prune=True)
+
+    def observe_connections(self, connections: Iterable[Dict], t: Optional[float] = None) -> List[SecurityEventCreate]:
+        """Aggregate a NetworkService.get_network_connections() snapshot"""
+        established = listening = total = 0
+        per_process: Dict[tuple, Dict] = {}
+        for conn in connections:
+            total += 1
+            if conn["status"] == "ESTABLISHED":
+                established += 1
+            elif conn["status"] == "LISTEN":
+                listening += 1
+            if conn.get("pid") and conn.get("remote_addr"):
+                entry = per_process.setdefault((conn["pid"], conn.get("process_name")), {"count": 0, "hosts": set()})
+                entry["count"] += 1
+                entry["hosts"].add(conn["remote_addr"].rsplit(":", 1)[0])
+        records: List[Record] = [("system", "system", {
+            "connections": total, "established": established, "listening": listening,
+        })]
+        records += [
+            (key, f"Process '{key[1]}' (PID {key[0]})",
+             {"process_connections": entry["count"], "process_remote_hosts": len(entry["hosts"])})
+            for key, entry in per_process.items()
+        ]
+        return self._evaluate("connections", records, t, prune=True)
+
+    # Evaluation
+
+    def _evaluate(self, stream: str, records: List[Record], t: Optional[float], prune: bool) -> List[SecurityEventCreate]:
+        t = time.time() if t is None else t
+        events = []
+        with self._lock:
+            for rule in self._rules[stream]:
+                started = time.perf_counter_ns()
+                seen = set()
+                for key, label, values in records:
+                    value = values.get(rule.field)
+                    if value is None:
+                        continue
+                    seen.add(key)
+                    event = self._check(rule, key, label, float(value), t)
+                    if event is not None:
+                        events.append(event)
+                if prune:
+                    # Entities gone from the snapshot (exited processes): forget them
+                    states = self._states[rule.name]
+                    for key in [k for k in states if k not in seen]:
+                        del states[key]
+                rule.time_ns += time.perf_counter_ns() - started
+                rule.last_evaluated_at = t
+            for event in events:
+                self.sequence += 1
+                self._recent.append((self.sequence, event))
+        if events and self._sink is not None:
+            try:
+                self._sink(events)
+            except Exception as e:
+                print(f"Error storing security events: {e}")
+        return events
+
+    def _check(self, rule: Rule, key: Hashable, label: str, raw: float, t: float) -> Optional[SecurityEventCreate]:
+        states = self._states[rule.name]
+        state = states.get(key)
+        if state is None:
+            state = states[key] = _ConditionState()
+        rule.evaluations += 1
+
+        value = raw
+        if rule.condition == "rate":
+            previous, state.previous = state.previous, (t, raw)
+            if previous is None or t <= previous[0] or raw < previous[1]:
+                # First sample, or the counter was reset: no rate yet
+                return None
+            value = (raw - previous[1]) / (t - previous[0])
+
+        if not rule.op(value, rule.value):
+            state.since = None
+            state.active = False
+            return None
+
+        rule.matches += 1
+        state.value, state.label = value, label
+        if state.since is None:
+            state.since = t
+        if state.active or t - state.since < rule.sustain:
+            return None
+
+        state.active = True
+        if state.last_event is not None and t - state.last_event < rule.suppress:
+            rule.suppressed += 1
+            return None
+        state.last_event = t
+        rule.events += 1
+        return SecurityEventCreate(
+            event_type=rule.event_type,
+            severity=rule.severity,
+            source=f"rule:{rule.name}",
+            description=rule.describe(value, label),
+            ip_address=None
+        )
+
+    # Output
+
+    def events_since(self, sequence: int) -> List[SecurityEventCreate]:
+        """Events raised after the given sequence number (within the recent tail)"""
+        with self._lock:
+            return [event for seq, event in self._recent if seq > sequence]
+
+    def active_conditions(self) -> List[Dict]:
+        """Conditions currently holding past their "for" duration"""
+        rules = {rule.name: rule for stream in self._rules.values() for rule in stream}
+        with self._lock:
+            return [
+                {"rule": rules[name], "key": key, "label": state.label, "value": state.value, "since": state.since}
+                for name, states in self._states.items() for key, state in states.items() if state.active
+            ]
+
+    def stats(self) -> List[Dict]:
+        with self._lock:
+            return [rule.stats() for stream in self._rules.values() for rule in stream]
+
+# Shared engine fed by the system, process and network collectors
+security_rules = SecurityRulesEngine()
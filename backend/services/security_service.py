@@ -1,10 +1,56 @@
-import psutil
-import socket
+import base64
+import binascii
 import datetime
-from typing import List, Optional
+import json
+import operator
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func, insert, tuple_, update
 from sqlalchemy.orm import Session
+from core.config import settings
+from db import SessionLocal
 from models.system import SecurityEvent
 from api.schemas.system import SecurityEventCreate
+from services.network_baseline import network_baseline
+from services.network_service import NetworkService
+from services.process_integrity import process_integrity
+from services.process_service import ProcessService
+from services.security_event_queue import SecurityEventQueue
+from services.security_rules import security_rules
+
+class CountCache:
+    """Keep recent COUNT(*) results per filter set for `ttl` seconds.
+
+    Listing totals are informational: a count a few seconds old is fine and
+    avoids scanning the whole table on every page request.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, loader: Callable[[], int]) -> int:
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and time.monotonic() - cached[0] <= self._ttl:
+            return cached[1]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+security_event_counts = CountCache(settings.security_event_count_ttl)
 
 class SecurityService:
     
@@ -34,24 +80,126 @@ class SecurityService:
         db.refresh(security_event)
         return security_event
     
+    @staticmethod
+    def create_security_events(db: Session, events: List[SecurityEventCreate]) -> List[int]:
+        """Insert many security events in one transaction and return their ids (in order)"""
+        if not events:
+            return []
+        # One explicit timestamp for the batch, in the same stored format as the model default
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        rows = [{"timestamp": now, **event.dict()} for event in events]
+        ids = db.scalars(
+            insert(SecurityEvent).returning(SecurityEvent.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        db.commit()
+        return list(ids)
+    
+    @staticmethod
+    def store_events(events: List[SecurityEventCreate]) -> List[int]:
+        """Bulk insert in a session of its own (writer of the ingestion queue)"""
+        db = SessionLocal()
+        try:
+            return SecurityService.create_security_events(db, events)
+        finally:
+            db.close()
+    
+    @staticmethod
+    def normalize_timestamps(db: Session) -> int:
+        """Rewrite timestamps stored by func.now() ('YYYY-MM-DD HH:MM:SS') with microseconds.
+
+        SQLite compares DateTime columns as strings and SQLAlchemy binds
+        datetimes as 'YYYY-MM-DD HH:MM:SS.ffffff', so a row without the
+        fraction sorts before a bound of the same second: cursors and
+        since/until filters would not match it. Returns the rows rewritten.
+        """
+        if db.get_bind().dialect.name != "sqlite":
+            return 0
+        result = db.execute(
+            update(SecurityEvent)
+            .where(func.length(SecurityEvent.timestamp) == 19)
+            .values(timestamp=func.printf("%s.000000", SecurityEvent.timestamp))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+    
+    @staticmethod
+    def _filter_events(query, filters: Dict):
+        """Apply the equality filters and the [since, until) time range of a listing"""
+        for field in ("severity", "resolved", "event_type", "source", "ip_address"):
+            if filters.get(field) is not None:
+                query = query.filter(getattr(SecurityEvent, field) == filters[field])
+        for field, compare in (("since", operator.ge), ("until", operator.lt)):
+            bound = filters.get(field)
+            if bound is not None:
+                if bound.tzinfo is not None:
+                    # Stored timestamps are naive UTC
+                    bound = bound.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+                query = query.filter(compare(SecurityEvent.timestamp, bound))
+        return query
+    
     @staticmethod
     def get_security_events(
         db: Session,
         skip: int = 0,
         limit: int = 100,
         severity: Optional[str] = None,
-        resolved: Optional[bool] = None
+        resolved: Optional[bool] = None,
+        **filters
     ) -> List[SecurityEvent]:
-        """Get security events with filtering"""
-        query = db.query(SecurityEvent)
-        
-        if severity:
-            query = query.filter(SecurityEvent.severity == severity)
-        
-        if resolved is not None:
-            query = query.filter(SecurityEvent.resolved == resolved)
-        
-        return query.order_by(SecurityEvent.timestamp.desc()).offset(skip).limit(limit).all()
+        """Get security events with filtering (offset pagination)"""
+        filters.update(severity=severity or None, resolved=resolved)
+        query = SecurityService._filter_events(db.query(SecurityEvent), filters)
+        return query.order_by(SecurityEvent.timestamp.desc(), SecurityEvent.id.desc()).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def encode_cursor(event: SecurityEvent) -> str:
+        raw = json.dumps([event.timestamp.isoformat(), event.id], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime.datetime, int]:
+        """Decode an opaque page cursor; raises ValueError if it is malformed"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            timestamp, event_id = json.loads(raw)
+            timestamp = datetime.datetime.fromisoformat(timestamp)
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+        if not isinstance(event_id, int):
+            raise ValueError("Invalid cursor")
+        return timestamp, event_id
+    
+    @staticmethod
+    def get_security_events_page(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        **filters
+    ) -> Dict:
+        """One page of events, newest first, with keyset pagination.
+
+        Pages resume strictly after the (timestamp, id) of the cursor, so deep
+        pages cost the same as the first one (the composite indexes cover each
+        filter followed by timestamp, id) and stay stable while events are
+        added. next_cursor is None on the last page.
+        """
+        query = SecurityService._filter_events(db.query(SecurityEvent), filters)
+        if cursor:
+            timestamp, event_id = SecurityService.decode_cursor(cursor)
+            query = query.filter(tuple_(SecurityEvent.timestamp, SecurityEvent.id) < (timestamp, event_id))
+        events = query.order_by(SecurityEvent.timestamp.desc(), SecurityEvent.id.desc()).limit(limit + 1).all()
+        next_cursor = SecurityService.encode_cursor(events[limit - 1]) if len(events) > limit else None
+        return {"events": events[:limit], "next_cursor": next_cursor}
+    
+    @staticmethod
+    def count_security_events(db: Session, **filters) -> int:
+        """Number of events matching the filters, cached for a few seconds"""
+        key = tuple(sorted((k, v) for k, v in filters.items() if v is not None))
+        return security_event_counts.get(
+            key, lambda: SecurityService._filter_events(db.query(SecurityEvent), filters).count()
+        )
     
     @staticmethod
     def get_security_event_by_id(db: Session, event_id: int) -> Optional[SecurityEvent]:
@@ -69,6 +217,11 @@ class SecurityService:
         db.commit()
         return True
     
+    @staticmethod
+    def count_resolved_events(db: Session) -> int:
+        """Number of security events explicitly marked as resolved"""
+        return db.query(SecurityEvent).filter(SecurityEvent.resolved == True).count()
+    
     @staticmethod
     def delete_security_event(db: Session, event_id: int) -> bool:
         """Delete a security event"""
@@ -92,61 +245,31 @@ class SecurityService:
             SecurityEvent.severity == "high",
             SecurityEvent.resolved == False
         ).count()
-        resolved_events = db.query(SecurityEvent).filter(
-            SecurityEvent.resolved == True
-        ).count()
+        resolved_events = SecurityService.count_resolved_events(db)
         
         return {
             "total_events": total_events,
             "critical_events": critical_events,
             "high_events": high_events,
             "resolved_events": resolved_events,
-            "unresolved_events": total_events - resolved_events
+            "unresolved_events": total_events - resolved_events,
+            "ingestion_queue": security_event_queue.stats()
         }
     
     @staticmethod
-    def scan_for_suspicious_activity(db: Session):
-        """Scan for suspicious system activity"""
+    def scan_for_suspicious_activity(db: Session) -> List[SecurityEventCreate]:
+        """Take a fresh process and connection snapshot through the rules engine.
+
+        Metrics rules follow the scheduled metrics collection. Returns the
+        events raised by this scan; the engine hands them to the ingestion
+        queue, which is flushed before returning. Conditions that are still
+        ongoing were reported when they started and are not raised again.
+        """
+        sequence = security_rules.sequence
         events = []
-        
         try:
-            # Check for unusual CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            if cpu_percent > 90:
-                events.append(SecurityEventCreate(
-                    event_type="high_cpu_usage",
-                    severity="medium",
-                    source="system_monitor",
-                    description=f"CPU usage is unusually high: {cpu_percent}%",
-                    ip_address=None
-                ))
-            
-            # Check for unusual memory usage
-            memory = psutil.virtual_memory()
-            if memory.percent > 95:
-                events.append(SecurityEventCreate(
-                    event_type="high_memory_usage",
-                    severity="medium",
-                    source="system_monitor",
-                    description=f"Memory usage is critically high: {memory.percent}%",
-                    ip_address=None
-                ))
-            
-            # Check for unusual disk usage
-            disk = psutil.disk_usage('/')
-            if disk.percent > 95:
-                events.append(SecurityEventCreate(
-                    event_type="high_disk_usage",
-                    severity="medium",
-                    source="system_monitor",
-                    description=f"Disk usage is critically high: {disk.percent}%",
-                    ip_address=None
-                ))
-            
-            # Check for unusual network activity
-            network = psutil.net_io_counters()
-            # This would need baseline comparison in a real implementation
-            
+            ProcessService.get_all_processes()
+            NetworkService.get_network_connections()
         except Exception as e:
             events.append(SecurityEventCreate(
                 event_type="security_scan_error",
@@ -155,8 +278,24 @@ class SecurityService:
                 description=f"Error during security scan: {str(e)}",
                 ip_address=None
             ))
-        
-        return events
+            security_event_queue.put_many(events)
+        security_event_queue.flush(timeout=10)
+        return security_rules.events_since(sequence) + events
+    
+    @staticmethod
+    def get_rule_stats() -> List[dict]:
+        """Per-rule evaluation counts and cost"""
+        return security_rules.stats()
+    
+    @staticmethod
+    def get_network_baseline() -> dict:
+        """Learned listeners and the state of the connection baseline"""
+        return network_baseline.stats()
+    
+    @staticmethod
+    def get_process_integrity() -> dict:
+        """Executable hash cache statistics and the issues of the last integrity scan"""
+        return process_integrity.stats()
     
     @staticmethod
     def get_security_event_count(db: Session) -> int:
@@ -175,3 +314,13 @@ class SecurityService:
             SecurityEvent.severity == "critical",
             SecurityEvent.resolved == False
         ).count()
+
+# Events raised outside requests (rules engine, scheduled scans) are stored in batches
+security_event_queue = SecurityEventQueue(
+    SecurityService.store_events,
+    max_size=settings.security_event_queue_size,
+    batch_size=settings.security_event_batch_size
+)
+security_rules.set_sink(security_event_queue.put_many)
+network_baseline.set_sink(security_event_queue.put_many)
+process_integrity.set_sink(security_event_queue.put_many)
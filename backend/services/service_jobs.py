@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+from core.config import settings
+from services.service_service import ServiceService
+
+class ServiceJobManager:
+    """Run service control actions in the background and keep their status.
+
+    submit() returns immediately with a job; the action runs as an asyncio
+    task on the event loop and its job is updated in place. Only the most
+    recent `max_jobs` finished jobs are kept.
+
+    Cancelling a job kills the control command (systemctl/sc). On systemd a
+    job already queued by the manager may still complete on its own.
+    """
+
+    def __init__(self, max_jobs: int = 200):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, action: str, service_name: str, timeout: Optional[float] = None) -> Dict:
+        """Start an action in the background and return its job"""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "name": service_name,
+            "action": action,
+            "status": "running",
+            "timeout": timeout or settings.service_action_timeout,
+            "returncode": None,
+            "stdout": "",
+            "stderr": "",
+            "created_at": datetime.now(),
+            "started_at": None,
+            "finished_at": None,
+            "duration": None
+        }
+        self._jobs[job_id] = job
+        self._tasks[job_id] = asyncio.ensure_future(self._run(job))
+        self._prune()
+        return job
+
+    async def _run(self, job: Dict):
+        try:
+            result = await ServiceService.run_action(job["action"], job["name"], job["timeout"])
+            job.update({k: v for k, v in result.items() if k not in ("name", "action")})
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+        except Exception as e:
+            job["status"] = "failed"
+            job["stderr"] += str(e)
+        finally:
+            job["finished_at"] = datetime.now()
+            self._tasks.pop(job["job_id"], None)
+
+    async def wait(self, job_id: str) -> Optional[Dict]:
+        """Wait for a job to finish and return it.
+
+        The task is shielded: if the waiting request goes away, the action
+        keeps running as a normal background job.
+        """
+        task = self._tasks.get(job_id)
+        if task is not None:
+            try:
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+        return self._jobs.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job by id"""
+        return self._jobs.get(job_id)
+
+    def list(self, limit: int = 100) -> List[Dict]:
+        """Most recent jobs first"""
+        return list(reversed(self._jobs.values()))[:limit]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a running job, return False if it is unknown or already finished"""
+        task = self._tasks.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def _prune(self):
+        finished = [job_id for job_id in self._jobs if job_id not in self._tasks]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+            del self._jobs[job_id]
+
+# Shared instance used by the service endpoints
+service_jobs = ServiceJobManager(max_jobs=settings.service_job_history)
@@ -1,9 +1,23 @@
+import os
+import re
+import sys
+import time
+import signal
+import asyncio
 import psutil
 import subprocess
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from models.system import Service
 from api.schemas.system import ServiceCreate
+from core.config import settings
+from services.systemd_backend import systemd_backend
+
+SERVICE_ACTIONS = ("start", "stop", "restart")
+
+# systemd unit names / Windows service names; no leading '-' so a name can never be parsed as an option
+SERVICE_NAME_PATTERN = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.@:\\ +-]{0,254}")
 
 class ServiceService:
     
@@ -28,10 +42,9 @@ class ServiceService:
                         ))
                     except (psutil.NoSuchProcess, psutil.AccessDenied):
                         continue
-            else:
-                # Linux/Unix services - basic implementation
-                # You might want to use systemctl or service commands
-                pass
+            elif sys.platform.startswith('linux'):
+                # systemd units, served from the backend's signal-updated cache
+                services = systemd_backend.list_services()
                 
         except Exception as e:
             pass
@@ -72,47 +85,167 @@ class ServiceService:
         return db.query(Service).filter(Service.name == name).first()
     
     @staticmethod
-    def start_service(service_name: str) -> bool:
+    async def start_service(service_name: str, timeout: Optional[float] = None) -> bool:
         """Start a system service"""
-        try:
-            if hasattr(psutil, 'win_service_iter'):
-                # Windows
-                subprocess.run(['sc', 'start', service_name], check=True)
-            else:
-                # Linux/Unix
-                subprocess.run(['systemctl', 'start', service_name], check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        result = await ServiceService.run_action("start", service_name, timeout)
+        return result["status"] == "succeeded"
     
     @staticmethod
-    def stop_service(service_name: str) -> bool:
+    async def stop_service(service_name: str, timeout: Optional[float] = None) -> bool:
         """Stop a system service"""
-        try:
-            if hasattr(psutil, 'win_service_iter'):
-                # Windows
-                subprocess.run(['sc', 'stop', service_name], check=True)
-            else:
-                # Linux/Unix
-                subprocess.run(['systemctl', 'stop', service_name], check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        result = await ServiceService.run_action("stop", service_name, timeout)
+        return result["status"] == "succeeded"
     
     @staticmethod
-    def restart_service(service_name: str) -> bool:
+    async def restart_service(service_name: str, timeout: Optional[float] = None) -> bool:
         """Restart a system service"""
+        result = await ServiceService.run_action("restart", service_name, timeout)
+        return result["status"] == "succeeded"
+    
+    @staticmethod
+    def validate_service_name(service_name: str):
+        """Reject names that are not plain service names (e.g. '--host=...', '-M ...')"""
+        if not SERVICE_NAME_PATTERN.fullmatch(service_name or ""):
+            raise ValueError(f"Invalid service name: {service_name!r}")
+    
+    @staticmethod
+    def _action_commands(action: str, service_name: str) -> List[List[str]]:
+        """Commands implementing a control action on this platform"""
+        ServiceService.validate_service_name(service_name)
+        if hasattr(psutil, 'win_service_iter'):
+            # Windows has no restart verb
+            if action == "restart":
+                return [['sc', 'stop', service_name], ['sc', 'start', service_name]]
+            return [['sc', action, service_name]]
+        # '--' ends option parsing even if validation is ever loosened
+        return [['systemctl', action, '--', service_name]]
+    
+    @staticmethod
+    async def _exec(command: List[str], timeout: Optional[float]) -> tuple:
+        """Run a command without blocking the event loop, return (returncode, stdout, stderr)"""
         try:
-            if hasattr(psutil, 'win_service_iter'):
-                # Windows
-                subprocess.run(['sc', 'stop', service_name], check=True)
-                subprocess.run(['sc', 'start', service_name], check=True)
-            else:
-                # Linux/Unix
-                subprocess.run(['systemctl', 'restart', service_name], check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+            proc = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                # Own process group so a timeout also kills anything it spawned
+                start_new_session=(os.name == "posix")
+            )
+        except NotImplementedError:
+            # Selector event loops on Windows cannot spawn subprocesses
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, lambda: subprocess.run(
+                command, capture_output=True, timeout=timeout
+            ))
+            return result.returncode, result.stdout, result.stderr
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            try:
+                if os.name == "posix":
+                    os.killpg(proc.pid, signal.SIGKILL)
+                else:
+                    proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+            raise
+        return proc.returncode, stdout, stderr
+    
+    @staticmethod
+    async def run_action(action: str, service_name: str, timeout: Optional[float] = None) -> Dict:
+        """Run start/stop/restart for one service and report output and timing"""
+        if timeout is None:
+            timeout = settings.service_action_timeout
+        result = {
+            "name": service_name,
+            "action": action,
+            "status": "succeeded",
+            "returncode": None,
+            "stdout": "",
+            "stderr": "",
+            "started_at": datetime.now(),
+            "duration": 0.0
+        }
+        start = time.monotonic()
+        try:
+            for command in ServiceService._action_commands(action, service_name):
+                remaining = timeout - (time.monotonic() - start) if timeout else None
+                returncode, stdout, stderr = await ServiceService._exec(command, remaining)
+                result["returncode"] = returncode
+                result["stdout"] += stdout.decode(errors="replace")
+                result["stderr"] += stderr.decode(errors="replace")
+                if returncode != 0:
+                    result["status"] = "failed"
+                    break
+        except (asyncio.TimeoutError, subprocess.TimeoutExpired):
+            result["status"] = "timeout"
+            result["stderr"] += f"Timed out after {timeout}s"
+        except (OSError, ValueError) as e:
+            result["status"] = "failed"
+            result["stderr"] += str(e)
+        result["duration"] = time.monotonic() - start
+        return result
+    
+    @staticmethod
+    def _check_bulk_actions(actions: List[Dict]):
+        """Reject unknown actions, duplicate services, unknown dependencies and cycles"""
+        names = [item["name"] for item in actions]
+        if len(set(names)) != len(names):
+            raise ValueError("Each service may appear only once per bulk request")
+        known = set(names)
+        for item in actions:
+            ServiceService.validate_service_name(item["name"])
+            if item["action"] not in SERVICE_ACTIONS:
+                raise ValueError(f"Unknown action '{item['action']}' for {item['name']}")
+            missing = set(item["depends_on"]) - known
+            if missing:
+                raise ValueError(f"{item['name']} depends on services not in the request: {sorted(missing)}")
+        
+        # Kahn's algorithm: anything left unvisited is part of a cycle
+        pending = {item["name"]: set(item["depends_on"]) for item in actions}
+        ready = [name for name, deps in pending.items() if not deps]
+        while ready:
+            done = ready.pop()
+            del pending[done]
+            for name, deps in pending.items():
+                if done in deps:
+                    deps.discard(done)
+                    if not deps:
+                        ready.append(name)
+        if pending:
+            raise ValueError(f"Dependency cycle between: {sorted(pending)}")
+    
+    @staticmethod
+    async def run_bulk_actions(actions: List[Dict], max_parallel: Optional[int] = None) -> List[Dict]:
+        """Run many service actions concurrently, honouring depends_on ordering.
+        
+        An action starts once all its dependencies succeeded; if one of them
+        did not, the action is skipped. Results come back in request order.
+        """
+        ServiceService._check_bulk_actions(actions)
+        semaphore = asyncio.Semaphore(max_parallel or settings.service_bulk_parallelism)
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        async def run(item: Dict) -> Dict:
+            for dependency in item["depends_on"]:
+                if (await tasks[dependency])["status"] != "succeeded":
+                    return {
+                        "name": item["name"], "action": item["action"], "status": "skipped",
+                        "returncode": None, "stdout": "",
+                        "stderr": f"Dependency {dependency} did not succeed",
+                        "started_at": None, "duration": 0.0
+                    }
+            async with semaphore:
+                return await ServiceService.run_action(item["action"], item["name"])
+        
+        for item in actions:
+            tasks[item["name"]] = asyncio.ensure_future(run(item))
+        try:
+            return list(await asyncio.gather(*tasks.values()))
+        except asyncio.CancelledError:
+            for task in tasks.values():
+                task.cancel()
+            raise
     
     @staticmethod
     def get_service_count(db: Session) -> int:
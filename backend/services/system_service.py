@@ -1,64 +1,134 @@
+import os
 import psutil
 import platform
+import select
+import functools
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from models.system import SystemMetrics
-from api.schemas.system import SystemMetricsCreate, SystemInfo
+from models.system import SystemMetrics, DiskMetrics
+from api.schemas.system import SystemMetricsCreate, DiskMetricsCreate, SystemInfo
+from core.cache import BackgroundRefreshCache
 from core.config import settings
+from services.disk_probe import disk_probe, disk_io_sampler
+from services.analysis_engine import analysis_engine
+from services.security_rules import security_rules
+from services import metrics_analytics
+
+class _MountWatcher:
+    """Detect mount table changes without re-reading it (Linux only).
+
+    The kernel flags /proc/self/mounts with POLLPRI/POLLERR whenever a
+    filesystem is mounted or unmounted. On other platforms changed() is
+    always False and the disk cache only expires through its TTL.
+    """
+
+    def __init__(self, path: str = "/proc/self/mounts"):
+        self._poller = None
+        try:
+            self._file = open(path, "r")
+            self._poller = select.poll()
+            self._poller.register(self._file, select.POLLPRI | select.POLLERR)
+        except (OSError, AttributeError):
+            self._poller = None
+
+    def changed(self) -> bool:
+        if self._poller is None:
+            return False
+        if not self._poller.poll(0):
+            return False
+        # Re-arm the notification by reading the file again
+        self._file.seek(0)
+        self._file.read()
+        return True
+
+_mount_watcher = _MountWatcher()
 
 class SystemService:
     
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_static_info() -> dict:
+        """Facts that do not change while the process runs"""
+        uname = platform.uname()
+        return {
+            "hostname": uname.node,
+            "platform": uname.system,
+            "architecture": uname.machine,
+            "os_version": uname.version,
+            "boot_time": psutil.boot_time(),
+            "cpu_model": platform.processor(),
+            "cpu_cores_physical": psutil.cpu_count(logical=False),
+            "cpu_cores_logical": psutil.cpu_count(logical=True),
+        }
+    
+    @staticmethod
+    def _load_memory_info() -> dict:
+        """Read memory and swap usage"""
+        mem = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        return {
+            "total_memory": round(mem.total / (1024**3), 2),
+            "used_memory": round(mem.used / (1024**3), 2),
+            "available_memory": round(mem.available / (1024**3), 2),
+            "total_swap": round(swap.total / (1024**3), 2),
+            "used_swap": round(swap.used / (1024**3), 2),
+            "free_swap": round(swap.free / (1024**3), 2),
+        }
+    
+    @staticmethod
+    def _load_disk_info() -> List[dict]:
+        """Probe every mounted partition, keeping the last known values of slow mounts"""
+        partitions = psutil.disk_partitions()
+        usages = disk_probe.usage([part.mountpoint for part in partitions])
+        previous = {disk["mountpoint"]: disk for disk in (_disk_cache.value or [])}
+        
+        disks = []
+        for part in partitions:
+            usage = usages.get(part.mountpoint)
+            if usage is None:
+                # Timed out or unreadable: reuse the previous sample if we have one
+                if part.mountpoint in previous:
+                    disks.append(previous[part.mountpoint])
+                continue
+            disks.append({
+                "device": part.device,
+                "mountpoint": part.mountpoint,
+                "fstype": part.fstype,
+                "total_size": round(usage.total / (1024**3), 2),
+                "used_size": round(usage.used / (1024**3), 2),
+                "free_size": round(usage.free / (1024**3), 2),
+                "percent_used": usage.percent
+            })
+        return disks
+    
     @staticmethod
     def get_system_info() -> SystemInfo:
         """Get detailed system information"""
         try:
-            uname = platform.uname()
-            boot_time_timestamp = psutil.boot_time()
-            uptime_seconds = datetime.now().timestamp() - boot_time_timestamp
-            mem = psutil.virtual_memory()
-            swap = psutil.swap_memory()
-            
-            # Disk information
-            disks = []
-            for part in psutil.disk_partitions():
-                try:
-                    usage = psutil.disk_usage(part.mountpoint)
-                    disks.append({
-                        "device": part.device,
-                        "mountpoint": part.mountpoint,
-                        "fstype": part.fstype,
-                        "total_size": round(usage.total / (1024**3), 2),
-                        "used_size": round(usage.used / (1024**3), 2),
-                        "free_size": round(usage.free / (1024**3), 2),
-                        "percent_used": usage.percent
-                    })
-                except (FileNotFoundError, PermissionError):
-                    continue
+            static = SystemService._get_static_info()
+            if _mount_watcher.changed():
+                _disk_cache.invalidate()
+            memory = _memory_cache.get()
+            disks = _disk_cache.get()
+            uptime_seconds = datetime.now().timestamp() - static["boot_time"]
 
             return SystemInfo(
                 # System
-                hostname=uname.node,
-                platform=uname.system,
-                architecture=uname.machine,
-                os_version=uname.version,
-                boot_time=datetime.fromtimestamp(boot_time_timestamp).isoformat(),
+                hostname=static["hostname"],
+                platform=static["platform"],
+                architecture=static["architecture"],
+                os_version=static["os_version"],
+                boot_time=datetime.fromtimestamp(static["boot_time"]).isoformat(),
                 uptime=uptime_seconds,
                 
                 # CPU
-                cpu_model=platform.processor(),
-                cpu_cores_physical=psutil.cpu_count(logical=False),
-                cpu_cores_logical=psutil.cpu_count(logical=True),
+                cpu_model=static["cpu_model"],
+                cpu_cores_physical=static["cpu_cores_physical"],
+                cpu_cores_logical=static["cpu_cores_logical"],
 
-                # Memory
-                total_memory=round(mem.total / (1024**3), 2),
-                used_memory=round(mem.used / (1024**3), 2),
-                available_memory=round(mem.available / (1024**3), 2),
-
-                # Swap
-                total_swap=round(swap.total / (1024**3), 2),
-                used_swap=round(swap.used / (1024**3), 2),
-                free_swap=round(swap.free / (1024**3), 2),
+                # Memory and swap
+                **memory,
 
                 # Disks
                 disks=disks
@@ -76,8 +146,39 @@ class SystemService:
             )
     
     @staticmethod
-    def collect_system_metrics() -> SystemMetricsCreate:
-        """Collect current system metrics"""
+    def collect_disk_metrics() -> List[DiskMetricsCreate]:
+        """Collect usage and I/O rates for every mounted partition"""
+        partitions = psutil.disk_partitions()
+        usages = disk_probe.usage([part.mountpoint for part in partitions])
+        io_rates = disk_io_sampler.sample()
+        
+        disks = []
+        for part in partitions:
+            usage = usages.get(part.mountpoint)
+            if usage is None:
+                # Skip mounts that missed their probe deadline
+                continue
+            rates = io_rates.get(disk_io_sampler.disk_name(part.device), {})
+            disks.append(DiskMetricsCreate(
+                device=part.device,
+                mountpoint=part.mountpoint,
+                fstype=part.fstype,
+                total=usage.total / (1024**3),  # GB
+                used=usage.used / (1024**3),  # GB
+                free=usage.free / (1024**3),  # GB
+                usage=usage.percent,
+                **rates
+            ))
+        return disks
+    
+    @staticmethod
+    def collect_system_metrics(per_disk: bool = True) -> SystemMetricsCreate:
+        """Collect current system metrics.
+
+        per_disk=False skips the per-mount rows and the I/O rate sample: the
+        rates stored in disk_metrics are deltas since the previous stored
+        sample, so only the persisted collection may advance the sampler.
+        """
         try:
             # CPU metrics
             cpu_usage = psutil.cpu_percent(interval=1)
@@ -90,11 +191,21 @@ class SystemService:
             memory_available = memory.available / (1024**3)  # GB
             memory_total = memory.total / (1024**3)  # GB
             
-            # Disk metrics
-            disk = psutil.disk_usage('/')
-            disk_usage = disk.percent
-            disk_available = disk.free / (1024**3)  # GB
-            disk_total = disk.total / (1024**3)  # GB
+            # Disk metrics (root filesystem summary plus one row per mount)
+            disks = SystemService.collect_disk_metrics() if per_disk else []
+            root_path = os.path.abspath(os.sep)
+            root = next((d for d in disks if d.mountpoint == root_path), None)
+            if root is None:
+                # Root may be an overlay/pseudo fs that disk_partitions() skips
+                root_usage = disk_probe.usage([root_path])[root_path]
+                root = DiskMetricsCreate(
+                    device=root_path, mountpoint=root_path,
+                    total=root_usage.total / (1024**3), free=root_usage.free / (1024**3),
+                    usage=root_usage.percent
+                ) if root_usage else None
+            disk_usage = root.usage if root else None
+            disk_available = root.free if root else None
+            disk_total = root.total if root else None
             
             # Network metrics
             network = psutil.net_io_counters()
@@ -118,7 +229,8 @@ class SystemService:
                 network_in=network_in,
                 network_out=network_out,
                 system_status="operational",
-                uptime=uptime_seconds
+                uptime=uptime_seconds,
+                disks=disks
             )
         except Exception as e:
             # Return default metrics in case of error
@@ -130,10 +242,15 @@ class SystemService:
     @staticmethod
     def save_metrics(db: Session, metrics: SystemMetricsCreate) -> SystemMetrics:
         """Save system metrics to database"""
-        db_metrics = SystemMetrics(**metrics.dict())
+        data = metrics.dict(exclude={"disks"})
+        db_metrics = SystemMetrics(**data)
+        db_metrics.disks = [DiskMetrics(**disk.dict()) for disk in metrics.disks]
         db.add(db_metrics)
         db.commit()
         db.refresh(db_metrics)
+        # Baselines and rules follow the persisted collection only (one cadence)
+        if analysis_engine.observe_metrics(metrics):
+            security_rules.observe_metrics(metrics)
         return db_metrics
     
     @staticmethod
@@ -146,6 +263,23 @@ class SystemService:
         """Get system metrics history"""
         return db.query(SystemMetrics).order_by(SystemMetrics.timestamp.desc()).limit(limit).all()
     
+    @staticmethod
+    def get_disk_metrics_history(
+        db: Session,
+        mountpoint: Optional[str] = None,
+        limit: int = 100
+    ) -> List[DiskMetrics]:
+        """Get per-mountpoint disk metrics history"""
+        query = db.query(DiskMetrics)
+        if mountpoint:
+            query = query.filter(DiskMetrics.mountpoint == mountpoint)
+        return query.order_by(DiskMetrics.timestamp.desc(), DiskMetrics.id.desc()).limit(limit).all()
+    
+    @staticmethod
+    def get_metrics_analytics(db: Session, hours: float, points: int = 200, window: int = 5) -> dict:
+        """Vectorized analytics over the last `hours` of stored metrics"""
+        return metrics_analytics.get_metrics_analytics(db, hours, points, window)
+    
     @staticmethod
     def get_system_overview(db: Session):
         """Get comprehensive system overview"""
@@ -180,6 +314,18 @@ class SystemService:
 
     @staticmethod
     def get_realtime_metrics() -> dict:
-        """Collect and return real-time system metrics as a dictionary."""
-        metrics = SystemService.collect_system_metrics()
+        """Collect and return real-time system metrics as a dictionary.
+
+        Blocking (cpu_percent interval, disk probe deadline): async callers
+        must run it in an executor.
+        """
+        metrics = SystemService.collect_system_metrics(per_disk=False)
         return metrics.dict()
+
+# Volatile parts of get_system_info, refreshed in the background once stale
+_memory_cache = BackgroundRefreshCache(
+    SystemService._load_memory_info, settings.system_info_memory_ttl, name="memory-info"
+)
+_disk_cache = BackgroundRefreshCache(
+    SystemService._load_disk_info, settings.system_info_disk_ttl, name="disk-info"
+)
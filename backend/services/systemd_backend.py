@@ -0,0 +1,296 @@
+import os
+import subprocess
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+from api.schemas.system import ServiceCreate
+from core.config import settings
+
+try:
+    from jeepney import DBusAddress, HeaderFields, MatchRule, new_method_call
+    from jeepney.bus_messages import message_bus
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+except ImportError:  # D-Bus support is optional, fall back to systemctl
+    open_dbus_connection = None
+
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+UNIT_INTERFACE = "org.freedesktop.systemd1.Unit"
+UNIT_PATH_PREFIX = "/org/freedesktop/systemd1/unit"
+
+# systemd ActiveState -> status values shared with the Windows backend
+ACTIVE_STATE_STATUS = {
+    "active": "running",
+    "reloading": "running",
+    "inactive": "stopped",
+    "failed": "failed",
+    "activating": "start_pending",
+    "deactivating": "stop_pending",
+}
+
+# systemd UnitFileState -> start_type values shared with the Windows backend
+UNIT_FILE_START_TYPE = {
+    "enabled": "automatic",
+    "enabled-runtime": "automatic",
+    "alias": "automatic",
+    "disabled": "disabled",
+    "masked": "disabled",
+    "masked-runtime": "disabled",
+}
+
+def _unit_to_service(unit: dict) -> ServiceCreate:
+    """Convert a cached unit entry to the schema used by ServiceService"""
+    name = unit["name"]
+    return ServiceCreate(
+        name=name,
+        display_name=name[:-len(".service")] if name.endswith(".service") else name,
+        description=unit.get("description") or "",
+        status=ACTIVE_STATE_STATUS.get(unit.get("active_state"), unit.get("active_state") or "unknown"),
+        start_type=UNIT_FILE_START_TYPE.get(unit.get("unit_file_state"), "manual"),
+        path=unit.get("path") or ""
+    )
+
+class SystemdBackend:
+    """List systemd services with batch queries and keep their state cached.
+
+    With jeepney available, the initial listing is one ListUnits plus one
+    ListUnitFiles call on the systemd manager. A watcher thread then applies
+    PropertiesChanged / UnitNew / UnitRemoved signals to the cache, so later
+    listings never rescan. Without D-Bus, a single batched `systemctl show`
+    is run per listing.
+
+    bus_address accepts "SYSTEM", "SESSION" or a D-Bus address such as
+    "unix:path=/tmp/mock-bus", which lets the backend run against a mock
+    systemd manager.
+    """
+
+    def __init__(self, bus_address: Optional[str] = None, timeout: Optional[float] = None):
+        self.bus_address = bus_address or settings.systemd_bus_address
+        self.timeout = timeout if timeout is not None else settings.systemd_query_timeout
+        self._units: Dict[str, dict] = {}
+        self._paths: Dict[str, str] = {}
+        self._file_states: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._conn = None
+        self._watcher: Optional[threading.Thread] = None
+
+    # Public API
+
+    def list_services(self) -> List[ServiceCreate]:
+        """Return every loaded .service unit"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._snapshot()
+
+        if open_dbus_connection is not None:
+            with self._start_lock:
+                try:
+                    if self._watcher is None or not self._watcher.is_alive():
+                        self._start_watching()
+                    return self._snapshot()
+                except Exception as e:
+                    print(f"systemd D-Bus listing failed, using systemctl: {e}")
+                    self._close()
+
+        return [_unit_to_service(unit) for unit in self._list_units_systemctl()]
+
+    def close(self):
+        """Stop watching signals and drop the cache"""
+        self._close()
+        with self._lock:
+            self._units.clear()
+            self._paths.clear()
+
+    # D-Bus
+
+    def _manager(self):
+        return DBusAddress(SYSTEMD_PATH, bus_name=SYSTEMD_BUS_NAME, interface=MANAGER_INTERFACE)
+
+    def _call(self, address, method: str, signature: Optional[str] = None, body: tuple = ()):
+        msg = new_method_call(address, method, signature, body)
+        return unwrap_msg(self._conn.send_and_get_reply(msg, timeout=self.timeout))
+
+    def _start_watching(self):
+        # A previous watcher may have stopped with its connection still open
+        self._close()
+        self._conn = open_dbus_connection(bus=self.bus_address)
+
+        # Match and buffer signals before listing so no change in between is lost
+        rules = [
+            MatchRule(type="signal", interface="org.freedesktop.DBus.Properties",
+                      member="PropertiesChanged", path_namespace=UNIT_PATH_PREFIX),
+            MatchRule(type="signal", interface=MANAGER_INTERFACE, path=SYSTEMD_PATH),
+        ]
+        signals = deque()
+        for rule in rules:
+            self._conn.filter(rule, queue=signals)
+            unwrap_msg(self._conn.send_and_get_reply(message_bus.AddMatch(rule), timeout=self.timeout))
+        self._call(self._manager(), "Subscribe")
+
+        self._load_unit_files()
+        self._load_units_dbus()
+
+        self._watcher = threading.Thread(
+            target=self._watch, args=(self._conn, signals), name="systemd-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def _load_units_dbus(self):
+        """Fill the cache from a single ListUnits call"""
+        (units,) = self._call(self._manager(), "ListUnits")
+        fresh, paths = {}, {}
+        for name, description, load_state, active_state, sub_state, _following, path, *_job in units:
+            if not name.endswith(".service") or load_state == "not-found":
+                continue
+            fresh[name] = self._make_unit(name, description, active_state, sub_state)
+            paths[path] = name
+        with self._lock:
+            self._units = fresh
+            self._paths = paths
+
+    def _load_unit_files(self):
+        """Fetch enablement state and unit file path of every unit in one call"""
+        (files,) = self._call(self._manager(), "ListUnitFiles")
+        self._file_states = {os.path.basename(path): (path, state) for path, state in files}
+
+    def _make_unit(self, name: str, description: str, active_state: str, sub_state: str) -> dict:
+        file_key = name
+        if file_key not in self._file_states and "@" in name:
+            # Template instance foo@bar.service -> foo@.service
+            file_key = name.split("@", 1)[0] + "@.service"
+        path, unit_file_state = self._file_states.get(file_key, ("", None))
+        return {
+            "name": name,
+            "description": description,
+            "active_state": active_state,
+            "sub_state": sub_state,
+            "unit_file_state": unit_file_state,
+            "path": path,
+        }
+
+    def _watch(self, conn, signals: deque):
+        while True:
+            try:
+                while not signals:
+                    conn.recv_messages()
+            except Exception as e:
+                # Connection lost or closed: list_services() starts a new watcher
+                if self._conn is conn:
+                    print(f"systemd watcher stopped: {e}")
+                return
+            msg = signals.popleft()
+            member = msg.header.fields.get(HeaderFields.member)
+            try:
+                if member == "PropertiesChanged":
+                    self._on_properties_changed(msg)
+                else:
+                    self._on_manager_signal(msg)
+            except Exception as e:
+                # e.g. GetAll on a transient unit that is already gone: skip this signal only
+                print(f"systemd signal {member} ignored: {e}")
+
+    def _on_properties_changed(self, msg):
+        interface, changed, _invalidated = msg.body
+        if interface != UNIT_INTERFACE:
+            return
+        path = msg.header.fields.get(HeaderFields.path)
+        with self._lock:
+            name = self._paths.get(path)
+            unit = self._units.get(name) if name else None
+            if unit is None:
+                return
+            for prop, key in (("ActiveState", "active_state"), ("SubState", "sub_state"),
+                              ("Description", "description")):
+                if prop in changed:
+                    unit[key] = changed[prop][1]
+
+    def _on_manager_signal(self, msg):
+        member = msg.header.fields.get(HeaderFields.member)
+        if member == "UnitNew":
+            name, path = msg.body
+            if name.endswith(".service"):
+                self._add_unit(name, path)
+        elif member == "UnitRemoved":
+            name, path = msg.body
+            with self._lock:
+                self._units.pop(name, None)
+                self._paths.pop(path, None)
+        elif member == "UnitFilesChanged":
+            self._load_unit_files()
+            with self._lock:
+                for unit in self._units.values():
+                    unit.update({k: v for k, v in self._make_unit(
+                        unit["name"], unit["description"], unit["active_state"], unit["sub_state"]
+                    ).items() if k in ("path", "unit_file_state")})
+        elif member == "Reloading" and msg.body == (False,):
+            # daemon-reload finished: unit set may have changed wholesale
+            self._load_unit_files()
+            self._load_units_dbus()
+
+    def _add_unit(self, name: str, path: str):
+        unit_address = DBusAddress(path, bus_name=SYSTEMD_BUS_NAME, interface="org.freedesktop.DBus.Properties")
+        (props,) = self._call(unit_address, "GetAll", "s", (UNIT_INTERFACE,))
+
+        def prop(key):
+            return props[key][1] if key in props else ""
+
+        if prop("LoadState") == "not-found":
+            return
+        unit = self._make_unit(name, prop("Description"), prop("ActiveState"), prop("SubState"))
+        if prop("FragmentPath"):
+            unit["path"] = prop("FragmentPath")
+        if prop("UnitFileState"):
+            unit["unit_file_state"] = prop("UnitFileState")
+        with self._lock:
+            self._units[name] = unit
+            self._paths[path] = name
+
+    def _snapshot(self) -> List[ServiceCreate]:
+        with self._lock:
+            units = [dict(unit) for unit in self._units.values()]
+        return [_unit_to_service(unit) for unit in sorted(units, key=lambda u: u["name"])]
+
+    def _close(self):
+        conn, self._conn = self._conn, None
+        self._watcher = None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    # systemctl fallback
+
+    def _list_units_systemctl(self) -> List[dict]:
+        """List every loaded service with one `systemctl show` invocation"""
+        try:
+            result = subprocess.run(
+                ["systemctl", "show", "--no-pager",
+                 "--property=Id,Description,LoadState,ActiveState,SubState,UnitFileState,FragmentPath",
+                 "*.service"],
+                capture_output=True, text=True, timeout=self.timeout, check=True
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            print(f"Error listing systemd services: {e}")
+            return []
+
+        units = []
+        for block in result.stdout.split("\n\n"):
+            props = dict(line.split("=", 1) for line in block.splitlines() if "=" in line)
+            name = props.get("Id", "")
+            if not name.endswith(".service") or props.get("LoadState") == "not-found":
+                continue
+            units.append({
+                "name": name,
+                "description": props.get("Description", ""),
+                "active_state": props.get("ActiveState"),
+                "sub_state": props.get("SubState"),
+                "unit_file_state": props.get("UnitFileState"),
+                "path": props.get("FragmentPath", ""),
+            })
+        return sorted(units, key=lambda u: u["name"])
+
+# Shared instance used by ServiceService on Linux
+systemd_backend = SystemdBackend()
@@ -0,0 +1,106 @@
+"""Tests for the anomaly detection and forecasts of the analysis engine"""
+
+from api.schemas.system import DiskMetricsCreate, ProcessCreate, SystemMetricsCreate
+from services.analysis_engine import AnalysisEngine
+
+START = 1_700_000_000
+
+def _metrics(var_used):
+    return SystemMetricsCreate(
+        cpu_usage=10.0, memory_usage=40.0, disk_usage=50.0,
+        disk_total=200.0, disk_available=100.0,
+        disks=[DiskMetricsCreate(device="sdb1", mountpoint="/var", used=var_used, free=120.0 - var_used)],
+    )
+
+def _descriptions(engine):
+    return [insight.description for insight in engine.insights()]
+
+def test_disk_full_forecast():
+    engine = AnalysisEngine()
+    for i in range(60):
+        # 2 GB per hour, one sample per minute
+        engine.observe_metrics(_metrics(100.0 + i / 30), t=START + 60 * i)
+    [description] = _descriptions(engine)
+    assert description.startswith("Volume /var will be full in ~9h")
+
+    # Volume cleaned up: usage flat again, the finding clears
+    for i in range(60, 600):
+        engine.observe_metrics(_metrics(60.0), t=START + 60 * i)
+    assert _descriptions(engine) == []
+
+def test_memory_leak_forecast():
+    engine = AnalysisEngine()
+    for i in range(60):
+        engine.observe_processes([
+            ProcessCreate(pid=42, name="leaky", cpu_usage=1.0, memory_rss=200.0 + i),
+            ProcessCreate(pid=43, name="steady", cpu_usage=1.0, memory_rss=300.0 + i % 3),
+        ], t=START + 60 * i)
+    [description] = _descriptions(engine)
+    assert "'leaky' (PID 42) is leaking ~60 MB/h" in description
+
+    # Process exited: its findings go with it
+    engine.observe_processes([], t=START + 3600)
+    assert _descriptions(engine) == []
+
+def test_realtime_samples_do_not_feed_disk_forecasts():
+    engine = AnalysisEngine()
+    for i in range(60):
+        engine.observe_metrics(_metrics(100.0), t=START + 60 * i)
+        # Realtime sample: no per-disk rows, root summary counting reserved blocks
+        engine.observe_metrics(SystemMetricsCreate(
+            cpu_usage=10.0, memory_usage=40.0, disk_usage=55.0,
+            disk_total=200.0, disk_available=90.0 - (i % 2) * 8,
+        ), t=START + 60 * i + 30)
+    assert _descriptions(engine) == []
+    assert set(engine._disks) == {"/var", "/"}
+    assert engine._disks["/"].n == 60
+
+def _cpu_sample(cpu):
+    return SystemMetricsCreate(cpu_usage=cpu, memory_usage=40.0, disk_usage=50.0)
+
+def test_metric_spike_raises_then_clears():
+    engine = AnalysisEngine()
+    for i in range(40):
+        assert engine.observe_metrics(_cpu_sample(20.0 + i % 3), t=START + 60 * i)
+    assert _descriptions(engine) == []
+
+    for i in range(40, 43):
+        engine.observe_metrics(_cpu_sample(95.0), t=START + 60 * i)
+    [insight] = engine.insights()
+    assert insight.description.startswith("CPU usage is abnormally high: 95.00%")
+    assert insight.severity == "High"
+
+    for i in range(43, 50):
+        engine.observe_metrics(_cpu_sample(21.0), t=START + 60 * i)
+    assert _descriptions(engine) == []
+
+def test_samples_closer_than_min_interval_are_ignored():
+    engine = AnalysisEngine()
+    assert engine.observe_metrics(_cpu_sample(20.0), t=START)
+    assert not engine.observe_metrics(_cpu_sample(99.0), t=START + 0.5)
+    assert engine.observe_metrics(_cpu_sample(20.0), t=START + 60)
+    assert engine.samples == 2
+
+def test_process_cpu_spike_raises_then_clears():
+    engine = AnalysisEngine()
+    for i in range(10):
+        engine.observe_processes([ProcessCreate(pid=7, name="worker", cpu_usage=2.0)], t=START + 60 * i)
+    assert _descriptions(engine) == []
+
+    engine.observe_processes([ProcessCreate(pid=7, name="worker", cpu_usage=90.0)], t=START + 600)
+    [description] = _descriptions(engine)
+    assert description.startswith("Process 'worker' (PID 7) has used")
+
+    for i in range(11, 20):
+        engine.observe_processes([ProcessCreate(pid=7, name="worker", cpu_usage=2.0)], t=START + 60 * i)
+    assert _descriptions(engine) == []
+
+def test_cleared_findings_are_not_counted_as_fixed():
+    engine = AnalysisEngine()
+    engine.report("security_scan", {"outbound": ("Security", "Outbound traffic spike", "Check it", "High")})
+    engine.report("security_scan", {})
+    assert _descriptions(engine) == []
+    stats = engine.get_stats()
+    assert stats.insights_generated == 1
+    assert stats.security_issues_fixed is None
+    assert stats.optimizations_applied is None and stats.performance_gain_percentage is None
@@ -0,0 +1,97 @@
+"""Tests for the analysis job scheduler"""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+import psutil
+import pytest
+
+from services.analysis_engine import AnalysisEngine
+from services.analysis_scheduler import AnalysisScheduler, JobContext, _executable_findings
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def _finding(description):
+    return {"disk": ("Optimization", description, "Clean up.", "Low")}
+
+def test_results_are_cached_until_interval_expires():
+    engine = AnalysisEngine()
+    calls = []
+
+    def job(ctx):
+        calls.append(1)
+        ctx.progress(1, 2)
+        return _finding(f"run {len(calls)}")
+
+    scheduler = AnalysisScheduler({"optimization_scan": (job, 3600)}, engine=engine)
+    scheduler.tick()
+    _wait_for(lambda: scheduler.get("optimization_scan")["status"] == "succeeded")
+    scheduler.tick()
+    assert len(calls) == 1
+
+    job_state = scheduler.get("optimization_scan")
+    assert job_state["progress"] == 100.0 and job_state["findings"] == 1
+    [insight] = engine.insights()
+    assert insight.description == "run 1"
+
+    # A forced run updates the finding in place
+    scheduler.run("optimization_scan")
+    _wait_for(lambda: len(calls) == 2 and scheduler.get("optimization_scan")["status"] == "succeeded")
+    assert [(i.id, i.description) for i in engine.insights()] == [(insight.id, "run 2")]
+    scheduler.shutdown()
+
+def test_cancel_keeps_previous_findings():
+    engine = AnalysisEngine()
+    engine.report("security_analysis", _finding("previous"))
+    started, release = threading.Event(), threading.Event()
+
+    def job(ctx):
+        ctx.progress(1, 4)
+        started.set()
+        release.wait(5)
+        ctx.progress(2, 4)
+        return {}
+
+    scheduler = AnalysisScheduler({"security_analysis": (job, 3600)}, engine=engine)
+    scheduler.run("security_analysis")
+    started.wait(5)
+    assert scheduler.get("security_analysis")["progress"] == 25.0
+    assert scheduler.get_status("").security_analysis_progress == 25.0
+    assert scheduler.cancel("security_analysis")
+    release.set()
+    _wait_for(lambda: scheduler.get("security_analysis")["status"] == "cancelled")
+    assert not scheduler.cancel("security_analysis")
+    assert [i.description for i in engine.insights()] == ["previous"]
+
+    # Not resubmitted before its interval
+    scheduler.tick()
+    assert scheduler.get("security_analysis")["status"] == "cancelled"
+    scheduler.shutdown()
+
+def test_unknown_job():
+    scheduler = AnalysisScheduler({}, engine=AnalysisEngine())
+    assert scheduler.run("nope") is None
+    assert scheduler.get("nope") is None
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc")
+def test_deleted_executable_is_reported(tmp_path):
+    exe = tmp_path / "sleepcopy"
+    shutil.copy(shutil.which("sleep"), exe)
+    child = subprocess.Popen([str(exe), "30"])
+    try:
+        _wait_for(lambda: psutil.Process(child.pid).exe() == str(exe))
+        exe.unlink()
+        procs = [p for p in psutil.process_iter(["pid", "name", "exe"]) if p.pid == child.pid]
+        findings = _executable_findings(procs, JobContext({}, threading.Event()))
+    finally:
+        child.kill()
+        child.wait()
+    [(key, finding)] = findings.items()
+    assert key == ("deleted-exe", child.pid) and finding[3] == "High"
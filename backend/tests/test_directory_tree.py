@@ -0,0 +1,201 @@
+"""Tests for the directory tree explorer"""
+
+import fnmatch
+import os
+import time
+
+import pytest
+
+from core.directory_tree import (
+    DirectoryTreeExplorer, DuplicateFinder, ExcludeMatcher, ScanCache, TreeExporter,
+)
+
+@pytest.fixture
+def tree(tmp_path):
+    """A small project tree with excluded, hidden and empty entries"""
+    root = tmp_path / "project"
+    files = {
+        "README.md": 120,
+        "setup.py": 800,
+        "src/app/__init__.py": 0,
+        "src/app/main.py": 4000,
+        "src/app/main.pyc": 3000,
+        "src/app/__pycache__/main.cpython-312.pyc": 3000,
+        "src/app/utils/Strings.PY": 1500,
+        "src/app/utils/deep/deeper/leaf.txt": 10,
+        "src/lib/core.c": 2500,
+        "node_modules/pkg/index.js": 700,
+        "docs/index.md": 300,
+        "docs/_build/index.html": 900,
+        ".hidden/secret": 64,
+        "logs/run.log": 5000,
+    }
+    for relative, size in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+    (root / "empty").mkdir()
+    (root / "src" / "empty").mkdir()
+    for i in range(30):
+        (root / "many" / f"d{i:02}").mkdir(parents=True)
+        (root / "many" / f"d{i:02}" / "f").write_bytes(b"x" * i)
+    return root
+
+def _run(root, **options):
+    explorer = DirectoryTreeExplorer(show_size=True, **options)
+    lines = explorer.generate_tree(root)
+    return lines, explorer.stats, sorted(item[:2] for item in explorer.largest_dirs)
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"max_depth": 2},
+    {"dir_sizes": True, "top_dirs": 3},
+    {"max_depth": 2, "dir_sizes": True, "top_dirs": 3},
+    {"show_hidden": True, "use_default_excludes": False},
+])
+def test_parallel_walk_matches_sequential(tree, options):
+    sequential = _run(tree, jobs=1, **options)
+    assert len(sequential[0]) > 10
+    for jobs in (2, 8):
+        assert _run(tree, jobs=jobs, **options) == sequential
+
+PATTERNS = DirectoryTreeExplorer.DEFAULT_EXCLUDE_PATTERNS + [
+    "[ab]*.c", "test_?.py", "Foo*Bar", "*.tar.gz", "data[0-9]", "[!x]y",
+]
+
+NAMES = [
+    "main.py", "main.pyc", "MAIN.PYC", "__pycache__", "node_modules", "node_modules2",
+    "venv", "myvenv", ".git", ".gitignore", ".env", "env", "backup~", "a.c", "b1.c", "c.c",
+    "test_1.py", "test_10.py", "FooBar", "Foo-x-Bar", "foobar", "x.tar.gz", "x.gz",
+    "data1", "data10", "ay", "xy", "_build", "docs", "site", "coverage", "Thumbs.db",
+    "notes.txt", "bin", "binary", "a.log", "log", ".hidden", "[ab].c",
+]
+
+@pytest.mark.parametrize("show_hidden", [False, True])
+def test_exclude_matcher_agrees_with_fnmatch(show_hidden):
+    matcher = ExcludeMatcher(PATTERNS, show_hidden)
+
+    def legacy(name):
+        if not show_hidden and name.startswith('.'):
+            return True
+        return any(fnmatch.fnmatch(name, pattern) for pattern in PATTERNS)
+
+    for name in NAMES:
+        # The second call is answered from the matcher's cache
+        assert matcher.matches_name(name) == legacy(name), name
+        assert matcher.matches(name, os.path.join("/srv", name)) == legacy(name), name
+
+def test_exclude_matcher_path_patterns():
+    matcher = ExcludeMatcher(["docs/_build"], show_hidden=True)
+    assert matcher.matches("_build", "/srv/project/docs/_build")
+    assert not matcher.matches("_build", "/srv/project/_build")
+    assert not matcher.matches("docs", "/srv/project/docs")
+
+def _age(root, seconds=60):
+    """Move every directory's mtime out of the cache's safety margin"""
+    past = time.time() - seconds
+    for path, _, _ in os.walk(root):
+        os.utime(path, (past, past))
+
+def _cached_walk(root, cache_file):
+    cache = ScanCache(str(cache_file))
+    explorer = DirectoryTreeExplorer(jobs=1, scan_cache=cache)
+    lines = explorer.generate_tree(root)
+    cache.close()
+    return lines, explorer.stats, (cache.hits, cache.misses)
+
+def test_scan_cache_hit_on_unchanged_mtime(tree, tmp_path):
+    _age(tree)
+    cache_file = tmp_path / "cache.sqlite3"
+    lines, stats, counts = _cached_walk(tree, cache_file)
+    dirs = counts[1]
+    assert counts == (0, dirs) and dirs > 10
+
+    assert _cached_walk(tree, cache_file) == (lines, stats, (dirs, 0))
+    assert (lines, stats) == _run(tree)[:2]
+
+def test_scan_cache_invalidated_by_added_and_removed_children(tree, tmp_path):
+    _age(tree)
+    cache_file = tmp_path / "cache.sqlite3"
+    _cached_walk(tree, cache_file)
+
+    (tree / "src" / "lib" / "new.c").write_bytes(b"x" * 42)
+    (tree / "docs" / "index.md").unlink()
+    for changed in (tree / "src" / "lib", tree / "docs"):
+        os.utime(changed, (time.time() - 30,) * 2)
+    lines, stats, (hits, misses) = _cached_walk(tree, cache_file)
+
+    assert misses == 2
+    assert any("new.c" in line for line in lines)
+    assert not any("index.md" in line for line in lines)
+    assert (lines, stats) == _run(tree)[:2]
+    # The changed directories were cached again
+    assert _cached_walk(tree, cache_file)[2] == (hits + misses, 0)
+
+def test_scan_cache_not_trusted_within_mtime_margin(tree, tmp_path):
+    cache_file = tmp_path / "cache.sqlite3"
+    _cached_walk(tree, cache_file)
+    # Just-modified directories were not stored: they are read again
+    assert _cached_walk(tree, cache_file)[2][0] == 0
+
+@pytest.mark.parametrize("content", [None, b"not a database" * 100, b""])
+def test_scan_cache_rebuilt_from_missing_or_corrupt_file(tree, tmp_path, content):
+    _age(tree)
+    cache_file = tmp_path / "nested" / "cache.sqlite3"
+    if content is not None:
+        cache_file.parent.mkdir()
+        cache_file.write_bytes(content)
+
+    lines, stats, (hits, misses) = _cached_walk(tree, cache_file)
+    assert hits == 0 and (lines, stats) == _run(tree)[:2]
+    assert _cached_walk(tree, cache_file) == (lines, stats, (misses, 0))
+
+def _find_duplicates(root):
+    explorer = DirectoryTreeExplorer(show_hidden=True, use_default_excludes=False)
+    finder = DuplicateFinder(explorer, jobs=2)
+    groups = finder.find(root)
+    return [(size, sorted(os.path.relpath(path, root) for path in paths)) for size, paths in groups], finder
+
+def test_duplicate_stages(tmp_path):
+    edge = DuplicateFinder.EDGE_SIZE
+    size = 4 * edge
+    body = bytearray(os.urandom(size))
+    (tmp_path / "original").write_bytes(body)
+    (tmp_path / "copy").write_bytes(body)
+    # Same size, different first bytes: dropped by the edge hash
+    (tmp_path / "edges").write_bytes(b"#" + body[1:])
+    # Same edges, one byte different in the middle: dropped by the full hash
+    middle = bytearray(body)
+    middle[size // 2] ^= 0xFF
+    (tmp_path / "middle").write_bytes(middle)
+    # Small files are compared whole by the edge hash
+    (tmp_path / "small1").write_bytes(b"abc")
+    (tmp_path / "small2").write_bytes(b"abc")
+    (tmp_path / "small3").write_bytes(b"abd")
+
+    groups, finder = _find_duplicates(tmp_path)
+
+    assert groups == [(size, ["copy", "original"]), (3, ["small1", "small2"])]
+    assert finder.stage_files == {"size": 7, "edges": 5, "full": 3}
+    assert finder.errors == 0
+
+def test_duplicate_hardlinks_and_empty_files(tmp_path):
+    (tmp_path / "a").write_bytes(b"data" * 100)
+    os.link(tmp_path / "a", tmp_path / "a-link")
+    for i in range(3):
+        (tmp_path / f"empty{i}").write_bytes(b"")
+
+    # Hardlinks free nothing, empty files hold nothing: no duplicates
+    assert _find_duplicates(tmp_path)[0] == []
+
+    (tmp_path / "b").write_bytes(b"data" * 100)
+    [(size, paths)] = _find_duplicates(tmp_path)[0]
+    assert size == 400 and len(paths) == 2 and "b" in paths
+
+def test_exporter_without_feed_fails_at_construction(tmp_path):
+    class Incomplete(TreeExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(DirectoryTreeExplorer(), tmp_path, str(tmp_path / "out.txt"))
+    assert not (tmp_path / "out.txt").exists()
@@ -0,0 +1,152 @@
+"""Tests for the file browser: confinement to its roots, paging and directory sizes"""
+
+import os
+import time
+
+import pytest
+
+from core.config import settings
+from core.directory_tree import DirTotals
+from services import file_browser_service
+from services.file_browser_service import DirSizeCache, FileBrowserService
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    (tmp_path / "data" / "sub").mkdir(parents=True)
+    (tmp_path / "data2").mkdir()
+    (tmp_path / "data" / "file.txt").write_text("x")
+    (tmp_path / "data" / "escape").symlink_to(tmp_path / "data2")
+    (tmp_path / "data" / "inside").symlink_to(tmp_path / "data" / "sub")
+    monkeypatch.setattr(settings, "file_browser_roots", [str(tmp_path / "data")])
+    return tmp_path
+
+def test_disabled_without_roots(monkeypatch):
+    monkeypatch.setattr(settings, "file_browser_roots", [])
+    with pytest.raises(PermissionError, match="disabled"):
+        FileBrowserService.resolve_path("/")
+
+def test_paths_inside_the_root(tree):
+    data = os.path.realpath(tree / "data")
+    assert FileBrowserService.resolve_path(None) == data
+    assert FileBrowserService.resolve_path(str(tree / "data" / "sub")) == os.path.join(data, "sub")
+    assert FileBrowserService.resolve_path(str(tree / "data" / "inside")) == os.path.join(data, "sub")
+    assert FileBrowserService.resolve_path(str(tree / "data" / "sub" / "..")) == data
+
+@pytest.mark.parametrize("relative", [
+    "data/..",  # parent of the root
+    "data/sub/../../data2",  # .. out of the root
+    "data2",  # sibling sharing the root's prefix
+    "data/escape",  # symlink out of the root
+])
+def test_paths_outside_the_root(tree, relative):
+    with pytest.raises(PermissionError):
+        FileBrowserService.resolve_path(str(tree / relative))
+
+def test_missing_and_file_paths(tree):
+    with pytest.raises(FileNotFoundError):
+        FileBrowserService.resolve_path(str(tree / "data" / "missing"))
+    with pytest.raises(NotADirectoryError):
+        FileBrowserService.resolve_path(str(tree / "data" / "file.txt"))
+
+@pytest.fixture
+def sizes(monkeypatch):
+    """A fresh size cache whose background walks are recorded instead of run"""
+    cache = DirSizeCache(max_entries=100, ttl=60, max_workers=1)
+    cache.submitted = []
+    monkeypatch.setattr(cache, "_submit", cache.submitted.append)
+    monkeypatch.setattr(file_browser_service, "dir_sizes", cache)
+    return cache
+
+def test_symlinked_directory_is_not_sized(tree, sizes):
+    (tree / "data2" / "secret").write_bytes(b"s" * 12345)
+    listing = FileBrowserService.list_directory(str(tree / "data"))
+    entries = {entry["name"]: entry for entry in listing["entries"]}
+
+    assert entries["escape"] == {"name": "escape", "path": str(tree / "data" / "escape"),
+                                 "type": "directory", "size": None, "file_count": None,
+                                 "dir_count": None, "size_pending": False}
+    assert entries["sub"]["size_pending"] is True
+    assert sorted(sizes.submitted) == [os.path.realpath(tree / "data"),
+                                       str(tree / "data" / "sub")]
+
+def test_cursor_paging(tree):
+    data = tree / "data"
+    for name in ("b.txt", "A.txt", "c.txt"):
+        (data / name).write_text("x")
+    (data / "Dir").mkdir()
+    expected = ["Dir", "escape", "inside", "sub", "A.txt", "b.txt", "c.txt", "file.txt"]
+
+    names, cursor, pages = [], None, 0
+    while True:
+        page = FileBrowserService.list_directory(str(data), cursor=cursor, limit=3, sizes=False)
+        assert page["total_entries"] == len(expected)
+        names += [entry["name"] for entry in page["entries"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        if pages == 1:
+            # An entry added before the cursor does not shift the next pages,
+            # one added after it shows up in them
+            (data / "0dir").mkdir()
+            (data / "B2.txt").write_text("x")
+            expected.insert(expected.index("c.txt"), "B2.txt")
+            expected.insert(0, "0dir")
+    assert pages == 3
+    assert names == expected[1:]
+
+    with pytest.raises(ValueError):
+        FileBrowserService.list_directory(str(data), cursor="not a cursor")
+
+@pytest.fixture
+def sized_tree(tmp_path):
+    (tmp_path / "root" / "sub" / "deep").mkdir(parents=True)
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "root" / "a").write_bytes(b"a" * 10)
+    (tmp_path / "root" / "sub" / "b").write_bytes(b"b" * 20)
+    (tmp_path / "root" / "sub" / "deep" / "c").write_bytes(b"c" * 30)
+    (tmp_path / "outside" / "big").write_bytes(b"x" * 12345)
+    return tmp_path
+
+def test_dir_size_walk_stores_every_directory(sized_tree):
+    cache = DirSizeCache(max_entries=100, ttl=60, max_workers=1)
+    root = str(sized_tree / "root")
+
+    totals = cache._walk(root)
+
+    assert (totals.size, totals.files, totals.dirs) == (60, 3, 2)
+    assert totals.largest_path == os.path.join(root, "sub", "deep", "c")
+    sub = cache.lookup(os.path.join(root, "sub"))
+    assert (sub.size, sub.files, sub.dirs) == (50, 2, 1)
+
+def test_dir_size_walk_does_not_follow_symlinks(sized_tree):
+    cache = DirSizeCache(max_entries=100, ttl=60, max_workers=1)
+    (sized_tree / "root" / "link").symlink_to(sized_tree / "outside")
+
+    totals = cache._walk(str(sized_tree / "root"))
+
+    # The link itself is counted as a file, not the tree it points to
+    assert totals.files == 4 and totals.dirs == 2 and totals.size < 12345
+
+def test_dir_size_walk_reuses_fresh_subtrees(sized_tree):
+    cache = DirSizeCache(max_entries=100, ttl=60, max_workers=1)
+    known = DirTotals()
+    known.size, known.files = 1000, 7
+    cache._store(str(sized_tree / "root" / "sub"), known)
+
+    totals = cache._walk(str(sized_tree / "root"))
+
+    assert (totals.size, totals.files, totals.dirs) == (1010, 8, 1)
+
+def test_dir_size_lookup_computes_in_background(sized_tree):
+    cache = DirSizeCache(max_entries=100, ttl=60, max_workers=1)
+    root = str(sized_tree / "root")
+
+    assert cache.lookup(root) is None
+    deadline = time.monotonic() + 5
+    while (totals := cache.lookup(root)) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert totals is not None and totals.size == 60
+
+    cache.invalidate(root)
+    assert cache._fresh(root) is None
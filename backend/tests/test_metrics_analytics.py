@@ -0,0 +1,71 @@
+"""Tests for the vectorized metrics analytics"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db import Base
+from models.system import SystemMetrics
+from services import metrics_analytics
+from services.metrics_analytics import linear_trend, load_metric_arrays, moving_average
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def _fill(db, end, count=120):
+    # One sample per minute, disk growing by 1% per hour, CPU following memory
+    for i in range(count):
+        db.add(SystemMetrics(
+            timestamp=end - timedelta(minutes=count - 1 - i),
+            cpu_usage=10.0 + i % 10,
+            memory_usage=40.0 + 2 * (i % 10),
+            disk_usage=50.0 + i / 60,
+            cpu_temperature=None if i % 2 else 45.0,
+        ))
+    db.commit()
+
+def test_load_metric_arrays_reads_columns(db):
+    end = datetime(2024, 1, 1, 12, 0)
+    _fill(db, end)
+    arrays = load_metric_arrays(db, end - timedelta(hours=1), end)
+    assert arrays["timestamp"].size == 61
+    assert np.all(np.diff(arrays["timestamp"]) == pytest.approx(60.0))
+    assert np.isnan(arrays["cpu_temperature"]).sum() == 31
+
+def test_empty_range(db):
+    end = datetime(2024, 1, 1)
+    arrays = load_metric_arrays(db, end - timedelta(hours=1), end)
+    result = metrics_analytics.compute_analytics(arrays, end - timedelta(hours=1), end, points=10)
+    assert result["samples"] == 0
+    assert result["summaries"]["cpu_usage"] == {"count": 0}
+    assert result["series"]["cpu_usage"]["values"] == [None] * 10
+    assert result["disk_forecast"] is None
+
+def test_compute_analytics(db):
+    end = datetime(2024, 1, 1, 12, 0)
+    _fill(db, end)
+    start = end - timedelta(hours=2)
+    result = metrics_analytics.compute_analytics(load_metric_arrays(db, start, end), start, end, points=24)
+    cpu = result["summaries"]["cpu_usage"]
+    assert cpu["count"] == 120
+    assert cpu["min"] == 10.0 and cpu["max"] == 19.0
+    assert result["cpu_memory_correlation"] == pytest.approx(1.0)
+    forecast = result["disk_forecast"]
+    assert forecast["growth_per_hour"] == pytest.approx(1.0)
+    assert forecast["hours_until_full"] == pytest.approx(48.0, rel=0.01)
+    assert len(result["timestamps"]) == len(result["series"]["disk_usage"]["values"]) == 24
+
+def test_linear_trend_and_moving_average():
+    t = np.arange(10, dtype=float)
+    y = 2 * t + 1
+    y[3] = np.nan
+    assert linear_trend(t, y) == pytest.approx((2.0, 1.0))
+    assert moving_average(np.array([1.0, np.nan, 3.0, 5.0]), 2).tolist() == [1.0, 1.0, 3.0, 4.0]
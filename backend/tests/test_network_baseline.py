@@ -0,0 +1,90 @@
+"""Tests for the learned network baseline"""
+
+import random
+
+from core.config import settings
+from services.network_baseline import NetworkBaseline
+
+def _listen(name, port, ip="0.0.0.0"):
+    return {"process_name": name, "pid": 10, "type": "SOCK_STREAM", "status": "LISTEN",
+            "local_addr": f"{ip}:{port}", "remote_addr": ""}
+
+def _conn(name, host):
+    return {"process_name": name, "pid": 20, "type": "SOCK_STREAM", "status": "ESTABLISHED",
+            "local_addr": "10.0.0.2:40000", "remote_addr": f"{host}:443"}
+
+def test_new_listener_flagged_once_after_learning():
+    baseline = NetworkBaseline(learning=100)
+    assert baseline.observe([_listen("sshd", 22)], t=0) == []
+    assert baseline.observe([_listen("sshd", 22), _listen("redis", 6379, "127.0.0.1")], t=50) == []
+
+    [event] = baseline.observe([_listen("sshd", 22), _listen("nc", 4444)], t=200)
+    assert event.event_type == "new_listener" and event.severity == "high"
+    assert "'nc'" in event.description and "4444" in event.description
+    assert baseline.observe([_listen("sshd", 22), _listen("nc", 4444)], t=210) == []
+
+    [event] = baseline.observe([_listen("redis", 6380, "::1")], t=220)
+    assert event.severity == "medium" and "loopback" in event.description
+
+def test_fanout_spike_against_process_baseline():
+    baseline = NetworkBaseline(learning=0)
+    sink = []
+    baseline.set_sink(sink.extend)
+    for t in range(30):
+        assert baseline.observe([_conn("browser", f"1.1.1.{i}") for i in range(5)], t=t) == []
+
+    spike = [_conn("browser", f"10.{i // 250}.0.{i % 250}") for i in range(300)]
+    [event] = baseline.observe(spike, t=30)
+    assert event.event_type == "connection_fanout_spike"
+    assert "300 remote hosts (300 never seen before)" in event.description
+    # Reported once while it lasts, and again after a return to normal
+    assert baseline.observe(spike, t=31) == []
+    baseline.observe([_conn("browser", "1.1.1.1")], t=32)
+    assert len(baseline.observe(spike, t=33)) == 1
+    assert len(sink) == 2
+
+def test_baseline_persists(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    baseline = NetworkBaseline(path=path, learning=0, save_interval=0)
+    baseline.observe([_listen("sshd", 22), _conn("curl", "8.8.8.8")], t=0)
+
+    restored = NetworkBaseline(path=path, learning=0)
+    assert restored.observe([_listen("sshd", 22)], t=10) == []
+    assert restored.endpoints.estimate("curl|8.8.8.8") == 1
+    assert restored.stats()["listeners"] == [
+        {"process_name": "sshd", "type": "SOCK_STREAM", "port": 22, "scope": "network", "last_seen": 10}
+    ]
+
+def test_ephemeral_port_listeners_share_one_entry():
+    baseline = NetworkBaseline(learning=100, ephemeral_ports=(32768, 60999))
+    rng = random.Random(0)
+
+    def snapshot():
+        return [_listen("sshd", 22)] + [_listen("jupyter", rng.randint(32768, 60999), "127.0.0.1")
+                                        for _ in range(5)]
+
+    assert baseline.observe(snapshot(), t=0) == []
+    for t in range(200, 210):
+        assert baseline.observe(snapshot(), t=t) == []
+    assert len(baseline.listeners) == 2
+    assert {"process_name": "jupyter", "type": "SOCK_STREAM", "port": None,
+            "scope": "loopback", "last_seen": 209} in baseline.stats()["listeners"]
+
+    # Another process on an ephemeral port is still new
+    [event] = baseline.observe([_listen("nc", 45000)], t=210)
+    assert "ephemeral port 45000" in event.description and event.severity == "high"
+
+def test_listener_set_is_aged_and_capped(monkeypatch):
+    monkeypatch.setattr(settings, "network_baseline_listener_ttl", 1000)
+    monkeypatch.setattr(settings, "network_baseline_max_listeners", 3)
+    baseline = NetworkBaseline(learning=0, save_interval=0, ephemeral_ports=(32768, 60999))
+
+    baseline.observe([_listen("old", 1)], t=0)
+    baseline.observe([_listen(f"app{i}", 1000 + i) for i in range(3)], t=500)
+    assert sorted(name for name, *_ in baseline.listeners) == ["app0", "app1", "app2"]
+
+    baseline.observe([_listen("sshd", 22)], t=600)
+    assert len(baseline.listeners) == 3 and ("sshd", "SOCK_STREAM", 22, "network") in baseline.listeners
+
+    baseline.observe([_listen("sshd", 22)], t=2000)
+    assert list(baseline.listeners) == [("sshd", "SOCK_STREAM", 22, "network")]
@@ -0,0 +1,87 @@
+"""Tests for the online statistics used by the analysis engine"""
+
+import statistics
+
+import pytest
+
+from core.online_stats import (
+    EWMA,
+    CountMinSketch,
+    OnlineRegression,
+    RollingStats,
+    SeasonalBaseline,
+    baseline_for,
+    zscore,
+)
+
+def test_rolling_stats_matches_window():
+    stats = RollingStats(window=10)
+    values = [float(v % 7) for v in range(50)]
+    for t, x in enumerate(values):
+        stats.update(x, t)
+    window = values[-11:]
+    assert stats.n == len(window)
+    assert stats.mean == pytest.approx(statistics.mean(window))
+    assert stats.var == pytest.approx(statistics.variance(window))
+
+def test_ewma_round_trips_through_dict():
+    ewma = EWMA(half_life=60)
+    for t, x in enumerate([1.0, 5.0, 2.0, 8.0]):
+        ewma.update(x, t * 10)
+    restored = EWMA.from_dict(ewma.to_dict())
+    ewma.update(4.0, 50)
+    restored.update(4.0, 50)
+    assert (restored.mean, restored.var, restored.n) == (ewma.mean, ewma.var, ewma.n)
+
+def test_ewma_starts_as_running_mean():
+    ewma = EWMA(half_life=1000)
+    for t, x in enumerate([1.0, 2.0, 3.0]):
+        ewma.update(x, t)
+    assert ewma.mean == pytest.approx(2.0, rel=0.01)
+
+def test_ewma_follows_level_change():
+    ewma = EWMA(half_life=5)
+    for t in range(100):
+        ewma.update(10.0 if t < 50 else 50.0, t)
+    assert ewma.mean == pytest.approx(50.0, abs=0.1)
+
+def test_seasonal_baseline_used_once_bucket_is_warm():
+    rolling = RollingStats(window=3600)
+    seasonal = SeasonalBaseline(half_life=86400)
+    for t in range(10):
+        rolling.update(5.0, t)
+        seasonal.update(80.0, t, hour=3)
+    assert baseline_for(rolling, seasonal.get(3), 10)[2] == "seasonal"
+    assert baseline_for(rolling, seasonal.get(4), 10)[2] == "rolling"
+
+def test_zscore_floors_deviation():
+    assert zscore(12.0, 10.0, 0.0, 1.0) == 2.0
+
+def test_online_regression_fits_line():
+    regression = OnlineRegression()
+    assert regression.fit() is None
+    for t in range(1000, 1100, 10):
+        regression.update(3.0 + 0.5 * t, t)
+    slope, intercept = regression.fit()
+    assert slope == pytest.approx(0.5)
+    assert intercept == pytest.approx(3.0)
+    assert regression.predict(2000) == pytest.approx(1003.0)
+    assert regression.r2 == pytest.approx(1.0)
+    assert regression.span == 90
+
+def test_online_regression_forgets_old_trend():
+    regression = OnlineRegression(half_life=60)
+    for t in range(0, 3600, 10):
+        regression.update(float(t) if t < 1800 else 1800.0, t)
+    assert regression.fit()[0] == pytest.approx(0.0, abs=1e-3)
+
+def test_count_min_sketch_never_undercounts():
+    sketch = CountMinSketch(width=64, depth=4)
+    for i in range(200):
+        for _ in range(i % 5 + 1):
+            sketch.add(f"key{i}")
+    assert all(sketch.estimate(f"key{i}") >= i % 5 + 1 for i in range(200))
+    assert sketch.total == sum(i % 5 + 1 for i in range(200))
+    restored = CountMinSketch.from_dict(sketch.to_dict())
+    assert [restored.estimate(f"key{i}") for i in range(200)] == [sketch.estimate(f"key{i}") for i in range(200)]
+    assert CountMinSketch().estimate("never added") == 0
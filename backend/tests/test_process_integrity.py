@@ -0,0 +1,84 @@
+"""Tests for the process integrity scanner"""
+
+import hashlib
+import os
+
+import pytest
+
+from api.schemas.system import ProcessCreate
+from services.process_integrity import ProcessIntegrityScanner, hash_file
+
+@pytest.fixture
+def fake_proc(tmp_path):
+    """A /proc stand-in: <root>/<pid>/exe links to the image a process runs"""
+    root = tmp_path / "proc"
+
+    def run(pid, image):
+        (root / str(pid)).mkdir(parents=True, exist_ok=True)
+        link = root / str(pid) / "exe"
+        if link.is_symlink():
+            link.unlink()
+        link.symlink_to(image)
+        return ProcessCreate(pid=pid, name=f"proc{pid}", exe=str(image))
+
+    run.root = str(root)
+    return run
+
+def _binary(path, content):
+    path.write_bytes(content)
+    return path
+
+def test_hash_file(tmp_path):
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    path = _binary(tmp_path / "bin", data)
+    assert hash_file(str(path), chunk_size=64 * 1024) == hashlib.sha256(data).hexdigest()
+
+def test_unchanged_executables_are_hashed_once(tmp_path, fake_proc):
+    exe = _binary(tmp_path / "daemon", b"v1" * 1000)
+    scanner = ProcessIntegrityScanner(path=str(tmp_path / "cache.json"), proc_root=fake_proc.root)
+    processes = [fake_proc(pid, exe) for pid in (100, 101, 102)]
+
+    assert scanner.scan(processes) == []
+    assert scanner.hashed == 1
+    assert scanner.scan(processes) == []
+    assert scanner.hashed == 1
+
+    # The cache survives a restart
+    restored = ProcessIntegrityScanner(path=str(tmp_path / "cache.json"), proc_root=fake_proc.root)
+    assert restored.scan(processes) == [] and restored.hashed == 0
+
+def test_replaced_and_deleted_executables(tmp_path, fake_proc):
+    events = []
+    scanner = ProcessIntegrityScanner(proc_root=fake_proc.root)
+    scanner.set_sink(events.extend)
+    running = _binary(tmp_path / "running", b"old build")
+    on_disk = _binary(tmp_path / "on-disk", b"new build")
+
+    replaced = fake_proc(200, running)
+    replaced.exe = str(on_disk)
+    deleted = fake_proc(201, running)
+    deleted.exe = str(tmp_path / "gone")
+
+    issues = scanner.scan([replaced, deleted])
+    assert sorted(issue["kind"] for issue in issues) == ["executable_deleted", "executable_replaced"]
+    assert len(events) == 2
+    # Ongoing issues are not raised again
+    assert len(scanner.scan([replaced, deleted])) == 2 and len(events) == 2
+
+def test_content_change_behind_unchanged_stat(tmp_path, fake_proc, monkeypatch):
+    events = []
+    scanner = ProcessIntegrityScanner(proc_root=fake_proc.root)
+    scanner.set_sink(events.extend)
+    exe = _binary(tmp_path / "daemon", b"genuine!")
+    process = fake_proc(300, exe)
+    assert scanner.scan([process]) == []
+
+    st = os.stat(exe)
+    exe.write_bytes(b"patched!")
+    os.utime(exe, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert scanner.scan([process]) == []  # not due for verification yet
+
+    monkeypatch.setattr("core.config.settings.process_integrity_verify_interval", 0)
+    [issue] = scanner.scan([process])
+    assert issue["kind"] == "executable_tampered" and issue["severity"] == "critical"
+    assert [e.event_type for e in events] == ["executable_tampered"]
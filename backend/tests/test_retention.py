@@ -0,0 +1,110 @@
+"""Tests for the retention policies"""
+
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db import Base
+from models.system import DiskMetrics, SecurityEvent, SystemMetrics
+from services.retention_service import RetentionManager
+
+@pytest.fixture
+def bind(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'retention.db'}")
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(settings, "retention_system_metrics_days", 30)
+    monkeypatch.setattr(settings, "retention_security_events_days", 7)
+    monkeypatch.setattr(settings, "retention_security_events_resolved_only", False)
+    monkeypatch.setattr(settings, "retention_archive_dir", None)
+    monkeypatch.setattr(settings, "retention_batch_size", 100)
+    monkeypatch.setattr(settings, "retention_batch_pause", 0)
+    monkeypatch.setattr(settings, "log_file", str(tmp_path / "missing.log"))
+    yield engine
+    engine.dispose()
+
+def _populate(bind, old, recent):
+    now = datetime.utcnow()
+    with Session(bind) as db:
+        for i in range(old + recent):
+            ts = now - timedelta(days=60) if i < old else now - timedelta(hours=1)
+            metrics = SystemMetrics(timestamp=ts, cpu_usage=1.0, memory_usage=2.0, disk_usage=3.0)
+            db.add(metrics)
+            db.flush()
+            db.add(DiskMetrics(system_metrics_id=metrics.id, timestamp=ts, mountpoint="/",
+                               total=1.0, used=0.5, free=0.5, usage=50.0))
+            db.add(SecurityEvent(timestamp=ts, event_type="test", severity="low",
+                                 description="x" * 500, resolved=i % 2 == 0))
+        db.commit()
+
+def _count(bind, model):
+    with Session(bind) as db:
+        return db.query(model).count()
+
+def test_deletes_expired_rows_in_batches_and_reclaims_space(bind):
+    _populate(bind, old=450, recent=20)
+    statements = []
+    event.listen(bind, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    report = RetentionManager(bind).run()
+
+    assert {name: t["deleted"] for name, t in report["tables"].items()} == {
+        "disk_metrics": 450, "system_metrics": 450, "security_events": 450
+    }
+    assert _count(bind, SystemMetrics) == 20
+    assert _count(bind, DiskMetrics) == 20
+    assert _count(bind, SecurityEvent) == 20
+    # 450 rows in batches of 100: five deletes per table
+    assert sum(s.startswith("DELETE FROM security_events") for s in statements) == 5
+    assert report["vacuumed_pages"] > 0 and report["reclaimed_bytes"] > 0
+    with bind.connect() as conn:
+        assert conn.execute(text("PRAGMA freelist_count")).scalar() == 0
+
+def test_resolved_only_and_archive(bind, tmp_path, monkeypatch):
+    _populate(bind, old=10, recent=0)
+    monkeypatch.setattr(settings, "retention_system_metrics_days", 0)
+    monkeypatch.setattr(settings, "retention_security_events_resolved_only", True)
+    monkeypatch.setattr(settings, "retention_archive_dir", str(tmp_path / "archive"))
+
+    report = RetentionManager(bind).run()
+
+    assert list(report["tables"]) == ["security_events"]
+    assert report["tables"]["security_events"]["deleted"] == 5
+    assert _count(bind, SecurityEvent) == 5 and _count(bind, SystemMetrics) == 10
+    [archive] = os.listdir(tmp_path / "archive")
+    with gzip.open(tmp_path / "archive" / archive, "rt") as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 5 and all(row["resolved"] for row in rows)
+    assert report["tables"]["security_events"]["archived"] is True
+
+def test_log_rotation(bind, tmp_path, monkeypatch):
+    log = tmp_path / "indraos.log"
+    log.write_text("line\n" * 1000)
+    monkeypatch.setattr(settings, "log_file", str(log))
+    monkeypatch.setattr(settings, "retention_log_max_mb", 1 / 1024)  # 1 KB
+    monkeypatch.setattr(settings, "retention_log_backups", 2)
+
+    manager = RetentionManager(bind)
+    assert manager.run()["log"] == {"size": 5000, "rotated": True}
+    assert log.stat().st_size == 0
+    with gzip.open(f"{log}.1.gz", "rt") as f:
+        assert f.read() == "line\n" * 1000
+    assert manager.run()["log"] == {"size": 0, "rotated": False}
+
+def test_no_archive_when_nothing_expired(bind, tmp_path, monkeypatch):
+    _populate(bind, old=0, recent=3)
+    monkeypatch.setattr(settings, "retention_archive_dir", str(tmp_path / "archive"))
+
+    report = RetentionManager(bind).run()
+
+    assert all(t == {"deleted": 0, "cutoff": t["cutoff"], "archived": False}
+               for t in report["tables"].values())
+    assert not os.path.exists(tmp_path / "archive")
@@ -0,0 +1,138 @@
+"""Tests for bulk storage of security events"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from api.schemas.system import SecurityEventCreate
+from db import Base
+from models.system import SecurityEvent
+from services.security_event_queue import SecurityEventQueue
+from services.security_service import SecurityService
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def _event(i):
+    return SecurityEventCreate(event_type="test", severity="low", description=f"event {i}")
+
+def test_create_security_events_returns_ids_in_order(db):
+    ids = SecurityService.create_security_events(db, [_event(i) for i in range(50)])
+    assert len(ids) == 50
+    stored = {e.id: e.description for e in db.query(SecurityEvent)}
+    assert [stored[i] for i in ids] == [f"event {i}" for i in range(50)]
+    assert SecurityService.create_security_events(db, []) == []
+
+def test_queue_batches_and_flushes():
+    batches = []
+    events_queue = SecurityEventQueue(lambda batch: batches.append(len(batch)), batch_size=100)
+    assert events_queue.put_many([_event(i) for i in range(250)]) == 250
+    assert events_queue.flush(timeout=5)
+    assert sum(batches) == 250 and max(batches) <= 100
+    assert len(batches) < 250
+    assert events_queue.stats() == {"queued": 0, "stored": 250, "dropped": 0, "failed": 0}
+    events_queue.stop()
+
+def test_queue_drops_when_full_and_counts_failures():
+    entered, release = threading.Event(), threading.Event()
+
+    def writer(batch):
+        entered.set()
+        release.wait(5)
+        raise RuntimeError("database is locked")
+
+    events_queue = SecurityEventQueue(writer, max_size=5, batch_size=1, linger=0)
+    events_queue.put_many([_event(0)])
+    entered.wait(5)
+    # The writer holds one event; the queue takes five more
+    accepted = sum(events_queue.put_many([_event(i)]) for i in range(10))
+    assert accepted == 5
+    release.set()
+    assert events_queue.flush(timeout=5)
+    stats = events_queue.stats()
+    assert stats["dropped"] == 10 - accepted and stats["failed"] == accepted + 1
+    events_queue.stop()
+
+def _add_events(db, count):
+    base = datetime(2024, 1, 1)
+    for i in range(count):
+        db.add(SecurityEvent(
+            # Pairs of events share a timestamp: the id breaks the tie
+            timestamp=base + timedelta(minutes=i // 2),
+            event_type="login_failure" if i % 3 == 0 else "port_scan",
+            severity="high" if i % 2 else "low",
+            description=f"event {i}",
+            source="rules",
+            resolved=False,
+        ))
+    db.commit()
+
+def test_keyset_pages_cover_every_event_once(db):
+    _add_events(db, 25)
+    seen, cursor = [], None
+    while True:
+        page = SecurityService.get_security_events_page(db, cursor, limit=4)
+        seen += [event.id for event in page["events"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    expected = [e.id for e in db.query(SecurityEvent).order_by(
+        SecurityEvent.timestamp.desc(), SecurityEvent.id.desc())]
+    assert seen == expected
+
+def test_keyset_filters_and_time_range(db):
+    _add_events(db, 30)
+    filters = dict(event_type="login_failure", severity="low",
+                   since=datetime(2024, 1, 1, 0, 3), until=datetime(2024, 1, 1, 0, 12))
+    page = SecurityService.get_security_events_page(db, None, 100, **filters)
+    descriptions = [event.description for event in page["events"]]
+    assert descriptions == ["event 18", "event 12", "event 6"]
+    assert SecurityService.count_security_events(db, **filters) == 3
+
+def test_invalid_cursor(db):
+    with pytest.raises(ValueError):
+        SecurityService.get_security_events_page(db, "not-a-cursor")
+
+def _page_ids(db, limit):
+    seen, cursor = [], None
+    for _ in range(100):
+        page = SecurityService.get_security_events_page(db, cursor, limit=limit)
+        seen += [event.id for event in page["events"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+    pytest.fail("paging does not advance")
+
+def test_keyset_pages_events_with_default_timestamps(db):
+    # Stored within the same second, timestamps filled in by the service
+    ids = SecurityService.create_security_events(db, [_event(i) for i in range(5)])
+    db.add(SecurityEvent(event_type="test", severity="low", description="model default"))
+    db.commit()
+    assert sorted(_page_ids(db, limit=2)) == sorted(ids) + [ids[-1] + 1]
+    newest = db.query(SecurityEvent).order_by(SecurityEvent.id.desc()).first().timestamp
+    assert SecurityService.count_security_events(db, since=newest) >= 1
+
+def test_normalize_legacy_timestamps(db):
+    # Rows written by func.now() before timestamps came from Python
+    for i in range(5):
+        db.execute(text("INSERT INTO security_events (timestamp, event_type, severity, description) "
+                        "VALUES ('2024-01-01 10:00:00', 'test', 'low', :d)"), {"d": f"legacy {i}"})
+    db.commit()
+    assert SecurityService.normalize_timestamps(db) == 5
+    assert len(_page_ids(db, limit=2)) == 5
+    assert SecurityService.count_security_events(db, since=datetime(2024, 1, 1, 10)) == 5
+    assert SecurityService.normalize_timestamps(db) == 0
+
+def test_count_resolved_events(db):
+    ids = SecurityService.create_security_events(db, [_event(i) for i in range(3)])
+    assert SecurityService.count_resolved_events(db) == 0
+    assert SecurityService.mark_event_resolved(db, ids[1])
+    assert SecurityService.count_resolved_events(db) == 1
@@ -0,0 +1,90 @@
+"""Tests for the security rules engine"""
+
+import pytest
+
+from api.schemas.system import DiskMetricsCreate, ProcessCreate, SystemMetricsCreate
+from services.security_rules import Rule, SecurityRulesEngine
+
+def _engine(*specs):
+    stored = []
+    engine = SecurityRulesEngine([Rule(spec) for spec in specs])
+    engine.set_sink(stored.extend)
+    return engine, stored
+
+CPU_RULE = {
+    "name": "high_cpu_usage", "stream": "metrics", "field": "cpu_usage",
+    "op": ">", "value": 90, "for": 30, "suppress": 600, "severity": "medium",
+    "description": "CPU at {value:.0f}%",
+}
+
+def _cpu(engine, value, t):
+    return engine.observe_metrics(SystemMetricsCreate(cpu_usage=value), t=t)
+
+def test_sustained_condition_raises_one_event():
+    engine, stored = _engine(CPU_RULE)
+    raised = [e for t in range(0, 300, 10) for e in _cpu(engine, 95.0, t)]
+    assert [e.description for e in raised] == ["CPU at 95%"]
+    assert stored == raised
+    assert raised[0].source == "rule:high_cpu_usage"
+    [stats] = engine.stats()
+    assert stats["evaluations"] == 30 and stats["matches"] == 30 and stats["events"] == 1
+    assert [c["rule"].name for c in engine.active_conditions()] == ["high_cpu_usage"]
+
+def test_short_spike_and_suppression_window():
+    engine, stored = _engine(CPU_RULE)
+    # Shorter than "for": nothing
+    for t in range(0, 30, 10):
+        _cpu(engine, 95.0, t)
+    _cpu(engine, 10.0, 30)
+    assert stored == []
+
+    for t in range(40, 80, 10):
+        _cpu(engine, 95.0, t)
+    assert len(stored) == 1
+    # Clears and comes back within the suppression window: suppressed
+    _cpu(engine, 10.0, 100)
+    for t in range(110, 150, 10):
+        _cpu(engine, 95.0, t)
+    assert len(stored) == 1
+    assert engine.stats()[0]["suppressed"] == 1
+    # After the window: reported again
+    _cpu(engine, 10.0, 800)
+    for t in range(810, 850, 10):
+        _cpu(engine, 95.0, t)
+    assert len(stored) == 2
+
+def test_rate_rule_per_process_and_exit():
+    engine, stored = _engine({
+        "name": "memory_surge", "stream": "processes", "field": "memory_rss",
+        "condition": "rate", "op": ">", "value": 1, "severity": "low",
+        "description": "{label} grows {value:.0f} MB/s",
+    })
+    for t in range(0, 50, 10):
+        engine.observe_processes([
+            ProcessCreate(pid=1, name="leaky", memory_rss=100.0 + 20 * t),
+            ProcessCreate(pid=2, name="steady", memory_rss=100.0),
+        ], t=t)
+    assert [e.description for e in stored] == ["Process 'leaky' (PID 1) grows 20 MB/s"]
+    engine.observe_processes([], t=60)
+    assert engine.active_conditions() == []
+
+def test_mount_records_and_connections():
+    engine, stored = _engine(
+        {"name": "full", "stream": "metrics", "field": "mount_usage", "op": ">=", "value": 95,
+         "description": "{label} {value:.0f}%"},
+        {"name": "fanout", "stream": "connections", "field": "process_remote_hosts", "op": ">", "value": 2,
+         "description": "{label} fan-out {value:.0f}"},
+    )
+    engine.observe_metrics(SystemMetricsCreate(disks=[
+        DiskMetricsCreate(device="a", mountpoint="/var", usage=97.0),
+        DiskMetricsCreate(device="b", mountpoint="/home", usage=20.0),
+    ]), t=0)
+    engine.observe_connections([
+        {"status": "ESTABLISHED", "pid": 7, "process_name": "scan", "remote_addr": f"10.0.0.{i}:443"}
+        for i in range(5)
+    ], t=0)
+    assert [e.description for e in stored] == ["/var 97%", "Process 'scan' (PID 7) fan-out 5"]
+
+def test_invalid_rule():
+    with pytest.raises(ValueError):
+        Rule({"name": "x", "stream": "nope", "field": "f", "value": 1, "description": ""})
@@ -0,0 +1,327 @@
+"""Tests for the systemd service backend against a fake D-Bus connection"""
+
+import queue
+import subprocess
+import time
+
+import pytest
+
+jeepney = pytest.importorskip("jeepney")
+from jeepney import DBusAddress, HeaderFields, new_method_return, new_signal
+
+from services import systemd_backend as backend_module
+from services.systemd_backend import (
+    MANAGER_INTERFACE,
+    SYSTEMD_PATH,
+    UNIT_INTERFACE,
+    SystemdBackend,
+)
+
+NGINX_PATH = "/org/freedesktop/systemd1/unit/nginx_2eservice"
+SSH_PATH = "/org/freedesktop/systemd1/unit/ssh_2eservice"
+REDIS_PATH = "/org/freedesktop/systemd1/unit/redis_2dserver_2eservice"
+
+UNITS = [
+    # name, description, load, active, sub, following, path, job id, job type, job path
+    ("nginx.service", "A high performance web server", "loaded", "active", "running",
+     "", NGINX_PATH, 0, "", "/"),
+    ("ssh.service", "OpenBSD Secure Shell server", "loaded", "inactive", "dead",
+     "", SSH_PATH, 0, "", "/"),
+    ("getty@tty1.service", "Getty on tty1", "loaded", "active", "running",
+     "", "/org/freedesktop/systemd1/unit/getty_40tty1_2eservice", 0, "", "/"),
+    ("ghost.service", "ghost.service", "not-found", "inactive", "dead",
+     "", "/org/freedesktop/systemd1/unit/ghost_2eservice", 0, "", "/"),
+    ("-.mount", "Root Mount", "loaded", "active", "mounted",
+     "", "/org/freedesktop/systemd1/unit/_2d_2emount", 0, "", "/"),
+]
+
+UNIT_FILES = [
+    ("/lib/systemd/system/nginx.service", "enabled"),
+    ("/lib/systemd/system/ssh.service", "disabled"),
+    ("/lib/systemd/system/getty@.service", "enabled"),
+]
+
+UNIT_PROPERTIES = {
+    REDIS_PATH: {
+        "LoadState": ("s", "loaded"),
+        "Description": ("s", "Advanced key-value store"),
+        "ActiveState": ("s", "activating"),
+        "SubState": ("s", "start"),
+        "FragmentPath": ("s", "/etc/systemd/system/redis-server.service"),
+        "UnitFileState": ("s", "enabled"),
+    },
+}
+
+
+class FakeSystemdConnection:
+    """Minimal stand-in for jeepney's blocking DBusConnection
+
+    Method calls are answered from the unit tables above; signals queued
+    with emit() are delivered through recv_messages() to matching filters.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.filters = []
+        self.incoming = queue.Queue()
+        self.closed = False
+
+    def filter(self, rule, *, queue=None, bufsize=1):
+        self.filters.append((rule, queue))
+
+    def send_and_get_reply(self, msg, timeout=None):
+        member = msg.header.fields[HeaderFields.member]
+        self.calls.append(member)
+        if member == "ListUnits":
+            return new_method_return(msg, "a(ssssssouso)", (UNITS,))
+        if member == "ListUnitFiles":
+            return new_method_return(msg, "a(ss)", (UNIT_FILES,))
+        if member == "GetAll":
+            path = msg.header.fields[HeaderFields.path]
+            return new_method_return(msg, "a{sv}", (UNIT_PROPERTIES.get(path, {}),))
+        return new_method_return(msg)
+
+    def emit(self, msg):
+        self.incoming.put(msg)
+
+    def recv_messages(self, *, timeout=None):
+        msg = self.incoming.get()
+        if msg is None:
+            raise ConnectionResetError("connection closed")
+        for rule, signals in self.filters:
+            if rule.matches(msg):
+                signals.append(msg)
+
+    def close(self):
+        self.closed = True
+        self.incoming.put(None)
+
+
+def properties_changed(path, changed, interface=UNIT_INTERFACE):
+    address = DBusAddress(path, interface="org.freedesktop.DBus.Properties")
+    return new_signal(address, "PropertiesChanged", "sa{sv}as", (interface, changed, []))
+
+
+def manager_signal(member, name, path):
+    address = DBusAddress(SYSTEMD_PATH, interface=MANAGER_INTERFACE)
+    return new_signal(address, member, "so", (name, path))
+
+
+@pytest.fixture
+def loaded_backend():
+    backend = SystemdBackend(bus_address="SESSION", timeout=1)
+    backend._conn = FakeSystemdConnection()
+    backend._load_unit_files()
+    backend._load_units_dbus()
+    yield backend
+    backend.close()
+
+
+def by_name(services):
+    return {service.name: service for service in services}
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_list_units_keeps_loaded_services_only(loaded_backend):
+    services = by_name(loaded_backend._snapshot())
+
+    assert sorted(services) == ["getty@tty1.service", "nginx.service", "ssh.service"]
+    assert loaded_backend._conn.calls == ["ListUnitFiles", "ListUnits"]
+
+    nginx = services["nginx.service"]
+    assert nginx.display_name == "nginx"
+    assert nginx.status == "running"
+    assert nginx.start_type == "automatic"
+    assert nginx.path == "/lib/systemd/system/nginx.service"
+
+    ssh = services["ssh.service"]
+    assert ssh.status == "stopped"
+    assert ssh.start_type == "disabled"
+
+
+def test_template_instance_uses_template_unit_file(loaded_backend):
+    getty = by_name(loaded_backend._snapshot())["getty@tty1.service"]
+
+    assert getty.path == "/lib/systemd/system/getty@.service"
+    assert getty.start_type == "automatic"
+
+
+def test_properties_changed_updates_cached_unit(loaded_backend):
+    loaded_backend._on_properties_changed(properties_changed(
+        NGINX_PATH, {"ActiveState": ("s", "failed"), "SubState": ("s", "failed")}
+    ))
+
+    assert by_name(loaded_backend._snapshot())["nginx.service"].status == "failed"
+    assert loaded_backend._units["nginx.service"]["sub_state"] == "failed"
+
+
+def test_properties_changed_ignores_other_interfaces_and_unknown_units(loaded_backend):
+    before = loaded_backend._snapshot()
+
+    loaded_backend._on_properties_changed(properties_changed(
+        NGINX_PATH, {"ActiveState": ("s", "failed")},
+        interface="org.freedesktop.systemd1.Service"
+    ))
+    loaded_backend._on_properties_changed(properties_changed(
+        "/org/freedesktop/systemd1/unit/unknown_2eservice", {"ActiveState": ("s", "failed")}
+    ))
+
+    assert loaded_backend._snapshot() == before
+
+
+def test_unit_new_fetches_properties_and_unit_removed_drops_unit(loaded_backend):
+    loaded_backend._on_manager_signal(manager_signal("UnitNew", "redis-server.service", REDIS_PATH))
+
+    redis = by_name(loaded_backend._snapshot())["redis-server.service"]
+    assert redis.description == "Advanced key-value store"
+    assert redis.status == "start_pending"
+    assert redis.path == "/etc/systemd/system/redis-server.service"
+    assert loaded_backend._conn.calls[-1] == "GetAll"
+
+    loaded_backend._on_manager_signal(manager_signal("UnitRemoved", "redis-server.service", REDIS_PATH))
+
+    assert "redis-server.service" not in by_name(loaded_backend._snapshot())
+    assert REDIS_PATH not in loaded_backend._paths
+
+
+def test_unit_new_ignores_non_service_units(loaded_backend):
+    loaded_backend._on_manager_signal(
+        manager_signal("UnitNew", "tmp.mount", "/org/freedesktop/systemd1/unit/tmp_2emount")
+    )
+
+    assert "GetAll" not in loaded_backend._conn.calls
+    assert "tmp.mount" not in loaded_backend._units
+
+
+def test_watcher_applies_signals_after_initial_listing(monkeypatch):
+    conn = FakeSystemdConnection()
+    monkeypatch.setattr(backend_module, "open_dbus_connection", lambda bus: conn)
+    backend = SystemdBackend(bus_address="SESSION", timeout=1)
+    try:
+        assert by_name(backend.list_services())["ssh.service"].status == "stopped"
+        assert conn.calls[:3] == ["AddMatch", "AddMatch", "Subscribe"]
+
+        conn.emit(properties_changed(SSH_PATH, {"ActiveState": ("s", "active")}))
+        conn.emit(manager_signal("UnitRemoved", "nginx.service", NGINX_PATH))
+
+        assert wait_for(lambda: "nginx.service" not in by_name(backend.list_services()))
+        assert by_name(backend.list_services())["ssh.service"].status == "running"
+        # Served from the cache: no further ListUnits round trip
+        assert conn.calls.count("ListUnits") == 1
+    finally:
+        backend.close()
+    assert conn.closed
+
+
+
+def test_watcher_survives_a_failing_signal_handler(monkeypatch):
+    conn = FakeSystemdConnection()
+    monkeypatch.setattr(backend_module, "open_dbus_connection", lambda bus: conn)
+    backend = SystemdBackend(bus_address="SESSION", timeout=1)
+    original = conn.send_and_get_reply
+
+    def send_and_get_reply(msg, timeout=None):
+        if msg.header.fields[HeaderFields.member] == "GetAll":
+            raise RuntimeError("Unit vanished")
+        return original(msg, timeout)
+
+    conn.send_and_get_reply = send_and_get_reply
+    try:
+        backend.list_services()
+        watcher = backend._watcher
+        conn.emit(manager_signal("UnitNew", "redis-server.service", REDIS_PATH))
+        conn.emit(manager_signal("UnitRemoved", "nginx.service", NGINX_PATH))
+
+        assert wait_for(lambda: "nginx.service" not in backend._units)
+        assert watcher.is_alive() and backend._watcher is watcher
+        assert "redis-server.service" not in backend._units
+    finally:
+        backend.close()
+
+
+def test_restarting_the_watcher_closes_the_previous_connection(monkeypatch):
+    connections = []
+
+    def open_connection(bus):
+        connections.append(FakeSystemdConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(backend_module, "open_dbus_connection", open_connection)
+    backend = SystemdBackend(bus_address="SESSION", timeout=1)
+    try:
+        backend.list_services()
+        # Connection lost: the watcher ends, the next listing starts a new one
+        connections[0].incoming.put(None)
+        assert wait_for(lambda: not backend._watcher.is_alive())
+        backend.list_services()
+        assert len(connections) == 2
+        assert connections[0].closed and not connections[1].closed
+    finally:
+        backend.close()
+    assert connections[1].closed
+
+SYSTEMCTL_SHOW_OUTPUT = """\
+Id=nginx.service
+Description=A high performance web server
+LoadState=loaded
+ActiveState=active
+SubState=running
+UnitFileState=enabled
+FragmentPath=/lib/systemd/system/nginx.service
+
+Id=ghost.service
+Description=ghost.service
+LoadState=not-found
+ActiveState=inactive
+SubState=dead
+UnitFileState=
+FragmentPath=
+
+Id=cron.service
+Description=Regular background program processing daemon
+LoadState=loaded
+ActiveState=failed
+SubState=failed
+UnitFileState=disabled
+FragmentPath=/lib/systemd/system/cron.service
+"""
+
+
+def test_list_units_systemctl_parses_show_blocks(monkeypatch):
+    commands = []
+
+    def fake_run(args, **kwargs):
+        commands.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout=SYSTEMCTL_SHOW_OUTPUT, stderr="")
+
+    monkeypatch.setattr(backend_module, "open_dbus_connection", None)
+    monkeypatch.setattr(backend_module.subprocess, "run", fake_run)
+
+    services = SystemdBackend(timeout=1).list_services()
+
+    assert len(commands) == 1
+    assert commands[0][:2] == ["systemctl", "show"]
+    assert [service.name for service in services] == ["cron.service", "nginx.service"]
+    cron, nginx = services
+    assert cron.status == "failed"
+    assert cron.start_type == "disabled"
+    assert cron.description == "Regular background program processing daemon"
+    assert nginx.status == "running"
+    assert nginx.path == "/lib/systemd/system/nginx.service"
+
+
+def test_list_units_systemctl_returns_empty_list_on_error(monkeypatch):
+    def failing_run(args, **kwargs):
+        raise subprocess.CalledProcessError(1, args)
+
+    monkeypatch.setattr(backend_module.subprocess, "run", failing_run)
+
+    assert SystemdBackend(timeout=1)._list_units_systemctl() == []
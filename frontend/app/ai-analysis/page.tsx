@@ -56,7 +56,7 @@ export default function AIAnalysisPage() {
                 <div className="w-12 h-12 rounded-lg bg-gradient-to-br from-green-500 to-emerald-600 flex items-center justify-center mx-auto mb-3">
                   <Zap className="w-6 h-6 text-white" />
                 </div>
-                <div className="text-2xl font-bold text-white mb-1">{data.stats.optimizations_applied}</div>
+                <div className="text-2xl font-bold text-white mb-1">{data.stats.optimizations_applied ?? "—"}</div>
                 <div className="text-sm text-muted-foreground">Optimizations Applied</div>
               </CardContent>
             </Card>
@@ -66,7 +66,7 @@ export default function AIAnalysisPage() {
                 <div className="w-12 h-12 rounded-lg bg-gradient-to-br from-blue-500 to-[var(--indra-blue)] flex items-center justify-center mx-auto mb-3">
                   <Shield className="w-6 h-6 text-white" />
                 </div>
-                <div className="text-2xl font-bold text-white mb-1">{data.stats.security_issues_fixed}</div>
+                <div className="text-2xl font-bold text-white mb-1">{data.stats.security_issues_fixed ?? "—"}</div>
                 <div className="text-sm text-muted-foreground">Security Issues Fixed</div>
               </CardContent>
             </Card>
@@ -76,7 +76,7 @@ export default function AIAnalysisPage() {
                 <div className="w-12 h-12 rounded-lg bg-gradient-to-br from-purple-500 to-violet-600 flex items-center justify-center mx-auto mb-3">
                   <TrendingUp className="w-6 h-6 text-white" />
                 </div>
-                <div className="text-2xl font-bold text-white mb-1">+{data.stats.performance_gain_percentage}%</div>
+                <div className="text-2xl font-bold text-white mb-1">{data.stats.performance_gain_percentage == null ? "—" : `+${data.stats.performance_gain_percentage}%`}</div>
                 <div className="text-sm text-muted-foreground">Performance Gain</div>
               </CardContent>
             </Card>
@@ -70,18 +70,38 @@ export default function ServicesPage() {
 
   const handleServiceAction = async (action: 'start' | 'stop' | 'restart', name: string) => {
     try {
-      let response;
+      let job;
       if (action === 'start') {
-        response = await systemAPI.startService(name);
+        job = await systemAPI.startService(name);
       } else if (action === 'stop') {
-        response = await systemAPI.stopService(name);
+        job = await systemAPI.stopService(name);
       } else {
-        response = await systemAPI.restartService(name);
+        job = await systemAPI.restartService(name);
       }
       toast({
-        title: 'Success',
-        description: response.message || `Service ${name} action completed.`,
+        title: 'Pending',
+        description: `Service ${name} ${action} in progress...`,
       });
+
+      // The request only queues a job: report its final status
+      job = await systemAPI.waitForServiceJob(job);
+      if (job.status === 'succeeded') {
+        toast({
+          title: 'Success',
+          description: `Service ${name} ${action} completed.`,
+        });
+      } else {
+        const detail = job.status === 'running'
+          ? 'is still running'
+          : job.status === 'failed'
+            ? `failed${job.stderr ? `: ${job.stderr.trim()}` : ''}`
+            : `ended with status ${job.status}`;
+        toast({
+          title: 'Error',
+          description: `Service ${name} ${action} ${detail}`,
+          variant: 'destructive',
+        });
+      }
       fetchServices(); // Refresh list after action
     } catch (error) {
       console.error(`Failed to ${action} service ${name}:`, error);
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { SystemInfo, SystemMetrics, Process, AIInsight, AIAnalysisData } from '@/types/system';
+import type { SystemInfo, SystemMetrics, Process, ServiceJob, AIInsight, AIAnalysisData } from '@/types/system';
 import { API_BASE_URL } from './constants';
 
 const api = axios.create({
@@ -92,21 +92,38 @@ export const systemAPI = {
     return data;
   },
 
-  startService: async (name: string) => {
-    const { data } = await api.post(`/services/${name}/start`);
+  // Control actions run as background jobs (202): poll the job for the outcome
+  startService: async (name: string): Promise<ServiceJob> => {
+    const { data } = await api.post(`/services/${encodeURIComponent(name)}/start`);
     return data;
   },
 
-  stopService: async (name: string) => {
-    const { data } = await api.post(`/services/${name}/stop`);
+  stopService: async (name: string): Promise<ServiceJob> => {
+    const { data } = await api.post(`/services/${encodeURIComponent(name)}/stop`);
     return data;
   },
 
-  restartService: async (name: string) => {
-    const { data } = await api.post(`/services/${name}/restart`);
+  restartService: async (name: string): Promise<ServiceJob> => {
+    const { data } = await api.post(`/services/${encodeURIComponent(name)}/restart`);
     return data;
   },
 
+  getServiceJob: async (jobId: string): Promise<ServiceJob> => {
+    const { data } = await api.get(`/services/jobs/${jobId}`);
+    return data;
+  },
+
+  waitForServiceJob: async (job: ServiceJob, intervalMs: number = 1000): Promise<ServiceJob> => {
+    // Stop polling a little after the job's own timeout
+    const deadline = Date.now() + (job.timeout + 5) * 1000;
+    let current = job;
+    while (current.status === 'running' && Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+      current = await systemAPI.getServiceJob(job.job_id);
+    }
+    return current;
+  },
+
   // Network endpoints
   getNetworkInterfaces: async (skip: number = 0, limit: number = 100) => {
     const { data } = await api.get(`/network/interfaces?skip=${skip}&limit=${limit}`);
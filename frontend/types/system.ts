@@ -75,6 +75,24 @@ export interface Service {
   updated_at: string;
 }
 
+export type ServiceJobStatus = 'running' | 'succeeded' | 'failed' | 'timeout' | 'cancelled';
+
+export interface ServiceJob {
+  job_id: string;
+  name: string;
+  action: 'start' | 'stop' | 'restart';
+  status: ServiceJobStatus;
+  timeout: number;
+  returncode?: number | null;
+  stdout: string;
+  stderr: string;
+  created_at: string;
+  started_at?: string | null;
+  finished_at?: string | null;
+  duration?: number | null;
+  message?: string | null;
+}
+
 export interface NetworkInterface {
   id: number;
   name: string;
@@ -169,9 +187,10 @@ export interface AIInsight {
 
 export interface AIAnalysisStats {
   insights_generated: number;
-  optimizations_applied: number;
-  security_issues_fixed: number;
-  performance_gain_percentage: number;
+  // null: not measured
+  optimizations_applied: number | null;
+  security_issues_fixed: number | null;
+  performance_gain_percentage: number | null;
 }
 
 export interface AIAnalysisStatus {